@@ -8,7 +8,8 @@ from typing import Any, Dict, List, Optional, Tuple, cast
 import jwt
 
 from homeassistant import data_entry_flow
-from homeassistant.auth.const import ACCESS_TOKEN_EXPIRATION
+from homeassistant.auth.const import (
+    ACCESS_TOKEN_CACHE_SIZE, ACCESS_TOKEN_CACHE_TTL, ACCESS_TOKEN_EXPIRATION)
 from homeassistant.core import callback, HomeAssistant
 from homeassistant.util import dt as dt_util
 
@@ -74,6 +75,9 @@ class AuthManager:
         self._store = store
         self._providers = providers
         self._mfa_modules = mfa_modules
+        # Validated access tokens with the timestamp they are trusted until
+        self._access_token_cache = \
+            {}  # type: Dict[str, Tuple[models.RefreshToken, float]]
         self.login_flow = data_entry_flow.FlowManager(
             hass, self._async_create_login_flow,
             self._async_finish_login_flow)
@@ -226,6 +230,7 @@ class AuthManager:
             await asyncio.wait(tasks)
 
         await self._store.async_remove_user(user)
+        self._async_uncache_access_tokens(user=user)
 
         self.hass.bus.async_fire(EVENT_USER_REMOVED, {
             'user_id': user.id
@@ -251,6 +256,7 @@ class AuthManager:
         if user.is_owner:
             raise ValueError('Unable to deactive the owner')
         await self._store.async_deactivate_user(user)
+        self._async_uncache_access_tokens(user=user)
 
     async def async_remove_credentials(
             self, credentials: models.Credentials) -> None:
@@ -363,6 +369,7 @@ class AuthManager:
             -> None:
         """Delete a refresh token."""
         await self._store.async_remove_refresh_token(refresh_token)
+        self._async_uncache_access_tokens(refresh_token=refresh_token)
 
     @callback
     def async_create_access_token(self,
@@ -381,6 +388,14 @@ class AuthManager:
     async def async_validate_access_token(
             self, token: str) -> Optional[models.RefreshToken]:
         """Return refresh token if an access token is valid."""
+        cached = self._access_token_cache.get(token)
+        if cached is not None:
+            refresh_token, valid_until = cached
+            if (dt_util.utcnow().timestamp() < valid_until and
+                    refresh_token.user.is_active):
+                return refresh_token
+            self._access_token_cache.pop(token)
+
         try:
             unverif_claims = jwt.decode(token, verify=False)
         except jwt.InvalidTokenError:
@@ -397,7 +412,7 @@ class AuthManager:
             issuer = refresh_token.id
 
         try:
-            jwt.decode(
+            claims = jwt.decode(
                 token,
                 jwt_key,
                 leeway=10,
@@ -410,8 +425,39 @@ class AuthManager:
         if refresh_token is None or not refresh_token.user.is_active:
             return None
 
+        self._async_cache_access_token(token, refresh_token, claims['exp'])
         return refresh_token
 
+    @callback
+    def _async_cache_access_token(self, token: str,
+                                  refresh_token: models.RefreshToken,
+                                  expiration: float) -> None:
+        """Trust a validated access token for a short while."""
+        now = dt_util.utcnow().timestamp()
+        cache = self._access_token_cache
+
+        if len(cache) >= ACCESS_TOKEN_CACHE_SIZE:
+            for cached_token, (_, valid_until) in list(cache.items()):
+                if valid_until <= now:
+                    cache.pop(cached_token)
+
+            if len(cache) >= ACCESS_TOKEN_CACHE_SIZE:
+                cache.clear()
+
+        cache[token] = (refresh_token, min(
+            expiration, now + ACCESS_TOKEN_CACHE_TTL.total_seconds()))
+
+    @callback
+    def _async_uncache_access_tokens(
+            self, refresh_token: Optional[models.RefreshToken] = None,
+            user: Optional[models.User] = None) -> None:
+        """Forget the validated access tokens of a refresh token or user."""
+        for token, (cached_refresh_token, _) in list(
+                self._access_token_cache.items()):
+            if (cached_refresh_token.id == getattr(refresh_token, 'id', None)
+                    or cached_refresh_token.user is user):
+                self._access_token_cache.pop(token)
+
     async def _async_create_login_flow(
             self, handler: _ProviderKey, *, context: Optional[Dict],
             data: Optional[Any]) -> data_entry_flow.FlowHandler:
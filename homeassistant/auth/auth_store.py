@@ -7,7 +7,11 @@ from logging import getLogger
 from typing import Any, Dict, List, Optional  # noqa: F401
 
 from homeassistant.auth.const import ACCESS_TOKEN_EXPIRATION
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.device_registry import (
+    EVENT_DEVICE_REGISTRY_UPDATED)
+from homeassistant.helpers.entity_registry import (
+    EVENT_ENTITY_REGISTRY_UPDATED)
 from homeassistant.util import dt as dt_util
 
 from . import models
@@ -35,6 +39,10 @@ class AuthStore:
         """Initialize the auth store."""
         self.hass = hass
         self._users = None  # type: Optional[Dict[str, models.User]]
+        # Refresh tokens of all users by id and by token
+        self._refresh_tokens = {}  # type: Dict[str, models.RefreshToken]
+        self._refresh_tokens_by_token = \
+            {}  # type: Dict[str, models.RefreshToken]
         self._groups = None  # type: Optional[Dict[str, models.Group]]
         self._perm_lookup = None  # type: Optional[PermissionLookup]
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY,
@@ -136,6 +144,8 @@ class AuthStore:
             assert self._users is not None
 
         self._users.pop(user.id)
+        for refresh_token in user.refresh_tokens.values():
+            self._async_unindex_refresh_token(refresh_token)
         self._async_schedule_save()
 
     async def async_update_user(
@@ -217,6 +227,7 @@ class AuthStore:
 
         refresh_token = models.RefreshToken(**kwargs)
         user.refresh_tokens[refresh_token.id] = refresh_token
+        self._async_index_refresh_token(refresh_token)
 
         self._async_schedule_save()
         return refresh_token
@@ -228,10 +239,12 @@ class AuthStore:
             await self._async_load()
             assert self._users is not None
 
-        for user in self._users.values():
-            if user.refresh_tokens.pop(refresh_token.id, None):
-                self._async_schedule_save()
-                break
+        found = self._refresh_tokens.get(refresh_token.id)
+
+        if found is not None:
+            self._async_unindex_refresh_token(found)
+            found.user.refresh_tokens.pop(found.id, None)
+            self._async_schedule_save()
 
     async def async_get_refresh_token(
             self, token_id: str) -> Optional[models.RefreshToken]:
@@ -240,12 +253,7 @@ class AuthStore:
             await self._async_load()
             assert self._users is not None
 
-        for user in self._users.values():
-            refresh_token = user.refresh_tokens.get(token_id)
-            if refresh_token is not None:
-                return refresh_token
-
-        return None
+        return self._refresh_tokens.get(token_id)
 
     async def async_get_refresh_token_by_token(
             self, token: str) -> Optional[models.RefreshToken]:
@@ -254,15 +262,27 @@ class AuthStore:
             await self._async_load()
             assert self._users is not None
 
-        found = None
+        found = self._refresh_tokens_by_token.get(token)
 
-        for user in self._users.values():
-            for refresh_token in user.refresh_tokens.values():
-                if hmac.compare_digest(refresh_token.token, token):
-                    found = refresh_token
+        if found is None or not hmac.compare_digest(found.token, token):
+            return None
 
         return found
 
+    @callback
+    def _async_index_refresh_token(
+            self, refresh_token: models.RefreshToken) -> None:
+        """Add a refresh token to the indexes."""
+        self._refresh_tokens[refresh_token.id] = refresh_token
+        self._refresh_tokens_by_token[refresh_token.token] = refresh_token
+
+    @callback
+    def _async_unindex_refresh_token(
+            self, refresh_token: models.RefreshToken) -> None:
+        """Remove a refresh token from the indexes."""
+        self._refresh_tokens.pop(refresh_token.id, None)
+        self._refresh_tokens_by_token.pop(refresh_token.token, None)
+
     @callback
     def async_log_refresh_token_usage(
             self, refresh_token: models.RefreshToken,
@@ -296,6 +316,16 @@ class AuthStore:
             ent_reg, dev_reg
         )
 
+        @callback
+        def async_registry_updated(event: Event) -> None:
+            """Invalidate the cached permission lookups."""
+            perm_lookup.generation += 1
+
+        self.hass.bus.async_listen(
+            EVENT_ENTITY_REGISTRY_UPDATED, async_registry_updated)
+        self.hass.bus.async_listen(
+            EVENT_DEVICE_REGISTRY_UPDATED, async_registry_updated)
+
         if data is None:
             self._set_defaults()
             return
@@ -461,6 +491,7 @@ class AuthStore:
                 last_used_ip=rt_dict.get('last_used_ip'),
             )
             users[rt_dict['user_id']].refresh_tokens[token.id] = token
+            self._async_index_refresh_token(token)
 
         self._groups = groups
         self._users = users
@@ -3,6 +3,9 @@ from datetime import timedelta
 
 ACCESS_TOKEN_EXPIRATION = timedelta(minutes=30)
 MFA_SESSION_EXPIRATION = timedelta(minutes=5)
+# How long a validated access token is trusted without decoding it again
+ACCESS_TOKEN_CACHE_TTL = timedelta(minutes=1)
+ACCESS_TOKEN_CACHE_SIZE = 1024
 
 GROUP_ID_ADMIN = 'system-admin'
 GROUP_ID_USER = 'system-users'
@@ -52,11 +52,32 @@ class PolicyPermissions(AbstractPermissions):
         """Initialize the permission class."""
         self._policy = policy
         self._perm_lookup = perm_lookup
+        self._entity_cache = {}  # type: Dict[Tuple[str, str], bool]
+        self._entity_cache_generation = 0
 
     def access_all_entities(self, key: str) -> bool:
         """Check if we have a certain access to all entities."""
         return test_all(self._policy.get(CAT_ENTITIES), key)
 
+    def check_entity(self, entity_id: str, key: str) -> bool:
+        """Check if we can access entity.
+
+        Results are remembered until the entity or device registry changes.
+        """
+        if self._perm_lookup is not None and \
+                self._perm_lookup.generation != self._entity_cache_generation:
+            self._entity_cache.clear()
+            self._entity_cache_generation = self._perm_lookup.generation
+
+        cache_key = (entity_id, key)
+        result = self._entity_cache.get(cache_key)
+
+        if result is None:
+            result = self._entity_cache[cache_key] = \
+                super().check_entity(entity_id, key)
+
+        return result
+
     def _entity_func(self) -> Callable[[str, str], bool]:
         """Return a function that can test entity access."""
         return compile_entities(self._policy.get(CAT_ENTITIES),
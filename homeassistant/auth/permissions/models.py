@@ -19,3 +19,5 @@ class PermissionLookup:
 
     entity_registry = attr.ib(type='ent_reg.EntityRegistry')
     device_registry = attr.ib(type='dev_reg.DeviceRegistry')
+    # Increased when the registries change, invalidating cached lookups
+    generation = attr.ib(type=int, default=0, cmp=False)
@@ -1061,6 +1061,10 @@ class Config:
         self.should_expose = should_expose
         self.entity_config = entity_config or {}
 
+        # entity_id -> (state, endpoint) of the last discovery, kept with
+        # the config so it is dropped when the config is replaced
+        self.discovery_cache = {}
+
 
 async def async_setup(hass, config):
     """Activate Smart Home functionality of Alexa component.
@@ -1454,6 +1458,31 @@ async def async_send_changereport_message(hass, config, alexa_entity):
                       response_json["payload"]["description"])
 
 
+def _discovery_endpoint(hass, config, entity):
+    """Return the discovery endpoint of an entity.
+
+    Returns None if the entity has no capabilities.
+    """
+    alexa_entity = ENTITY_ADAPTERS[entity.domain](hass, config, entity)
+
+    endpoint = {
+        'displayCategories': alexa_entity.display_categories(),
+        'cookie': {},
+        'endpointId': alexa_entity.entity_id(),
+        'friendlyName': alexa_entity.friendly_name(),
+        'description': alexa_entity.description(),
+        'manufacturerName': 'Home Assistant',
+    }
+
+    endpoint['capabilities'] = [
+        i.serialize_discovery() for i in alexa_entity.interfaces()]
+
+    if not endpoint['capabilities']:
+        return None
+
+    return endpoint
+
+
 @HANDLERS.register(('Alexa.Discovery', 'Discover'))
 async def async_api_discovery(hass, config, directive, context):
     """Create a API formatted discovery response.
@@ -1462,6 +1491,11 @@ async def async_api_discovery(hass, config, directive, context):
     """
     discovery_endpoints = []
 
+    # The endpoints of the states that did not change since the last
+    # discovery are reused
+    old_cache = config.discovery_cache
+    cache = config.discovery_cache = {}
+
     for entity in hass.states.async_all():
         if entity.entity_id in CLOUD_NEVER_EXPOSED_ENTITIES:
             _LOGGER.debug("Not exposing %s because it is never exposed",
@@ -1475,21 +1509,16 @@ async def async_api_discovery(hass, config, directive, context):
 
         if entity.domain not in ENTITY_ADAPTERS:
             continue
-        alexa_entity = ENTITY_ADAPTERS[entity.domain](hass, config, entity)
-
-        endpoint = {
-            'displayCategories': alexa_entity.display_categories(),
-            'cookie': {},
-            'endpointId': alexa_entity.entity_id(),
-            'friendlyName': alexa_entity.friendly_name(),
-            'description': alexa_entity.description(),
-            'manufacturerName': 'Home Assistant',
-        }
 
-        endpoint['capabilities'] = [
-            i.serialize_discovery() for i in alexa_entity.interfaces()]
+        cached = old_cache.get(entity.entity_id)
+        if cached is not None and cached[0] is entity:
+            endpoint = cached[1]
+        else:
+            endpoint = _discovery_endpoint(hass, config, entity)
+
+        cache[entity.entity_id] = (entity, endpoint)
 
-        if not endpoint['capabilities']:
+        if endpoint is None:
             _LOGGER.debug(
                 "Not exposing %s because it has no capabilities",
                 entity.entity_id)
@@ -51,6 +51,7 @@ def setup(hass, config):
     hass.http.register_view(APIDomainServicesView)
     hass.http.register_view(APIComponentsView)
     hass.http.register_view(APITemplateView)
+    hass.http.register_view(APITemplateCacheView)
 
     if DATA_LOGGING in hass.data:
         hass.http.register_view(APIErrorLog)
@@ -374,6 +375,20 @@ class APITemplateView(HomeAssistantView):
                 "Error rendering template: {}".format(ex), HTTP_BAD_REQUEST)
 
 
+class APITemplateCacheView(HomeAssistantView):
+    """View to handle compiled template cache requests."""
+
+    url = '/api/template/cache'
+    name = 'api:template-cache'
+
+    @ha.callback
+    def get(self, request):
+        """Retrieve the statistics of the compiled template cache."""
+        if not request['hass_user'].is_admin:
+            raise Unauthorized()
+        return self.json(template.COMPILED_CODE.info())
+
+
 class APIErrorLog(HomeAssistantView):
     """View to fetch the API error log."""
 
@@ -35,7 +35,9 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.setup import async_when_setup
 
 from .const import DOMAIN, DATA_CAMERA_PREFS
+from .hub import async_get_frame_hub, async_get_stream_hub
 from .prefs import CameraPreferences
+from .snapshot import async_get_snapshot
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -125,7 +127,7 @@ async def async_get_image(hass, entity_id, timeout=10):
 
     with suppress(asyncio.CancelledError, asyncio.TimeoutError):
         async with async_timeout.timeout(timeout):
-            image = await camera.async_camera_image()
+            image = await async_get_snapshot(hass, camera)
 
             if image:
                 return Image(camera.content_type, image)
@@ -151,32 +153,61 @@ async def async_get_still_stream(request, image_cb, content_type, interval):
                              'boundary=--frameboundary')
     await response.prepare(request)
 
-    async def write_to_mjpeg_stream(img_bytes):
-        """Write image to stream."""
-        await response.write(bytes(
-            '--frameboundary\r\n'
-            'Content-Type: {}\r\n'
-            'Content-Length: {}\r\n\r\n'.format(
-                content_type, len(img_bytes)),
-            'utf-8') + img_bytes + b'\r\n')
+    # No await between the lookup and adding the viewer, the hub of a
+    # stopped producer could be returned otherwise
+    hub = async_get_frame_hub(
+        request.app['hass'], image_cb, content_type, interval)
+    remove_viewer = hub.async_add_viewer()
+    frame_id = 0
 
-    last_image = None
-
-    while True:
-        img_bytes = await image_cb()
-        if not img_bytes:
-            break
+    try:
+        while True:
+            next_frame_id, frame = await hub.async_next_frame(frame_id)
+            if frame is None:
+                break
 
-        if img_bytes != last_image:
-            await write_to_mjpeg_stream(img_bytes)
+            await response.write(frame)
 
             # Chrome seems to always ignore first picture,
             # print it twice.
-            if last_image is None:
-                await write_to_mjpeg_stream(img_bytes)
-            last_image = img_bytes
+            if frame_id == 0:
+                await response.write(frame)
+
+            frame_id = next_frame_id
+    finally:
+        remove_viewer()
+
+    return response
+
+
+async def async_proxy_shared_stream(request, key, open_stream):
+    """Proxy an upstream MJPEG stream shared by all requests of key.
+
+    open_stream is a coroutine function returning the aiohttp response of
+    the upstream stream, it is called once for all concurrent viewers.
+
+    This method must be run in the event loop.
+    """
+    hub = async_get_stream_hub(request.app['hass'], key, open_stream)
+    viewer = hub.async_add_viewer()
+
+    try:
+        content_type = await hub.async_content_type()
+        if content_type is None:
+            raise web.HTTPBadGateway()
+
+        response = web.StreamResponse()
+        response.content_type = content_type
+        await response.prepare(request)
+
+        while True:
+            data = await viewer.async_next_chunk()
+            if data is None:
+                break
 
-        await asyncio.sleep(interval)
+            await response.write(data)
+    finally:
+        viewer.remove()
 
     return response
 
@@ -492,7 +523,7 @@ class CameraImageView(CameraView):
         """Serve camera image."""
         with suppress(asyncio.CancelledError, asyncio.TimeoutError):
             async with async_timeout.timeout(10):
-                image = await camera.async_camera_image()
+                image = await async_get_snapshot(camera.hass, camera)
 
             if image:
                 return web.Response(body=image,
@@ -594,6 +625,7 @@ async def websocket_get_prefs(hass, connection, msg):
     vol.Required('type'): 'camera/update_prefs',
     vol.Required('entity_id'): cv.entity_id,
     vol.Optional('preload_stream'): bool,
+    vol.Optional('snapshot_ttl'): vol.All(vol.Coerce(float), vol.Range(min=0)),
 })
 async def websocket_update_prefs(hass, connection, msg):
     """Handle request for account info."""
@@ -2,5 +2,11 @@
 DOMAIN = 'camera'
 
 DATA_CAMERA_PREFS = 'camera_prefs'
+DATA_FRAME_HUBS = 'camera_frame_hubs'
+DATA_SNAPSHOTS = 'camera_snapshots'
+DATA_STREAM_HUBS = 'camera_stream_hubs'
 
 PREF_PRELOAD_STREAM = 'preload_stream'
+PREF_SNAPSHOT_TTL = 'snapshot_ttl'
+
+DEFAULT_SNAPSHOT_TTL = 0
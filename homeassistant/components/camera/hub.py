@@ -0,0 +1,356 @@
+"""Share the frames of camera streams between viewers."""
+import asyncio
+import hashlib
+import logging
+
+import aiohttp
+from aiohttp.hdrs import CONTENT_TYPE
+import async_timeout
+
+from homeassistant.core import callback
+
+from .const import DATA_FRAME_HUBS, DATA_STREAM_HUBS
+
+_LOGGER = logging.getLogger(__name__)
+
+STREAM_BUFFER_SIZE = 102400
+STREAM_TIMEOUT = 10
+# Chunks buffered for a viewer before it has to skip to the next part
+STREAM_QUEUE_SIZE = 32
+
+_RESYNC = object()
+
+
+@callback
+def async_get_frame_hub(hass, image_cb, content_type, interval):
+    """Return the hub producing frames from image_cb at interval."""
+    hubs = hass.data.get(DATA_FRAME_HUBS)
+    if hubs is None:
+        hubs = hass.data[DATA_FRAME_HUBS] = {}
+
+    key = (image_cb, content_type, interval)
+    hub = hubs.get(key)
+    if hub is None:
+        hub = hubs[key] = FrameHub(hass, image_cb, content_type, interval)
+        hub.async_on_stop(lambda: hubs.pop(key, None))
+
+    return hub
+
+
+@callback
+def async_get_stream_hub(hass, key, open_stream):
+    """Return the hub sharing the upstream stream of key."""
+    hubs = hass.data.get(DATA_STREAM_HUBS)
+    if hubs is None:
+        hubs = hass.data[DATA_STREAM_HUBS] = {}
+
+    hub = hubs.get(key)
+    if hub is None:
+        hub = hubs[key] = StreamHub(hass, open_stream)
+        hub.async_on_stop(lambda: hubs.pop(key, None))
+
+    return hub
+
+
+class FrameHub:
+    """Fetch the frames of an MJPEG stream once for all viewers.
+
+    A single producer fetches the images while there are viewers. Changed
+    images are detected by their digest and framed as a multipart part
+    once, all viewers write the same bytes.
+    """
+
+    def __init__(self, hass, image_cb, content_type, interval):
+        """Initialize the frame hub."""
+        self.hass = hass
+        self._image_cb = image_cb
+        self._content_type = content_type
+        self._interval = interval
+        self._viewers = 0
+        self._producer = None
+        self._stop_listeners = []
+        self._frame_id = 0
+        self._frame = None
+        self._digest = None
+        self._error = None
+        self._next_frame = hass.loop.create_future()
+
+    @property
+    def viewers(self):
+        """Return the number of viewers."""
+        return self._viewers
+
+    @callback
+    def async_on_stop(self, listener):
+        """Call listener when the producer stops."""
+        self._stop_listeners.append(listener)
+
+    @callback
+    def async_add_viewer(self):
+        """Add a viewer and return a function to remove it."""
+        self._viewers += 1
+
+        if self._producer is None:
+            self._producer = self.hass.async_create_task(self._async_produce())
+
+        @callback
+        def remove_viewer():
+            """Remove the viewer, stop the producer if it was the last."""
+            self._viewers -= 1
+
+            if self._viewers == 0 and self._producer is not None:
+                self._producer.cancel()
+                self._async_stop()
+
+        return remove_viewer
+
+    @callback
+    def _async_stop(self):
+        """Stop sharing the producer with new viewers."""
+        if self._producer is None:
+            return
+
+        self._producer = None
+        for listener in self._stop_listeners:
+            listener()
+
+    async def async_next_frame(self, frame_id):
+        """Return the first frame after frame_id.
+
+        Returns a tuple of the frame id and the frame as a multipart part.
+        The part is None when the stream has ended, the error that ended
+        the stream is raised.
+        """
+        if self._frame_id > frame_id and self._frame is not None:
+            return self._frame_id, self._frame
+
+        next_frame = await asyncio.shield(self._next_frame)
+        if next_frame[1] is None and self._error is not None:
+            raise self._error
+
+        return next_frame
+
+    def _frame_part(self, img_bytes):
+        """Return an image framed as a part of the MJPEG stream."""
+        return bytes(
+            '--frameboundary\r\n'
+            'Content-Type: {}\r\n'
+            'Content-Length: {}\r\n\r\n'.format(
+                self._content_type, len(img_bytes)),
+            'utf-8') + img_bytes + b'\r\n'
+
+    @callback
+    def _async_set_frame(self, frame):
+        """Make a frame available to the viewers."""
+        self._frame_id += 1
+        self._frame = frame
+        next_frame = self._next_frame
+        if frame is not None:
+            self._next_frame = self.hass.loop.create_future()
+        next_frame.set_result((self._frame_id, frame))
+
+    async def _async_produce(self):
+        """Fetch images until the stream ends."""
+        try:
+            while True:
+                img_bytes = await self._image_cb()
+                if not img_bytes:
+                    break
+
+                digest = hashlib.sha1(img_bytes).digest()
+                if digest != self._digest:
+                    self._digest = digest
+                    self._async_set_frame(self._frame_part(img_bytes))
+
+                await asyncio.sleep(self._interval)
+
+            self._async_set_frame(None)
+
+        except asyncio.CancelledError:
+            pass
+
+        except Exception as err:  # pylint: disable=broad-except
+            # Kept for the viewers, a future exception would be logged as
+            # never retrieved when no viewer is waiting
+            self._error = err
+            self._async_set_frame(None)
+
+        finally:
+            self._async_stop()
+
+
+class StreamHub:
+    """Read an upstream MJPEG stream once for all viewers.
+
+    A single producer reads the upstream response while there are viewers
+    and hands every chunk to each of them. Viewers joining late, or falling
+    behind, skip ahead to the next boundary of the multipart stream.
+    """
+
+    def __init__(self, hass, open_stream):
+        """Initialize the stream hub."""
+        self.hass = hass
+        self._open_stream = open_stream
+        self._viewers = []
+        self._producer = None
+        self._stop_listeners = []
+        self._boundary = None
+        self._content_type = hass.loop.create_future()
+
+    @property
+    def viewers(self):
+        """Return the number of viewers."""
+        return len(self._viewers)
+
+    @callback
+    def async_on_stop(self, listener):
+        """Call listener when the producer stops."""
+        self._stop_listeners.append(listener)
+
+    @callback
+    def async_add_viewer(self):
+        """Add a viewer and return it."""
+        viewer = StreamViewer(self)
+        self._viewers.append(viewer)
+
+        if self._producer is None:
+            self._producer = self.hass.async_create_task(self._async_produce())
+
+        return viewer
+
+    @callback
+    def async_remove_viewer(self, viewer):
+        """Remove a viewer, stop the producer if it was the last."""
+        self._viewers.remove(viewer)
+
+        if not self._viewers and self._producer is not None:
+            self._producer.cancel()
+            self._async_stop()
+
+    @callback
+    def _async_stop(self):
+        """Stop sharing the producer with new viewers."""
+        if self._producer is None:
+            return
+
+        self._producer = None
+        for listener in self._stop_listeners:
+            listener()
+
+    async def async_content_type(self):
+        """Return the content type of the upstream stream.
+
+        None is returned when the upstream stream could not be opened.
+        """
+        return await asyncio.shield(self._content_type)
+
+    def find_boundary(self, chunk):
+        """Return the index of the first part boundary in chunk or -1."""
+        if self._boundary is None:
+            return 0
+
+        index = chunk.find(self._boundary)
+        while index > 0 and chunk[index - 1:index] == b'-':
+            index -= 1
+        return index
+
+    @callback
+    def _async_set_content_type(self, content_type):
+        """Make the content type available to the viewers."""
+        if content_type is not None:
+            boundary = content_type.partition('boundary=')[2].strip('"')
+            if boundary:
+                self._boundary = boundary.lstrip('-').encode('utf-8')
+
+        self._content_type.set_result(content_type)
+
+    async def _async_produce(self):
+        """Read the upstream stream until it ends."""
+        try:
+            try:
+                async with async_timeout.timeout(STREAM_TIMEOUT):
+                    resp = await self._open_stream()
+            except (asyncio.TimeoutError, aiohttp.ClientError):
+                return
+
+            try:
+                self._async_set_content_type(
+                    resp.headers.get(CONTENT_TYPE))
+
+                while True:
+                    async with async_timeout.timeout(STREAM_TIMEOUT):
+                        data = await resp.content.read(STREAM_BUFFER_SIZE)
+                    if not data:
+                        break
+
+                    for viewer in self._viewers:
+                        viewer.put(data)
+
+            except (asyncio.TimeoutError, aiohttp.ClientError):
+                pass
+
+            finally:
+                resp.close()
+
+        except asyncio.CancelledError:
+            pass
+
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error reading the camera stream")
+
+        finally:
+            # Every way out ends the streams of the viewers
+            if not self._content_type.done():
+                self._async_set_content_type(None)
+
+            for viewer in self._viewers:
+                viewer.put(None)
+
+            self._async_stop()
+
+
+class StreamViewer:
+    """A viewer of the shared upstream stream of a stream hub."""
+
+    def __init__(self, hub):
+        """Initialize the viewer."""
+        self._hub = hub
+        self._queue = asyncio.Queue(STREAM_QUEUE_SIZE)
+        self._synced = False
+
+    @callback
+    def put(self, data):
+        """Queue a chunk, None ends the stream."""
+        try:
+            self._queue.put_nowait(data)
+        except asyncio.QueueFull:
+            # A slow viewer drops its backlog instead of holding the
+            # producer back
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait(_RESYNC if data is not None else None)
+
+    @callback
+    def remove(self):
+        """Stop viewing the stream."""
+        self._hub.async_remove_viewer(self)
+
+    async def async_next_chunk(self):
+        """Return the next chunk to write, None when the stream ended."""
+        while True:
+            data = await self._queue.get()
+            if data is None:
+                return None
+
+            if data is _RESYNC:
+                self._synced = False
+                continue
+
+            if not self._synced:
+                index = self._hub.find_boundary(data)
+                if index < 0:
+                    continue
+                self._synced = True
+                data = data[index:]
+
+            return data
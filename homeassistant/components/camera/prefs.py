@@ -1,5 +1,6 @@
 """Preference management for camera component."""
-from .const import DOMAIN, PREF_PRELOAD_STREAM
+from .const import (
+    DEFAULT_SNAPSHOT_TTL, DOMAIN, PREF_PRELOAD_STREAM, PREF_SNAPSHOT_TTL)
 
 STORAGE_KEY = DOMAIN
 STORAGE_VERSION = 1
@@ -22,6 +23,11 @@ class CameraEntityPreferences:
         """Return if stream is loaded on hass start."""
         return self._prefs.get(PREF_PRELOAD_STREAM, False)
 
+    @property
+    def snapshot_ttl(self):
+        """Return the seconds a snapshot of the camera is reused."""
+        return self._prefs.get(PREF_SNAPSHOT_TTL, DEFAULT_SNAPSHOT_TTL)
+
 
 class CameraPreferences:
     """Handle camera preferences."""
@@ -42,13 +48,14 @@ class CameraPreferences:
         self._prefs = prefs
 
     async def async_update(self, entity_id, *, preload_stream=_UNDEF,
-                           stream_options=_UNDEF):
+                           stream_options=_UNDEF, snapshot_ttl=_UNDEF):
         """Update camera preferences."""
         if not self._prefs.get(entity_id):
             self._prefs[entity_id] = {}
 
         for key, value in (
                 (PREF_PRELOAD_STREAM, preload_stream),
+                (PREF_SNAPSHOT_TTL, snapshot_ttl),
         ):
             if value is not _UNDEF:
                 self._prefs[entity_id][key] = value
@@ -0,0 +1,60 @@
+"""Share snapshots of cameras between requests."""
+import asyncio
+from time import monotonic
+
+from .const import DATA_CAMERA_PREFS, DATA_SNAPSHOTS
+
+
+async def async_get_snapshot(hass, camera):
+    """Return a snapshot of a camera.
+
+    Concurrent requests share one fetch from the camera. A snapshot is
+    reused for the snapshot TTL in the preferences of the camera.
+    """
+    cache = hass.data.get(DATA_SNAPSHOTS)
+    if cache is None:
+        cache = hass.data[DATA_SNAPSHOTS] = SnapshotCache(hass)
+
+    prefs = hass.data[DATA_CAMERA_PREFS].get(camera.entity_id)
+    return await cache.async_get(camera, prefs.snapshot_ttl)
+
+
+class SnapshotCache:
+    """Cache of the last snapshot of each camera."""
+
+    def __init__(self, hass):
+        """Initialize the snapshot cache."""
+        self.hass = hass
+        # entity_id -> (image, monotonic time of the fetch)
+        self._snapshots = {}
+        self._fetches = {}
+
+    async def async_get(self, camera, ttl):
+        """Return a snapshot no older than ttl seconds."""
+        entity_id = camera.entity_id
+        snapshot = self._snapshots.get(entity_id)
+
+        if snapshot is not None and monotonic() - snapshot[1] < ttl:
+            return snapshot[0]
+
+        fetch = self._fetches.get(entity_id)
+        if fetch is None:
+            fetch = self._fetches[entity_id] = self.hass.async_create_task(
+                self._async_fetch(camera, ttl))
+
+        # A request that times out does not cancel the shared fetch
+        return await asyncio.shield(fetch)
+
+    async def _async_fetch(self, camera, ttl):
+        """Fetch an image from a camera."""
+        try:
+            image = await camera.async_camera_image()
+        finally:
+            self._fetches.pop(camera.entity_id, None)
+
+        if image and ttl:
+            self._snapshots[camera.entity_id] = (image, monotonic())
+        else:
+            self._snapshots.pop(camera.entity_id, None)
+
+        return image
@@ -4,14 +4,14 @@ import logging
 from aiohttp import web
 import voluptuous as vol
 
-from homeassistant import util
+from homeassistant import core, util
 from homeassistant.const import (
     EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP,
 )
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.deprecation import get_deprecated
 import homeassistant.helpers.config_validation as cv
-from homeassistant.util.json import load_json, save_json
+from homeassistant.util.json import load_json
 from homeassistant.components.http import real_ip
 
 from .hue_api import (
@@ -24,6 +24,9 @@ DOMAIN = 'emulated_hue'
 _LOGGER = logging.getLogger(__name__)
 
 NUMBERS_FILE = 'emulated_hue_ids.json'
+STORAGE_KEY = DOMAIN
+STORAGE_VERSION = 1
+SAVE_DELAY = 10
 
 CONF_ADVERTISE_IP = 'advertise_ip'
 CONF_ADVERTISE_PORT = 'advertise_port'
@@ -80,6 +83,7 @@ ATTR_EMULATED_HUE_HIDDEN = 'emulated_hue_hidden'
 async def async_setup(hass, yaml_config):
     """Activate the emulated_hue component."""
     config = Config(hass, yaml_config.get(DOMAIN, {}))
+    await config.async_setup()
 
     app = web.Application()
     app['hass'] = hass
@@ -149,6 +153,9 @@ class Config:
         self.hass = hass
         self.type = conf.get(CONF_TYPE)
         self.numbers = None
+        self._entity_numbers = None
+        self._next_number = 1
+        self._store = None
         self.cached_states = {}
 
         if self.type == TYPE_ALEXA:
@@ -203,24 +210,38 @@ class Config:
 
         self.entities = conf.get(CONF_ENTITIES, {})
 
+    async def async_setup(self):
+        """Load the numbers of the entities."""
+        if self.type == TYPE_ALEXA:
+            return
+
+        self._store = self.hass.helpers.storage.Store(
+            STORAGE_VERSION, STORAGE_KEY)
+        numbers = await self.hass.helpers.storage.async_migrator(
+            self.hass.config.path(NUMBERS_FILE), self._store,
+            old_conf_load_func=_load_json)
+
+        self.numbers = numbers or {}
+        self._entity_numbers = {
+            entity_id: number for number, entity_id in self.numbers.items()}
+        if self.numbers:
+            self._next_number = max(int(k) for k in self.numbers) + 1
+
     def entity_id_to_number(self, entity_id):
         """Get a unique number for the entity id."""
         if self.type == TYPE_ALEXA:
             return entity_id
 
-        if self.numbers is None:
-            self.numbers = _load_json(self.hass.config.path(NUMBERS_FILE))
-
         # Google Home
-        for number, ent_id in self.numbers.items():
-            if entity_id == ent_id:
-                return number
+        number = self._entity_numbers.get(entity_id)
+        if number is not None:
+            return number
 
-        number = '1'
-        if self.numbers:
-            number = str(max(int(k) for k in self.numbers) + 1)
+        number = str(self._next_number)
+        self._next_number += 1
         self.numbers[number] = entity_id
-        save_json(self.hass.config.path(NUMBERS_FILE), self.numbers)
+        self._entity_numbers[entity_id] = number
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
         return number
 
     def number_to_entity_id(self, number):
@@ -228,13 +249,15 @@ class Config:
         if self.type == TYPE_ALEXA:
             return number
 
-        if self.numbers is None:
-            self.numbers = _load_json(self.hass.config.path(NUMBERS_FILE))
-
         # Google Home
         assert isinstance(number, str)
         return self.numbers.get(number)
 
+    @core.callback
+    def _data_to_save(self):
+        """Return the numbers to store."""
+        return dict(self.numbers)
+
     def get_entity_name(self, entity):
         """Get the name of an entity."""
         if entity.entity_id in self.entities and \
@@ -127,6 +127,8 @@ class HueAllLightsStateView(HomeAssistantView):
     def __init__(self, config):
         """Initialize the instance of the view."""
         self.config = config
+        # entity_id -> (state, cached state, number, rendered light)
+        self._lights = {}
 
     @core.callback
     def get(self, request, username):
@@ -137,14 +139,31 @@ class HueAllLightsStateView(HomeAssistantView):
 
         hass = request.app['hass']
         json_response = {}
+        lights = {}
 
         for entity in hass.states.async_all():
-            if self.config.is_entity_exposed(entity):
-                state = get_entity_state(self.config, entity)
+            cached_state = self.config.cached_states.get(entity.entity_id)
+            light = self._lights.get(entity.entity_id)
 
-                number = self.config.entity_id_to_number(entity.entity_id)
-                json_response[number] = entity_to_json(self.config,
-                                                       entity, state)
+            # Render the light again only when its state changed
+            if light is None or light[0] is not entity or \
+                    light[1] is not cached_state:
+                number = light_json = None
+
+                if self.config.is_entity_exposed(entity):
+                    state = get_entity_state(self.config, entity)
+                    number = self.config.entity_id_to_number(
+                        entity.entity_id)
+                    light_json = entity_to_json(self.config, entity, state)
+
+                light = (entity, cached_state, number, light_json)
+
+            lights[entity.entity_id] = light
+
+            if light[3] is not None:
+                json_response[light[2]] = light[3]
+
+        self._lights = lights
 
         return self.json(json_response)
 
@@ -19,6 +19,8 @@ DOMAIN = 'google_assistant'
 
 GOOGLE_ASSISTANT_API_ENDPOINT = '/api/google_assistant'
 
+DATA_REGISTRY_GENERATION = 'google_assistant_registry_generation'
+
 CONF_EXPOSE = 'expose'
 CONF_ENTITY_CONFIG = 'entity_config'
 CONF_EXPOSE_BY_DEFAULT = 'expose_by_default'
@@ -8,11 +8,16 @@ from homeassistant.const import (
     CONF_NAME, STATE_UNAVAILABLE, ATTR_SUPPORTED_FEATURES,
     ATTR_DEVICE_CLASS, CLOUD_NEVER_EXPOSED_ENTITIES
 )
+from homeassistant.helpers.area_registry import EVENT_AREA_REGISTRY_UPDATED
+from homeassistant.helpers.device_registry import (
+    EVENT_DEVICE_REGISTRY_UPDATED)
+from homeassistant.helpers.entity_registry import (
+    EVENT_ENTITY_REGISTRY_UPDATED)
 
 from . import trait
 from .const import (
     DOMAIN_TO_GOOGLE_TYPES, CONF_ALIASES, ERR_FUNCTION_NOT_SUPPORTED,
-    DEVICE_CLASS_TO_GOOGLE_TYPES, CONF_ROOM_HINT
+    DEVICE_CLASS_TO_GOOGLE_TYPES, CONF_ROOM_HINT, DATA_REGISTRY_GENERATION
 )
 from .error import SmartHomeError
 
@@ -32,6 +37,10 @@ class Config:
         # Agent User Id to use for query responses
         self.agent_user_id = agent_user_id
 
+        # Google entities of this config, kept with it so they are dropped
+        # when the config is replaced
+        self.entity_cache = None
+
     def should_2fa(self, state):
         """If an entity should have 2FA checked."""
         return self._should_2fa is None or self._should_2fa(state)
@@ -63,6 +72,7 @@ class GoogleEntity:
         self.config = config
         self.state = state
         self._traits = None
+        self._sync_payload = None
 
     @property
     def entity_id(self):
@@ -106,6 +116,13 @@ class GoogleEntity:
 
         https://developers.google.com/actions/smarthome/create-app#actiondevicessync
         """
+        if self._sync_payload is None:
+            self._sync_payload = await self._async_sync_serialize()
+
+        return self._sync_payload
+
+    async def _async_sync_serialize(self):
+        """Serialize entity for a SYNC response."""
         state = self.state
 
         entity_config = self.config.entity_config.get(state.entity_id, {})
@@ -205,6 +222,7 @@ class GoogleEntity:
     def async_update(self):
         """Update the entity with latest info from Home Assistant."""
         self.state = self.hass.states.get(self.entity_id)
+        self._sync_payload = None
 
         if self._traits is None:
             return
@@ -226,14 +244,102 @@ def deep_update(target, source):
 @callback
 def async_get_entities(hass, config) -> List[GoogleEntity]:
     """Return all entities that are supported by Google."""
-    entities = []
-    for state in hass.states.async_all():
-        if state.entity_id in CLOUD_NEVER_EXPOSED_ENTITIES:
-            continue
+    return _async_get_entity_cache(hass, config).async_entities()
+
+
+@callback
+def async_get_entity(hass, config, state) -> GoogleEntity:
+    """Return the Google entity of a state."""
+    return _async_get_entity_cache(hass, config).async_entity(state)
+
+
+@callback
+def _async_get_entity_cache(hass, config):
+    """Return the entity cache of a config."""
+    cache = config.entity_cache
+    if cache is None or cache.hass is not hass:
+        cache = config.entity_cache = GoogleEntityCache(hass, config)
+
+    return cache
+
+
+@callback
+def _async_registry_generation(hass):
+    """Return a number that changes whenever a registry is updated."""
+    generation = hass.data.get(DATA_REGISTRY_GENERATION)
+    if generation is not None:
+        return generation[0]
+
+    # Listened to once, the caches of replaced configs hold no listeners
+    generation = hass.data[DATA_REGISTRY_GENERATION] = [0]
+
+    @callback
+    def registry_updated(event):
+        """Count the registry updates."""
+        generation[0] += 1
+
+    for event_type in (EVENT_ENTITY_REGISTRY_UPDATED,
+                       EVENT_DEVICE_REGISTRY_UPDATED,
+                       EVENT_AREA_REGISTRY_UPDATED):
+        hass.bus.async_listen(event_type, registry_updated)
+
+    return generation[0]
+
+
+class GoogleEntityCache:
+    """Keep the Google entities of the states that did not change.
+
+    An entity is created again, with its traits and SYNC payload, when the
+    state of the entity changes. The SYNC payloads include the area of the
+    device, all entities are created again when a registry changes.
+    """
+
+    def __init__(self, hass, config):
+        """Initialize the entity cache."""
+        self.hass = hass
+        self.config = config
+        self._entities = {}
+        self._generation = _async_registry_generation(hass)
+
+    @callback
+    def _async_check_registries(self):
+        """Forget the entities when their room hint may have changed."""
+        generation = _async_registry_generation(self.hass)
+        if generation != self._generation:
+            self._generation = generation
+            self._entities = {}
+
+    @callback
+    def async_entity(self, state):
+        """Return the entity of a state."""
+        self._async_check_registries()
+        entity = self._entities.get(state.entity_id)
+
+        if entity is None or entity.state is not state:
+            entity = self._entities[state.entity_id] = GoogleEntity(
+                self.hass, self.config, state)
+
+        return entity
+
+    @callback
+    def async_entities(self):
+        """Return all entities that are supported by Google."""
+        self._async_check_registries()
+        old_entities = self._entities
+        self._entities = {}
+        entities = []
+
+        for state in self.hass.states.async_all():
+            if state.entity_id in CLOUD_NEVER_EXPOSED_ENTITIES:
+                continue
+
+            entity = old_entities.get(state.entity_id)
+            if entity is None or entity.state is not state:
+                entity = GoogleEntity(self.hass, self.config, state)
 
-        entity = GoogleEntity(hass, config, state)
+            self._entities[state.entity_id] = entity
 
-        if entity.is_supported():
-            entities.append(entity)
+            if entity.is_supported():
+                entities.append(entity)
 
-    return entities
+        return entities
@@ -11,7 +11,8 @@ from .const import (
     ERR_PROTOCOL_ERROR, ERR_DEVICE_OFFLINE, ERR_UNKNOWN_ERROR,
     EVENT_COMMAND_RECEIVED, EVENT_SYNC_RECEIVED, EVENT_QUERY_RECEIVED
 )
-from .helpers import RequestData, GoogleEntity, async_get_entities
+from .helpers import (
+    RequestData, GoogleEntity, async_get_entities, async_get_entity)
 from .error import SmartHomeError
 
 HANDLERS = Registry()
@@ -119,7 +120,7 @@ async def async_devices_query(hass, data, payload):
             devices[devid] = {'online': False}
             continue
 
-        entity = GoogleEntity(hass, data.config, state)
+        entity = async_get_entity(hass, data.config, state)
         devices[devid] = entity.query_serialize()
 
     return {'devices': devices}
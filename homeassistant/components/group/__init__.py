@@ -21,6 +21,7 @@ from homeassistant.util.async_ import run_coroutine_threadsafe
 from .reproduce_state import async_reproduce_states  # noqa
 
 DOMAIN = 'group'
+DATA_EXPANSION = 'group_expansion'
 
 ENTITY_ID_FORMAT = DOMAIN + '.{}'
 
@@ -127,7 +128,8 @@ def expand_entity_ids(hass, entity_ids):
 
     Async friendly.
     """
-    found_ids = []
+    expansion = _get_expansion(hass)
+    found_ids = {}
     for entity_id in entity_ids:
         if not isinstance(entity_id, str):
             continue
@@ -137,26 +139,116 @@ def expand_entity_ids(hass, entity_ids):
         try:
             # If entity_id points at a group, expand it
             domain, _ = ha.split_entity_id(entity_id)
+        except AttributeError:
+            # Raised by split_entity_id if entity_id is not a string
+            continue
+
+        if domain == DOMAIN:
+            found_ids.update(dict.fromkeys(expansion.members(entity_id)))
+        else:
+            found_ids[entity_id] = None
+
+    return list(found_ids)
+
+
+def _get_expansion(hass):
+    """Return the group expansion cache."""
+    expansion = hass.data.get(DATA_EXPANSION)
+    if expansion is None:
+        expansion = hass.data[DATA_EXPANSION] = GroupExpansion(hass)
+    return expansion
+
+
+class GroupExpansion:
+    """Flattened members of groups, cached until the groups change.
+
+    A cached expansion remembers the member lists of all groups that were
+    walked to build it. It stays valid as long as the states of those
+    groups hold the same member lists, so nested groups are only walked
+    again after one of them changed.
+    """
+
+    def __init__(self, hass):
+        """Initialize the group expansion cache."""
+        self.hass = hass
+        # group entity_id -> (flattened members, ((group, member list), ...))
+        self._expanded = {}
+
+    def members(self, group_id):
+        """Return the flattened members of a group."""
+        cached = self._expanded.get(group_id)
+
+        if cached is not None and self._is_valid(cached[1]):
+            return cached[0]
+
+        members, _, _ = self._expand(group_id, set())
+        return members
 
-            if domain == DOMAIN:
-                child_entities = get_entity_ids(hass, entity_id)
-                if entity_id in child_entities:
-                    child_entities = list(child_entities)
-                    child_entities.remove(entity_id)
-                found_ids.extend(
-                    ent_id for ent_id
-                    in expand_entity_ids(hass, child_entities)
-                    if ent_id not in found_ids)
+    def _member_list(self, group_id):
+        """Return the member list in the state of a group."""
+        state = self.hass.states.get(group_id)
 
+        if state is None:
+            return None
+
+        return state.attributes.get(ATTR_ENTITY_ID)
+
+    def _is_valid(self, walked):
+        """Return if the groups walked for an expansion are unchanged."""
+        return all(self._member_list(group_id) is member_list
+                   for group_id, member_list in walked)
+
+    def _expand(self, group_id, expanding):
+        """Walk the members of a group, skipping groups being expanded.
+
+        Returns the flattened members, the walked groups and if the
+        expansion is complete. Expansions cut short by a cycle through
+        other groups are not cached, they depend on where the walk began.
+        """
+        member_list = self._member_list(group_id)
+        found_ids = {}
+        walked = [(group_id, member_list)]
+        complete = True
+
+        expanding.add(group_id)
+
+        for member in member_list or ():
+            if not isinstance(member, str):
+                continue
+
+            member = member.lower()
+
+            if member == group_id:
+                continue
+
+            if not member.startswith(DOMAIN + '.'):
+                found_ids[member] = None
+                continue
+
+            if member in expanding:
+                complete = False
+                continue
+
+            cached = self._expanded.get(member)
+            if cached is not None and self._is_valid(cached[1]):
+                members, member_walked = cached
             else:
-                if entity_id not in found_ids:
-                    found_ids.append(entity_id)
+                members, member_walked, member_complete = \
+                    self._expand(member, expanding)
+                complete = complete and member_complete
 
-        except AttributeError:
-            # Raised by split_entity_id if entity_id is not a string
-            pass
+            found_ids.update(dict.fromkeys(members))
+            walked.extend(member_walked)
+
+        expanding.discard(group_id)
+
+        members = tuple(found_ids)
+        walked = tuple(walked)
+
+        if complete:
+            self._expanded[group_id] = (members, walked)
 
-    return found_ids
+        return members, walked, complete
 
 
 @bind_hass
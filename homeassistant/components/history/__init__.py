@@ -2,19 +2,27 @@
 from collections import defaultdict
 from datetime import timedelta
 from itertools import groupby
+import json
 import logging
 import time
 
+from aiohttp import web
+from aiohttp.hdrs import CONTENT_TYPE
 import voluptuous as vol
 
 from homeassistant.const import (
-    HTTP_BAD_REQUEST, CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE)
+    HTTP_BAD_REQUEST, CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE,
+    CONTENT_TYPE_JSON)
 import homeassistant.util.dt as dt_util
 from homeassistant.components import recorder, script
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import ATTR_HIDDEN
+from homeassistant.components.recorder.statistics import (
+    PERIOD_HOUR, PERIODS, statistics_during_period)
 from homeassistant.components.recorder.util import session_scope, execute
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.json import JSONEncoder
+from homeassistant.util.async_ import run_coroutine_threadsafe
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,6 +38,30 @@ CONFIG_SCHEMA = vol.Schema({
 SIGNIFICANT_DOMAINS = ('thermostat', 'climate', 'water_heater')
 IGNORE_DOMAINS = ('zone', 'scene',)
 
+# Rows fetched per database round trip when streaming
+STREAM_BATCH_SIZE = 500
+# Bytes of JSON collected before they are written to the client
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _significant_states_query(session, start_time, end_time=None,
+                              entity_ids=None, filters=None):
+    """Return the query for significant state changes during a period."""
+    from homeassistant.components.recorder.models import States
+
+    query = session.query(States).filter(
+        (States.domain.in_(SIGNIFICANT_DOMAINS) |
+         (States.last_changed == States.last_updated)) &
+        (States.last_updated > start_time))
+
+    if filters:
+        query = filters.apply(query, entity_ids)
+
+    if end_time is not None:
+        query = query.filter(States.last_updated < end_time)
+
+    return query
+
 
 def get_significant_states(hass, start_time, end_time=None, entity_ids=None,
                            filters=None, include_start_time_state=True):
@@ -44,16 +76,8 @@ def get_significant_states(hass, start_time, end_time=None, entity_ids=None,
     from homeassistant.components.recorder.models import States
 
     with session_scope(hass=hass) as session:
-        query = session.query(States).filter(
-            (States.domain.in_(SIGNIFICANT_DOMAINS) |
-             (States.last_changed == States.last_updated)) &
-            (States.last_updated > start_time))
-
-        if filters:
-            query = filters.apply(query, entity_ids)
-
-        if end_time is not None:
-            query = query.filter(States.last_updated < end_time)
+        query = _significant_states_query(
+            session, start_time, end_time, entity_ids, filters)
 
         query = query.order_by(States.last_updated)
 
@@ -72,6 +96,124 @@ def get_significant_states(hass, start_time, end_time=None, entity_ids=None,
         include_start_time_state)
 
 
+def stream_significant_states(hass, write, start_time, end_time=None,
+                              entity_ids=None, filters=None,
+                              include_start_time_state=True,
+                              entity_order=None):
+    """Stream significant states during a period as JSON.
+
+    Writes the JSON of get_significant_states as a list of state lists,
+    one per entity, ordered by entity_id or by entity_order for the entities
+    it contains. Rows are fetched in batches and passed to write as chunks
+    of bytes, so memory use does not grow with the size of the period.
+    """
+    from sqlalchemy import case
+    from homeassistant.components.recorder.models import States
+
+    order = {entity_id: idx for idx, entity_id
+             in enumerate(entity_order or ())}
+
+    def sort_key(entity_id):
+        """Return the position of an entity in the output."""
+        return order.get(entity_id, len(order)), entity_id
+
+    start_states = {}
+    if include_start_time_state:
+        for state in get_states(hass, start_time, entity_ids, filters=filters):
+            state.last_changed = start_time
+            state.last_updated = start_time
+            start_states[state.entity_id] = state
+
+    # Entities with a start state that are not written yet, next one last
+    pending = sorted(start_states, key=sort_key, reverse=True)
+
+    chunks = []
+    chunks_size = 0
+    emitted_entities = 0
+    current_entity_id = None
+
+    def emit(data):
+        """Add data to the output, writing it once a chunk is complete."""
+        nonlocal chunks_size
+        chunks.append(data)
+        chunks_size += len(data)
+        if chunks_size >= STREAM_CHUNK_SIZE:
+            flush()
+
+    def flush():
+        """Write the collected output."""
+        nonlocal chunks_size
+        if chunks:
+            write(''.join(chunks).encode('UTF-8'))
+            chunks.clear()
+            chunks_size = 0
+
+    def encode(state):
+        """Encode a state as JSON."""
+        return json.dumps(state, sort_keys=True, cls=JSONEncoder,
+                          allow_nan=False)
+
+    def start_entity(state):
+        """Open the state list of an entity."""
+        emit('[' if emitted_entities == 0 else ',')
+        emit('[')
+        emit(encode(state))
+
+    def write_start_states_before(entity_id):
+        """Write the entities before entity_id that only have a start state."""
+        nonlocal emitted_entities
+        key = sort_key(entity_id) if entity_id is not None else None
+        while pending and (key is None or sort_key(pending[-1]) < key):
+            start_entity(start_states[pending.pop()])
+            emit(']')
+            emitted_entities += 1
+
+    with session_scope(hass=hass) as session:
+        query = _significant_states_query(
+            session, start_time, end_time, entity_ids, filters)
+
+        if order:
+            query = query.order_by(
+                case(order, value=States.entity_id, else_=len(order)))
+
+        query = query.order_by(
+            States.entity_id, States.last_updated).yield_per(
+                STREAM_BATCH_SIZE)
+
+        for row in query:
+            state = row.to_native()
+            if (state is None or not _is_significant(state) or
+                    state.attributes.get(ATTR_HIDDEN, False)):
+                continue
+
+            if state.entity_id == current_entity_id:
+                emit(',')
+                emit(encode(state))
+                continue
+
+            if current_entity_id is not None:
+                emit(']')
+                emitted_entities += 1
+
+            write_start_states_before(state.entity_id)
+            current_entity_id = state.entity_id
+
+            if pending and pending[-1] == current_entity_id:
+                start_entity(start_states[pending.pop()])
+                emit(',')
+                emit(encode(state))
+            else:
+                start_entity(state)
+
+    if current_entity_id is not None:
+        emit(']')
+        emitted_entities += 1
+
+    write_start_states_before(None)
+    emit(']' if emitted_entities else '[]')
+    flush()
+
+
 def state_changes_during_period(hass, start_time, end_time=None,
                                 entity_id=None):
     """Return states changes during UTC period start_time - end_time."""
@@ -252,6 +394,7 @@ async def async_setup(hass, config):
     use_include_order = conf.get(CONF_ORDER)
 
     hass.http.register_view(HistoryPeriodView(filters, use_include_order))
+    hass.http.register_view(HistoryStatisticsView)
     hass.components.frontend.async_register_built_in_panel(
         'history', 'history', 'hass:poll-box')
 
@@ -306,6 +449,11 @@ class HistoryPeriodView(HomeAssistantView):
 
         hass = request.app['hass']
 
+        if 'stream' in request.query:
+            return await self._async_stream(
+                request, start_time, end_time, entity_ids,
+                include_start_time_state)
+
         result = await hass.async_add_job(
             get_significant_states, hass, start_time, end_time,
             entity_ids, self.filters, include_start_time_state)
@@ -331,6 +479,79 @@ class HistoryPeriodView(HomeAssistantView):
 
         return await hass.async_add_job(self.json, result)
 
+    async def _async_stream(self, request, start_time, end_time, entity_ids,
+                            include_start_time_state):
+        """Stream the history as chunked JSON."""
+        hass = request.app['hass']
+        response = web.StreamResponse(
+            headers={CONTENT_TYPE: CONTENT_TYPE_JSON})
+        response.enable_chunked_encoding()
+        response.enable_compression()
+        await response.prepare(request)
+
+        def write(data):
+            """Write a chunk and wait until the client accepted it."""
+            run_coroutine_threadsafe(
+                response.write(data), hass.loop).result()
+
+        entity_order = None
+        if self.use_include_order:
+            entity_order = self.filters.included_entities
+
+        await hass.async_add_job(
+            stream_significant_states, hass, write, start_time, end_time,
+            entity_ids, self.filters, include_start_time_state,
+            entity_order)
+        await response.write_eof()
+        return response
+
+
+class HistoryStatisticsView(HomeAssistantView):
+    """Handle long-term statistics requests."""
+
+    url = '/api/history/statistics'
+    name = 'api:history:view-statistics'
+    extra_urls = ['/api/history/statistics/{datetime}']
+
+    async def get(self, request, datetime=None):
+        """Return hourly or daily statistics of numeric sensors."""
+        if datetime:
+            datetime = dt_util.parse_datetime(datetime)
+
+            if datetime is None:
+                return self.json_message('Invalid datetime', HTTP_BAD_REQUEST)
+
+        now = dt_util.utcnow()
+
+        if datetime:
+            start_time = dt_util.as_utc(datetime)
+        else:
+            start_time = now - timedelta(days=30)
+
+        end_time = request.query.get('end_time')
+        if end_time:
+            end_time = dt_util.parse_datetime(end_time)
+            if end_time:
+                end_time = dt_util.as_utc(end_time)
+            else:
+                return self.json_message('Invalid end_time', HTTP_BAD_REQUEST)
+
+        period = request.query.get('period', PERIOD_HOUR)
+        if period not in PERIODS:
+            return self.json_message('Invalid period', HTTP_BAD_REQUEST)
+
+        entity_ids = request.query.get('filter_entity_id')
+        if entity_ids:
+            entity_ids = entity_ids.lower().split(',')
+
+        hass = request.app['hass']
+
+        result = await hass.async_add_job(
+            statistics_during_period, hass, start_time, end_time, entity_ids,
+            period)
+
+        return await hass.async_add_job(self.json, result)
+
 
 class Filters:
     """Container for the configured include and exclude filters."""
@@ -1,4 +1,5 @@
 """Component to make instant statistics about your history."""
+from collections import deque
 import datetime
 import logging
 import math
@@ -101,6 +102,15 @@ class HistoryStatsSensor(Entity):
         self.value = None
         self.count = None
 
+        # Measure since the start of the period, up to the last change
+        self._history_start = None
+        self._history_time = None
+        self._history_state = False
+        self._elapsed = 0
+        self._count = 0
+        # Changes seen since the last update, as (timestamp, matches state)
+        self._changes = deque()
+
         @callback
         def start_refresh(*args):
             """Register state tracking."""
@@ -109,6 +119,8 @@ class HistoryStatsSensor(Entity):
                 """Force the component to refresh."""
                 self.async_schedule_update_ha_state(True)
 
+            async_track_state_change(
+                self.hass, self._entity_id, self._async_add_change)
             force_refresh()
             async_track_state_change(self.hass, self._entity_id, force_refresh)
 
@@ -184,51 +196,102 @@ class HistoryStatsSensor(Entity):
         p_end_timestamp = math.floor(dt_util.as_timestamp(p_end))
         now_timestamp = math.floor(dt_util.as_timestamp(now))
 
-        # If period has not changed and current time after the period end...
+        # If period has not changed, current time after the period end and
+        # no change is waiting to be measured...
         if start_timestamp == p_start_timestamp and \
             end_timestamp == p_end_timestamp and \
-                end_timestamp <= now_timestamp:
+                end_timestamp <= now_timestamp and not self._changes:
             # Don't compute anything as the value cannot have changed
             return
 
+        # Only read the history again when the start of the period moved
+        if self._history_start != start_timestamp or \
+                self._history_time is None or \
+                end_timestamp < math.floor(self._history_time):
+            if not self._load_history(start, end, start_timestamp):
+                # The history is read again on the next update, with the
+                # changes seen meanwhile
+                self._changes.clear()
+                return
+
+        self._apply_changes(end_timestamp, now_timestamp)
+        elapsed = self._elapsed
+
+        # Count time elapsed between last history state and end of measure
+        if self._history_state:
+            measure_end = min(end_timestamp, now_timestamp)
+            elapsed += measure_end - self._history_time
+
+        # Save value in hours
+        self.value = elapsed / 3600
+
+        # Save counter
+        self.count = self._count
+
+    def _load_history(self, start, end, start_timestamp):
+        """Measure the history of the period from the database.
+
+        Returns False if the database has no history for the period.
+        """
         # Get history between start and end
         history_list = history.state_changes_during_period(
             self.hass, start, end, str(self._entity_id))
 
         if self._entity_id not in history_list.keys():
-            return
+            return False
 
         # Get the first state
         last_state = history.get_state(self.hass, start, self._entity_id)
-        last_state = (last_state is not None and
-                      last_state == self._entity_state)
-        last_time = start_timestamp
-        elapsed = 0
-        count = 0
+        self._history_start = start_timestamp
+        self._history_state = (last_state is not None and
+                               last_state == self._entity_state)
+        self._history_time = start_timestamp
+        self._elapsed = 0
+        self._count = 0
 
         # Make calculations
         for item in history_list.get(self._entity_id):
-            current_state = item.state == self._entity_state
-            current_time = item.last_changed.timestamp()
-
-            if last_state:
-                elapsed += current_time - last_time
-            if current_state and not last_state:
-                count += 1
+            self._add_change(item.last_changed.timestamp(),
+                             item.state == self._entity_state)
 
-            last_state = current_state
-            last_time = current_time
-
-        # Count time elapsed between last history state and end of measure
-        if last_state:
-            measure_end = min(end_timestamp, now_timestamp)
-            elapsed += measure_end - last_time
-
-        # Save value in hours
-        self.value = elapsed / 3600
+        return True
 
-        # Save counter
-        self.count = count
+    def _apply_changes(self, end_timestamp, now_timestamp):
+        """Add the changes seen since the last update to the measure."""
+        while self._changes:
+            change_time, matches = self._changes.popleft()
+
+            if change_time > end_timestamp:
+                if end_timestamp < now_timestamp - 1:
+                    # The period is over, the change will not be measured
+                    continue
+
+                # Not part of this measure yet, keep it for the next one
+                self._changes.appendleft((change_time, matches))
+                break
+
+            # Skip changes that were read from the database
+            if change_time > self._history_time:
+                self._add_change(change_time, matches)
+
+    def _add_change(self, change_time, matches):
+        """Add a change of the entity to the measure."""
+        if self._history_state:
+            self._elapsed += change_time - self._history_time
+        if matches and not self._history_state:
+            self._count += 1
+
+        self._history_state = matches
+        self._history_time = change_time
+
+    @callback
+    def _async_add_change(self, entity_id, old_state, new_state):
+        """Remember a change of the entity for the next update."""
+        if new_state is None:
+            self._changes.append((dt_util.utcnow().timestamp(), False))
+        elif old_state is None or old_state.state != new_state.state:
+            self._changes.append((new_state.last_changed.timestamp(),
+                                  new_state.state == self._entity_state))
 
     def update_period(self):
         """Parse the templates and store a datetime tuple in _period."""
@@ -1,17 +1,21 @@
 """Ban logic for HTTP component."""
-from collections import defaultdict
-from datetime import datetime
-from ipaddress import ip_address
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from functools import partial
+from ipaddress import ip_network
 import logging
+from time import monotonic
 
 from aiohttp.web import middleware
 from aiohttp.web_exceptions import HTTPForbidden, HTTPUnauthorized
 import voluptuous as vol
 
 from homeassistant.config import load_yaml_config_file
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_call_later
 from homeassistant.util.yaml import dump
 
 from .const import KEY_REAL_IP
@@ -21,6 +25,7 @@ _LOGGER = logging.getLogger(__name__)
 KEY_BANNED_IPS = 'ha_banned_ips'
 KEY_FAILED_LOGIN_ATTEMPTS = 'ha_failed_login_attempts'
 KEY_LOGIN_THRESHOLD = 'ha_login_threshold'
+KEY_UNSAVED_BANS = 'ha_unsaved_ip_bans'
 
 NOTIFICATION_ID_BAN = 'ip-ban'
 NOTIFICATION_ID_LOGIN = 'http-login'
@@ -28,6 +33,11 @@ NOTIFICATION_ID_LOGIN = 'http-login'
 IP_BANS_FILE = 'ip_bans.yaml'
 ATTR_BANNED_AT = 'banned_at'
 
+# Failed login attempts older than this are forgotten
+LOGIN_ATTEMPTS_WINDOW = timedelta(hours=24)
+# New bans are written to the bans file in batches after this delay
+IP_BANS_SAVE_DELAY = 10
+
 SCHEMA_IP_BAN_ENTRY = vol.Schema({
     vol.Optional('banned_at'): vol.Any(None, cv.datetime)
 })
@@ -37,16 +47,23 @@ SCHEMA_IP_BAN_ENTRY = vol.Schema({
 def setup_bans(hass, app, login_threshold):
     """Create IP Ban middleware for the app."""
     app.middlewares.append(ban_middleware)
-    app[KEY_FAILED_LOGIN_ATTEMPTS] = defaultdict(int)
+    app[KEY_FAILED_LOGIN_ATTEMPTS] = FailedLoginAttempts(LOGIN_ATTEMPTS_WINDOW)
     app[KEY_LOGIN_THRESHOLD] = login_threshold
+    app[KEY_UNSAVED_BANS] = []
 
     async def ban_startup(app):
         """Initialize bans when app starts up."""
-        app[KEY_BANNED_IPS] = await async_load_ip_bans_config(
-            hass, hass.config.path(IP_BANS_FILE))
+        app[KEY_BANNED_IPS] = IpBans(await async_load_ip_bans_config(
+            hass, hass.config.path(IP_BANS_FILE)))
 
     app.on_startup.append(ban_startup)
 
+    async def save_bans_on_stop(event):
+        """Write the new bans before stopping."""
+        await _async_save_ip_bans(hass, app)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, save_bans_on_stop)
+
 
 @middleware
 async def ban_middleware(request, handler):
@@ -56,11 +73,7 @@ async def ban_middleware(request, handler):
         return await handler(request)
 
     # Verify if IP is not banned
-    ip_address_ = request[KEY_REAL_IP]
-    is_banned = any(ip_ban.ip_address == ip_address_
-                    for ip_ban in request.app[KEY_BANNED_IPS])
-
-    if is_banned:
+    if request[KEY_REAL_IP] in request.app[KEY_BANNED_IPS]:
         raise HTTPForbidden()
 
     try:
@@ -102,15 +115,14 @@ async def process_wrong_login(request):
             request.app[KEY_LOGIN_THRESHOLD] < 1):
         return
 
-    request.app[KEY_FAILED_LOGIN_ATTEMPTS][remote_addr] += 1
+    attempts = request.app[KEY_FAILED_LOGIN_ATTEMPTS].async_add(remote_addr)
 
-    if (request.app[KEY_FAILED_LOGIN_ATTEMPTS][remote_addr] >=
-            request.app[KEY_LOGIN_THRESHOLD]):
+    if (attempts >= request.app[KEY_LOGIN_THRESHOLD] and
+            remote_addr not in request.app[KEY_BANNED_IPS]):
         new_ban = IpBan(remote_addr)
-        request.app[KEY_BANNED_IPS].append(new_ban)
-
-        await hass.async_add_job(
-            update_ip_bans_config, hass.config.path(IP_BANS_FILE), new_ban)
+        request.app[KEY_BANNED_IPS].add(new_ban)
+        request.app[KEY_FAILED_LOGIN_ATTEMPTS].async_reset(remote_addr)
+        _async_schedule_save_ip_ban(hass, request.app, new_ban)
 
         _LOGGER.warning(
             "Banned IP %s for too many login attempts", remote_addr)
@@ -134,21 +146,151 @@ async def process_success_login(request):
             request.app[KEY_LOGIN_THRESHOLD] < 1):
         return
 
-    if remote_addr in request.app[KEY_FAILED_LOGIN_ATTEMPTS] and \
-            request.app[KEY_FAILED_LOGIN_ATTEMPTS][remote_addr] > 0:
+    if remote_addr in request.app[KEY_FAILED_LOGIN_ATTEMPTS]:
         _LOGGER.debug('Login success, reset failed login attempts counter'
                       ' from %s', remote_addr)
-        request.app[KEY_FAILED_LOGIN_ATTEMPTS].pop(remote_addr)
+        request.app[KEY_FAILED_LOGIN_ATTEMPTS].async_reset(remote_addr)
+
+
+@callback
+def _async_schedule_save_ip_ban(hass: HomeAssistant, app, ip_ban) -> None:
+    """Write a new ban to the bans file together with later ones."""
+    unsaved = app[KEY_UNSAVED_BANS]
+    unsaved.append(ip_ban)
+
+    if len(unsaved) == 1:
+        async_call_later(hass, IP_BANS_SAVE_DELAY,
+                         partial(_async_save_ip_bans, hass, app))
+
+
+async def _async_save_ip_bans(hass: HomeAssistant, app, _now=None) -> None:
+    """Write the unsaved bans to the bans file."""
+    unsaved = list(app[KEY_UNSAVED_BANS])
+    app[KEY_UNSAVED_BANS].clear()
+
+    if unsaved:
+        await hass.async_add_executor_job(
+            update_ip_bans_config, hass.config.path(IP_BANS_FILE), unsaved)
 
 
 class IpBan:
-    """Represents banned IP address."""
+    """Represents banned IP address or network."""
 
-    def __init__(self, ip_ban: str, banned_at: datetime = None) -> None:
+    def __init__(self, ip_ban, banned_at: datetime = None) -> None:
         """Initialize IP Ban object."""
-        self.ip_address = ip_address(ip_ban)
+        self.ip_network = ip_network(ip_ban, strict=False)
         self.banned_at = banned_at or datetime.utcnow()
 
+    def __str__(self) -> str:
+        """Return the banned address, or network in CIDR notation."""
+        if self.ip_network.prefixlen == self.ip_network.max_prefixlen:
+            return str(self.ip_network.network_address)
+        return str(self.ip_network)
+
+
+class IpBans:
+    """Banned IP addresses and networks, indexed for lookups.
+
+    Single addresses are kept in a dictionary. Networks are kept in a hash
+    table per prefix length, so a lookup takes one probe for every prefix
+    length in use instead of a comparison with every ban.
+    """
+
+    def __init__(self, ip_bans=()) -> None:
+        """Initialize the banned IP addresses."""
+        self._bans = []
+        self._addresses = {}
+        # (version, prefix length) -> {network bits: IpBan}
+        self._networks = {}
+        for ip_ban in ip_bans:
+            self.add(ip_ban)
+
+    def add(self, ip_ban: IpBan) -> None:
+        """Add a ban."""
+        network = ip_ban.ip_network
+        self._bans.append(ip_ban)
+
+        if network.prefixlen == network.max_prefixlen:
+            self._addresses[network.network_address] = ip_ban
+            return
+
+        self._networks.setdefault(
+            (network.version, network.prefixlen), {})[
+                int(network.network_address) >>
+                (network.max_prefixlen - network.prefixlen)] = ip_ban
+
+    def __contains__(self, address) -> bool:
+        """Return if an IP address is banned."""
+        if address in self._addresses:
+            return True
+
+        for (version, prefixlen), networks in self._networks.items():
+            if version == address.version and (
+                    int(address) >> (address.max_prefixlen - prefixlen)
+                    in networks):
+                return True
+
+        return False
+
+    def __iter__(self):
+        """Iterate over the bans."""
+        return iter(self._bans)
+
+    def __len__(self) -> int:
+        """Return the number of bans."""
+        return len(self._bans)
+
+
+class FailedLoginAttempts:
+    """Count the failed login attempts per IP address in a sliding window."""
+
+    def __init__(self, window: timedelta) -> None:
+        """Initialize the failed login attempts."""
+        self._window = window.total_seconds()
+        # address -> attempts, ordered by the latest attempt
+        self._attempts = OrderedDict()
+
+    @callback
+    def async_add(self, address) -> int:
+        """Record a failed attempt and return the attempts in the window."""
+        now = monotonic()
+        threshold = now - self._window
+
+        attempts = self._attempts.get(address)
+        if attempts is None:
+            attempts = self._attempts[address] = deque()
+        else:
+            self._attempts.move_to_end(address)
+        attempts.append(now)
+        while attempts[0] <= threshold:
+            attempts.popleft()
+
+        # Forget the addresses that stopped trying
+        while True:
+            oldest = next(iter(self._attempts))
+            if self._attempts[oldest][-1] > threshold:
+                break
+            del self._attempts[oldest]
+
+        return len(attempts)
+
+    @callback
+    def async_reset(self, address) -> None:
+        """Forget the failed attempts of an address."""
+        self._attempts.pop(address, None)
+
+    def __getitem__(self, address) -> int:
+        """Return the failed attempts of an address in the window."""
+        attempts = self._attempts.get(address)
+        if attempts is None:
+            return 0
+        threshold = monotonic() - self._window
+        return sum(1 for attempt in attempts if attempt > threshold)
+
+    def __contains__(self, address) -> bool:
+        """Return if an address has failed attempts in the window."""
+        return self[address] > 0
+
 
 async def async_load_ip_bans_config(hass: HomeAssistant, path: str):
     """Load list of banned IPs from config file."""
@@ -166,18 +308,18 @@ async def async_load_ip_bans_config(hass: HomeAssistant, path: str):
         try:
             ip_info = SCHEMA_IP_BAN_ENTRY(ip_info)
             ip_list.append(IpBan(ip_ban, ip_info['banned_at']))
-        except vol.Invalid as err:
-            _LOGGER.error("Failed to load IP ban %s: %s", ip_info, err)
+        except (vol.Invalid, ValueError) as err:
+            _LOGGER.error("Failed to load IP ban %s: %s", ip_ban, err)
             continue
 
     return ip_list
 
 
-def update_ip_bans_config(path: str, ip_ban: IpBan):
-    """Update config file with new banned IP address."""
+def update_ip_bans_config(path: str, ip_bans):
+    """Update config file with new banned IP addresses."""
     with open(path, 'a') as out:
-        ip_ = {str(ip_ban.ip_address): {
+        ip_ = {str(ip_ban): {
             ATTR_BANNED_AT: ip_ban.banned_at.strftime("%Y-%m-%dT%H:%M:%S")
-        }}
+        } for ip_ban in ip_bans}
         out.write('\n')
         out.write(dump(ip_))
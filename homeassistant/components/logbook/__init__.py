@@ -1,8 +1,11 @@
 """Event parser and human readable log generator."""
 from datetime import timedelta
 from itertools import groupby
+import json
 import logging
 
+from aiohttp import web
+from aiohttp.hdrs import CONTENT_TYPE, LINK
 import voluptuous as vol
 
 from homeassistant.loader import bind_hass
@@ -10,7 +13,7 @@ from homeassistant.components import sun
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import (
     ATTR_DOMAIN, ATTR_ENTITY_ID, ATTR_HIDDEN, ATTR_NAME, ATTR_SERVICE,
-    CONF_EXCLUDE, CONF_INCLUDE, EVENT_HOMEASSISTANT_START,
+    CONF_EXCLUDE, CONF_INCLUDE, CONTENT_TYPE_JSON, EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP, EVENT_LOGBOOK_ENTRY, EVENT_STATE_CHANGED,
     EVENT_AUTOMATION_TRIGGERED, EVENT_SCRIPT_STARTED, HTTP_BAD_REQUEST,
     STATE_NOT_HOME, STATE_OFF, STATE_ON)
@@ -21,6 +24,8 @@ from homeassistant.components.homekit.const import (
     ATTR_DISPLAY_NAME, ATTR_VALUE, DOMAIN as DOMAIN_HOMEKIT,
     EVENT_HOMEKIT_CHANGED)
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.json import JSONEncoder
+from homeassistant.util.async_ import run_coroutine_threadsafe
 import homeassistant.util.dt as dt_util
 
 _LOGGER = logging.getLogger(__name__)
@@ -35,6 +40,12 @@ DOMAIN = 'logbook'
 
 GROUP_BY_MINUTES = 15
 
+# Number of events fetched from the database at once
+QUERY_BATCH_SIZE = 500
+
+# Streamed responses are written in chunks of this many characters
+STREAM_CHUNK_SIZE = 64 * 1024
+
 CONFIG_SCHEMA = vol.Schema({
     DOMAIN: vol.Schema({
         CONF_EXCLUDE: vol.Schema({
@@ -142,13 +153,73 @@ class LogbookView(HomeAssistantView):
         end_day = start_day + timedelta(days=period)
         hass = request.app['hass']
 
+        cursor = request.query.get('cursor')
+        if cursor is not None:
+            cursor = dt_util.parse_datetime(cursor)
+
+            if cursor is None:
+                return self.json_message('Invalid cursor', HTTP_BAD_REQUEST)
+            cursor = dt_util.as_utc(cursor)
+
+        limit = request.query.get('limit')
+        if limit is not None:
+            try:
+                limit = int(limit)
+            except ValueError:
+                limit = 0
+
+            if limit < 1:
+                return self.json_message('Invalid limit', HTTP_BAD_REQUEST)
+
+            entries, next_cursor = await hass.async_add_job(
+                _get_events_page, hass, self.config, start_day, end_day,
+                entity_id, cursor, limit)
+            response = await hass.async_add_job(self.json, entries)
+
+            if next_cursor is not None:
+                response.headers[LINK] = '<{}>; rel="next"'.format(
+                    request.rel_url.update_query(
+                        cursor=next_cursor.isoformat()))
+            return response
+
+        if 'stream' in request.query:
+            return await self._async_stream(
+                request, start_day, end_day, entity_id, cursor)
+
         def json_events():
             """Fetch events and generate JSON."""
             return self.json(
-                _get_events(hass, self.config, start_day, end_day, entity_id))
+                _get_events(hass, self.config, start_day, end_day, entity_id,
+                            cursor))
 
         return await hass.async_add_job(json_events)
 
+    async def _async_stream(self, request, start_day, end_day, entity_id,
+                            cursor):
+        """Stream the logbook entries as chunked JSON."""
+        hass = request.app['hass']
+        response = web.StreamResponse(
+            headers={CONTENT_TYPE: CONTENT_TYPE_JSON})
+        response.enable_chunked_encoding()
+        response.enable_compression()
+        await response.prepare(request)
+
+        def write(data):
+            """Write a chunk and wait until the client accepted it."""
+            run_coroutine_threadsafe(
+                response.write(data), hass.loop).result()
+
+        await hass.async_add_job(
+            stream_events, hass, write, self.config, start_day, end_day,
+            entity_id, cursor)
+        await response.write_eof()
+        return response
+
+
+def _group_key(event):
+    """Return the key of the batch of GROUP_BY_MINUTES an event is in."""
+    return event.time_fired.minute // GROUP_BY_MINUTES
+
 
 def humanify(hass, events):
     """Generate a converted list of events into Entry objects.
@@ -160,9 +231,7 @@ def humanify(hass, events):
     domain_prefixes = tuple('{}.'.format(dom) for dom in CONTINUOUS_DOMAINS)
 
     # Group events in batches of GROUP_BY_MINUTES
-    for _, g_events in groupby(
-            events,
-            lambda event: event.time_fired.minute // GROUP_BY_MINUTES):
+    for _, g_events in groupby(events, _group_key):
 
         events_batch = list(g_events)
 
@@ -388,36 +457,119 @@ def _generate_filter_from_config(config):
                            excluded_domains, excluded_entities)
 
 
-def _get_events(hass, config, start_day, end_day, entity_id=None):
-    """Get events for a period of time."""
+def _yield_events(session, config, start_day, end_day, entity_id=None,
+                  cursor=None):
+    """Yield the events of a period that belong in the logbook.
+
+    The event types, the period, attribute-only state changes, removed
+    entities and the entity filter are matched by the database on indexed
+    columns. Only the checks that need the event data are left to
+    _keep_event.
+    """
     from homeassistant.components.recorder.models import Events, States
-    from homeassistant.components.recorder.util import session_scope
 
     entities_filter = _generate_filter_from_config(config)
 
-    def yield_events(query):
-        """Yield Events that are not filtered away."""
-        for row in query.yield_per(500):
-            event = row.to_native()
-            if _keep_event(event, entities_filter):
-                yield event
+    query = session.query(Events).order_by(Events.time_fired) \
+        .outerjoin(States, (Events.event_id == States.event_id)) \
+        .filter(Events.event_type.in_(ALL_EVENT_TYPES)) \
+        .filter((Events.time_fired > start_day)
+                & (Events.time_fired < end_day))
+
+    if cursor is not None:
+        query = query.filter(Events.time_fired >= cursor)
+
+    state_changes = (States.last_updated == States.last_changed)
+
+    if entity_id is not None:
+        state_changes &= (States.entity_id == entity_id.lower())
+    elif config.get(CONF_INCLUDE) or config.get(CONF_EXCLUDE):
+        state_changes &= States.entity_id.in_(
+            _get_related_entity_ids(session, entities_filter))
+
+    # State changed events without a state row are entity removals
+    query = query.filter(
+        state_changes |
+        (States.state_id.is_(None) &
+         (Events.event_type != EVENT_STATE_CHANGED)))
+
+    for row in query.yield_per(QUERY_BATCH_SIZE):
+        event = row.to_native()
+        if _keep_event(event, entities_filter):
+            yield event
+
+
+def _get_events(hass, config, start_day, end_day, entity_id=None,
+                cursor=None):
+    """Get events for a period of time."""
+    from homeassistant.components.recorder.util import session_scope
 
     with session_scope(hass=hass) as session:
-        if entity_id is not None:
-            entity_ids = [entity_id.lower()]
-        else:
-            entity_ids = _get_related_entity_ids(session, entities_filter)
-
-        query = session.query(Events).order_by(Events.time_fired) \
-            .outerjoin(States, (Events.event_id == States.event_id)) \
-            .filter(Events.event_type.in_(ALL_EVENT_TYPES)) \
-            .filter((Events.time_fired > start_day)
-                    & (Events.time_fired < end_day)) \
-            .filter(((States.last_updated == States.last_changed) &
-                     States.entity_id.in_(entity_ids))
-                    | (States.state_id.is_(None)))
-
-        return list(humanify(hass, yield_events(query)))
+        return list(humanify(hass, _yield_events(
+            session, config, start_day, end_day, entity_id, cursor)))
+
+
+def _get_events_page(hass, config, start_day, end_day, entity_id=None,
+                     cursor=None, limit=QUERY_BATCH_SIZE):
+    """Get a page of events for a period of time.
+
+    Returns the entries of at least limit events and the cursor the next
+    page starts at, or None for the last page. Pages end between two
+    batches of GROUP_BY_MINUTES, so they are grouped as the whole period.
+    """
+    from homeassistant.components.recorder.util import session_scope
+
+    next_cursor = None
+
+    def page(events):
+        """Yield events until the batch after limit events starts."""
+        nonlocal next_cursor
+        count = 0
+        key = None
+        for event in events:
+            if count >= limit and _group_key(event) != key:
+                next_cursor = event.time_fired
+                return
+            key = _group_key(event)
+            count += 1
+            yield event
+
+    with session_scope(hass=hass) as session:
+        entries = list(humanify(hass, page(_yield_events(
+            session, config, start_day, end_day, entity_id, cursor))))
+
+    return entries, next_cursor
+
+
+def stream_events(hass, write, config, start_day, end_day, entity_id=None,
+                  cursor=None):
+    """Stream the logbook entries of a period as JSON.
+
+    Entries are written while the events are fetched, passed to write as
+    chunks of bytes, so memory use does not grow with the size of the period.
+    """
+    from homeassistant.components.recorder.util import session_scope
+
+    chunks = []
+    chunks_size = 0
+    separator = '['
+
+    with session_scope(hass=hass) as session:
+        for entry in humanify(hass, _yield_events(
+                session, config, start_day, end_day, entity_id, cursor)):
+            data = separator + json.dumps(
+                entry, cls=JSONEncoder, allow_nan=False)
+            separator = ','
+            chunks.append(data)
+            chunks_size += len(data)
+
+            if chunks_size >= STREAM_CHUNK_SIZE:
+                write(''.join(chunks).encode('UTF-8'))
+                chunks.clear()
+                chunks_size = 0
+
+    chunks.append('[]' if separator == '[' else ']')
+    write(''.join(chunks).encode('UTF-8'))
 
 
 def _keep_event(event, entities_filter):
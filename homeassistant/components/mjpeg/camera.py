@@ -12,9 +12,9 @@ import voluptuous as vol
 from homeassistant.const import (
     CONF_NAME, CONF_USERNAME, CONF_PASSWORD, CONF_AUTHENTICATION,
     HTTP_BASIC_AUTHENTICATION, HTTP_DIGEST_AUTHENTICATION, CONF_VERIFY_SSL)
-from homeassistant.components.camera import (PLATFORM_SCHEMA, Camera)
-from homeassistant.helpers.aiohttp_client import (
-    async_get_clientsession, async_aiohttp_proxy_web)
+from homeassistant.components.camera import (
+    PLATFORM_SCHEMA, Camera, async_proxy_shared_stream)
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers import config_validation as cv
 
 _LOGGER = logging.getLogger(__name__)
@@ -158,9 +158,14 @@ class MjpegCamera(Camera):
             self.hass,
             verify_ssl=self._verify_ssl
         )
-        stream_coro = websession.get(self._mjpeg_url, auth=self._auth)
 
-        return await async_aiohttp_proxy_web(self.hass, request, stream_coro)
+        def open_stream():
+            """Open the upstream stream."""
+            return websession.get(self._mjpeg_url, auth=self._auth)
+
+        # Concurrent viewers of the same upstream share one connection
+        return await async_proxy_shared_stream(
+            request, (self._mjpeg_url, self._auth), open_stream)
 
     @property
     def name(self):
@@ -10,7 +10,8 @@ import os
 import socket
 import ssl
 import time
-from typing import Any, Callable, List, Optional, Union, cast  # noqa: F401
+from typing import (  # noqa: F401
+    Any, Callable, Dict, List, Optional, Union, cast)
 
 import attr
 import requests.certs
@@ -642,12 +643,15 @@ class MQTT:
                  tls_version: Optional[int]) -> None:
         """Initialize Home Assistant MQTT client."""
         import paho.mqtt.client as mqtt
+        from paho.mqtt.matcher import MQTTMatcher
 
         self.hass = hass
         self.broker = broker
         self.port = port
         self.keepalive = keepalive
         self.subscriptions = []  # type: List[Subscription]
+        # Topic filter trie mapping each subscribed topic to its subscriptions
+        self._matcher = MQTTMatcher()
         self.birth_message = birth_message
         self.connected = False
         self._mqttc = None  # type: mqtt.Client
@@ -738,6 +742,10 @@ class MQTT:
 
         subscription = Subscription(topic, msg_callback, qos, encoding)
         self.subscriptions.append(subscription)
+        try:
+            self._matcher[topic].append(subscription)
+        except KeyError:
+            self._matcher[topic] = [subscription]
 
         await self._async_perform_subscription(topic, qos)
 
@@ -748,10 +756,14 @@ class MQTT:
                 raise HomeAssistantError("Can't remove subscription twice")
             self.subscriptions.remove(subscription)
 
-            if any(other.topic == topic for other in self.subscriptions):
+            topic_subscriptions = self._matcher[topic]
+            topic_subscriptions.remove(subscription)
+            if topic_subscriptions:
                 # Other subscriptions on topic remaining - don't unsubscribe.
                 return
 
+            del self._matcher[topic]
+
             # Only unsubscribe if currently connected.
             if self.connected:
                 self.hass.async_create_task(self._async_unsubscribe(topic))
@@ -817,23 +829,37 @@ class MQTT:
         _LOGGER.debug("Received message on %s%s: %s", msg.topic,
                       " (retained)" if msg.retain else "", msg.payload)
 
-        for subscription in self.subscriptions:
-            if not _match_topic(subscription.topic, msg.topic):
+        subscriptions = [
+            subscription
+            for topic_subscriptions in self._matcher.iter_match(msg.topic)
+            for subscription in topic_subscriptions]
+
+        # Decode the payload once per encoding and share the message
+        messages = {}  # type: Dict[Optional[str], Optional[Message]]
+
+        for subscription in subscriptions:
+            encoding = subscription.encoding
+
+            if encoding not in messages:
+                payload = msg.payload  # type: SubscribePayloadType
+                if encoding is not None:
+                    try:
+                        payload = msg.payload.decode(encoding)
+                    except (AttributeError, UnicodeDecodeError):
+                        _LOGGER.warning(
+                            "Can't decode payload %s on %s with encoding %s",
+                            msg.payload, msg.topic, encoding)
+                        messages[encoding] = None
+                        continue
+
+                messages[encoding] = Message(
+                    msg.topic, payload, msg.qos, msg.retain)
+
+            message = messages[encoding]
+            if message is None:
                 continue
 
-            payload = msg.payload  # type: SubscribePayloadType
-            if subscription.encoding is not None:
-                try:
-                    payload = msg.payload.decode(subscription.encoding)
-                except (AttributeError, UnicodeDecodeError):
-                    _LOGGER.warning(
-                        "Can't decode payload %s on %s with encoding %s",
-                        msg.payload, msg.topic, subscription.encoding)
-                    continue
-
-            self.hass.async_run_job(
-                subscription.callback, Message(msg.topic, payload, msg.qos,
-                                               msg.retain))
+            self.hass.async_run_job(subscription.callback, message)
 
     def _mqtt_on_disconnect(self, _mqttc, _userdata, result_code: int) -> None:
         """Disconnected callback."""
@@ -872,18 +898,6 @@ def _raise_on_error(result_code: int) -> None:
             'Error talking to MQTT: {}'.format(mqtt.error_string(result_code)))
 
 
-def _match_topic(subscription: str, topic: str) -> bool:
-    """Test if topic matches subscription."""
-    from paho.mqtt.matcher import MQTTMatcher
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-    try:
-        next(matcher.iter_match(topic))
-        return True
-    except StopIteration:
-        return False
-
-
 class MqttAttributes(Entity):
     """Mixin used for platforms that support JSON attributes."""
 
@@ -166,6 +166,12 @@ class ImageOpts():
         """Bool evaluation rules."""
         return bool(self.max_width or self.quality)
 
+    @property
+    def dimensions(self):
+        """Return the options that change the processed image."""
+        return (self.max_width, self.max_height, self.left, self.top,
+                self.quality, self.force_resize)
+
 
 class ProxyCamera(Camera):
     """The representation of a Proxy camera."""
@@ -201,6 +207,8 @@ class ProxyCamera(Camera):
         self._last_image_time = dt_util.utc_from_timestamp(0)
         self._last_image = None
         self._mode = config.get(CONF_MODE)
+        # dimensions -> (original image, processed image)
+        self._processed_images = {}
 
     def camera_image(self):
         """Return camera image."""
@@ -223,12 +231,8 @@ class ProxyCamera(Camera):
             _LOGGER.error("Error getting original camera image")
             return self._last_image
 
-        if self._mode == MODE_RESIZE:
-            job = _resize_image
-        else:
-            job = _crop_image
-        image = await self.hass.async_add_executor_job(
-            job, image.content, self._image_opts)
+        image = await self._async_process_image(
+            image.content, self._image_opts)
 
         if self._cache_images:
             self._last_image = image
@@ -259,9 +263,25 @@ class ProxyCamera(Camera):
         except HomeAssistantError:
             raise asyncio.CancelledError()
 
+        return await self._async_process_image(
+            image.content, self._stream_opts)
+
+    async def _async_process_image(self, image, opts):
+        """Resize or crop an image.
+
+        The result is reused as long as the same image is processed with
+        the same dimensions.
+        """
+        processed = self._processed_images.get(opts.dimensions)
+        if processed is not None and processed[0] == image:
+            return processed[1]
+
         if self._mode == MODE_RESIZE:
             job = _resize_image
         else:
             job = _crop_image
-        return await self.hass.async_add_executor_job(
-            job, image.content, self._stream_opts)
+        result = await self.hass.async_add_executor_job(job, image, opts)
+
+        # Cropping fills in the dimensions of the options
+        self._processed_images[opts.dimensions] = (image, result)
+        return result
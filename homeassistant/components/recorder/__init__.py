@@ -1,16 +1,17 @@
 """Support for recording details."""
 import asyncio
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 import concurrent.futures
 from datetime import datetime, timedelta
 import logging
 import queue
 import threading
 import time
-from typing import Any, Dict, Optional  # noqa: F401
+from typing import Any, Dict, List, Optional  # noqa: F401
 
 import voluptuous as vol
 
+from homeassistant.components import websocket_api
 from homeassistant.const import (
     ATTR_ENTITY_ID, CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE,
     EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED,
@@ -21,7 +22,7 @@ from homeassistant.helpers.entityfilter import generate_filter
 from homeassistant.helpers.typing import ConfigType
 import homeassistant.util.dt as dt_util
 
-from . import migration, purge
+from . import migration, purge, statistics
 from .const import DATA_INSTANCE
 from .util import session_scope
 
@@ -46,9 +47,14 @@ CONF_DB_URL = 'db_url'
 CONF_PURGE_KEEP_DAYS = 'purge_keep_days'
 CONF_PURGE_INTERVAL = 'purge_interval'
 CONF_EVENT_TYPES = 'event_types'
+CONF_COMMIT_INTERVAL = 'commit_interval'
+CONF_COMMIT_MAX_EVENTS = 'commit_max_events'
 
 CONNECT_RETRY_WAIT = 3
 
+# Number of recently written attribute sets whose row id is kept in memory
+STATE_ATTRIBUTES_CACHE_SIZE = 2048
+
 FILTER_SCHEMA = vol.Schema({
     vol.Optional(CONF_EXCLUDE, default={}): vol.Schema({
         vol.Optional(CONF_DOMAINS): vol.All(cv.ensure_list, [cv.string]),
@@ -68,6 +74,10 @@ CONFIG_SCHEMA = vol.Schema({
         vol.Optional(CONF_PURGE_INTERVAL, default=1):
             vol.All(vol.Coerce(int), vol.Range(min=0)),
         vol.Optional(CONF_DB_URL): cv.string,
+        vol.Optional(CONF_COMMIT_INTERVAL, default=0):
+            vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_COMMIT_MAX_EVENTS, default=1000):
+            vol.All(vol.Coerce(int), vol.Range(min=1)),
     })
 }, extra=vol.ALLOW_EXTRA)
 
@@ -98,6 +108,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     conf = config.get(DOMAIN, {})
     keep_days = conf.get(CONF_PURGE_KEEP_DAYS)
     purge_interval = conf.get(CONF_PURGE_INTERVAL)
+    commit_interval = conf.get(CONF_COMMIT_INTERVAL, 0)
+    commit_max_events = conf.get(CONF_COMMIT_MAX_EVENTS, 1000)
 
     db_url = conf.get(CONF_DB_URL, None)
     if not db_url:
@@ -108,7 +120,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     exclude = conf.get(CONF_EXCLUDE, {})
     instance = hass.data[DATA_INSTANCE] = Recorder(
         hass=hass, keep_days=keep_days, purge_interval=purge_interval,
-        uri=db_url, include=include, exclude=exclude)
+        uri=db_url, include=include, exclude=exclude,
+        commit_interval=commit_interval, commit_max_events=commit_max_events)
     instance.async_initialize()
     instance.start()
 
@@ -120,10 +133,37 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         DOMAIN, SERVICE_PURGE, async_handle_purge_service,
         schema=SERVICE_PURGE_SCHEMA)
 
+    websocket_api.async_register_command(hass, ws_info)
+
     return await instance.async_db_ready
 
 
+@websocket_api.websocket_command({
+    vol.Required('type'): 'recorder/info',
+})
+@websocket_api.require_admin
+@callback
+def ws_info(hass, connection, msg):
+    """Return the state of the recorder queue and its commits.
+
+    backlog is the number of events waiting to be committed. The last
+    commit is described by last_commit_events and last_commit_duration, in
+    seconds. max_commit_duration is the slowest commit since the start.
+    The durations are None before the first commit.
+    """
+    instance = hass.data[DATA_INSTANCE]
+    connection.send_result(msg['id'], {
+        'backlog': instance.backlog,
+        'commit_interval': instance.commit_interval,
+        'commit_max_events': instance.commit_max_events,
+        'last_commit_events': instance.last_commit_events,
+        'last_commit_duration': instance.last_commit_duration,
+        'max_commit_duration': instance.max_commit_duration,
+    })
+
+
 PurgeTask = namedtuple('PurgeTask', ['keep_days', 'repack'])
+StatisticsTask = namedtuple('StatisticsTask', ['start'])
 
 
 class Recorder(threading.Thread):
@@ -131,14 +171,23 @@ class Recorder(threading.Thread):
 
     def __init__(self, hass: HomeAssistant, keep_days: int,
                  purge_interval: int, uri: str,
-                 include: Dict, exclude: Dict) -> None:
+                 include: Dict, exclude: Dict,
+                 commit_interval: float = 0,
+                 commit_max_events: int = 1000) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name='Recorder')
 
         self.hass = hass
         self.keep_days = keep_days
         self.purge_interval = purge_interval
+        self.commit_interval = commit_interval
+        self.commit_max_events = commit_max_events
         self.queue = queue.Queue()  # type: Any
+        self.last_commit_events = 0
+        self.last_commit_duration = None  # type: Optional[float]
+        self.max_commit_duration = None  # type: Optional[float]
+        # Serialized attributes -> state_attributes row id, in LRU order
+        self._state_attributes_ids = OrderedDict()  # type: OrderedDict
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
         self.async_db_ready = asyncio.Future()
@@ -166,9 +215,8 @@ class Recorder(threading.Thread):
 
     def run(self):
         """Start processing events to save."""
-        from .models import States, Events
+        from .models import Events
         from homeassistant.components import persistent_notification
-        from sqlalchemy import exc
 
         tries = 1
         connected = False
@@ -258,8 +306,37 @@ class Recorder(threading.Thread):
 
             self.hass.helpers.event.track_point_in_time(async_purge, run)
 
+        @callback
+        def async_compile_statistics(now):
+            """Queue compiling the statistics of the previous hour."""
+            start = now.replace(minute=0, second=0, microsecond=0) - \
+                statistics.STATISTICS_PERIOD
+            self.queue.put(StatisticsTask(start))
+
+        self.hass.helpers.event.track_utc_time_change(
+            async_compile_statistics, minute=5, second=0)
+
+        # Events waiting to be committed in the current batch
+        pending = []  # type: List[Any]
+        batch_deadline = None
+
         while True:
-            event = self.queue.get()
+            timeout = None
+            if pending:
+                timeout = max(0, batch_deadline - time.monotonic())
+
+            try:
+                event = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                self._commit_events(pending)
+                pending = []
+                continue
+
+            if event is None or isinstance(event, (PurgeTask,
+                                                   StatisticsTask)):
+                if pending:
+                    self._commit_events(pending)
+                    pending = []
 
             if event is None:
                 self._close_run()
@@ -268,6 +345,12 @@ class Recorder(threading.Thread):
                 return
             if isinstance(event, PurgeTask):
                 purge.purge_old_data(self, event.keep_days, event.repack)
+                # Purge may have removed attribute rows that are cached
+                self._state_attributes_ids.clear()
+                self.queue.task_done()
+                continue
+            if isinstance(event, StatisticsTask):
+                self._compile_statistics(event.start)
                 self.queue.task_done()
                 continue
             elif event.event_type == EVENT_TIME_CHANGED:
@@ -283,49 +366,169 @@ class Recorder(threading.Thread):
                     self.queue.task_done()
                     continue
 
-            tries = 1
-            updated = False
-            while not updated and tries <= 10:
-                if tries != 1:
-                    time.sleep(CONNECT_RETRY_WAIT)
-                try:
-                    with session_scope(session=self.get_session()) as session:
-                        try:
-                            dbevent = Events.from_event(event)
-                            session.add(dbevent)
-                            session.flush()
-                        except (TypeError, ValueError):
-                            _LOGGER.warning(
-                                "Event is not JSON serializable: %s", event)
-
-                        if event.event_type == EVENT_STATE_CHANGED:
-                            try:
-                                dbstate = States.from_event(event)
-                                dbstate.event_id = dbevent.event_id
-                                session.add(dbstate)
-                            except (TypeError, ValueError):
-                                _LOGGER.warning(
-                                    "State is not JSON serializable: %s",
-                                    event.data.get('new_state'))
-
-                    updated = True
-
-                except exc.OperationalError as err:
-                    _LOGGER.error("Error in database connectivity: %s. "
-                                  "(retrying in %s seconds)", err,
-                                  CONNECT_RETRY_WAIT)
-                    tries += 1
-
-                except exc.SQLAlchemyError:
-                    updated = True
-                    _LOGGER.exception("Error saving event: %s", event)
-
-            if not updated:
-                _LOGGER.error("Error in database update. Could not save "
-                              "after %d tries. Giving up", tries)
+            if not pending:
+                batch_deadline = time.monotonic() + self.commit_interval
+            pending.append(event)
+
+            if (len(pending) >= self.commit_max_events or
+                    batch_deadline <= time.monotonic()):
+                self._commit_events(pending)
+                pending = []
+
+    def _commit_events(self, events):
+        """Write a batch of events and their states in one transaction.
 
+        When the transaction fails for another reason than the connection,
+        the events are written one by one so only the failing ones are lost.
+        """
+        from sqlalchemy import exc
+
+        start = time.perf_counter()
+        tries = 1
+        updated = False
+        while not updated and tries <= 10:
+            if tries != 1:
+                time.sleep(CONNECT_RETRY_WAIT)
+            try:
+                self._write_events(events)
+                updated = True
+
+            except exc.OperationalError as err:
+                # Attribute rows added in the failed transaction are gone
+                self._state_attributes_ids.clear()
+                _LOGGER.error("Error in database connectivity: %s. "
+                              "(retrying in %s seconds)", err,
+                              CONNECT_RETRY_WAIT)
+                tries += 1
+
+            except exc.SQLAlchemyError:
+                self._state_attributes_ids.clear()
+                updated = True
+                if len(events) == 1:
+                    _LOGGER.exception("Error saving events: %s", events)
+                else:
+                    _LOGGER.exception("Error saving a batch of %d events, "
+                                      "saving them one by one", len(events))
+                    self._write_events_one_by_one(events)
+
+        if not updated:
+            _LOGGER.error("Error in database update. Could not save "
+                          "after %d tries. Giving up", tries)
+
+        duration = time.perf_counter() - start
+        self.last_commit_events = len(events)
+        self.last_commit_duration = duration
+        if self.max_commit_duration is None or \
+                duration > self.max_commit_duration:
+            self.max_commit_duration = duration
+
+        _LOGGER.debug("Committed %d events in %.3f seconds, %d queued",
+                      len(events), duration, self.backlog)
+
+        for _ in events:
             self.queue.task_done()
 
+    def _write_events(self, events):
+        """Write events and their states in one transaction."""
+        from .models import States, Events
+        from sqlalchemy import exc
+
+        with session_scope(session=self.get_session()) as session:
+            try:
+                dbevents = []
+                for event in events:
+                    try:
+                        dbevents.append((event, Events.from_event(event)))
+                    except (TypeError, ValueError):
+                        _LOGGER.warning(
+                            "Event is not JSON serializable: %s", event)
+
+                session.add_all(dbevent for _, dbevent in dbevents)
+                session.flush()
+
+                dbstates = []
+                for event, dbevent in dbevents:
+                    if event.event_type != EVENT_STATE_CHANGED:
+                        continue
+                    try:
+                        dbstate = States.from_event(event)
+                        dbstate.event_id = dbevent.event_id
+                        dbstate.attributes_id = \
+                            self._get_state_attributes_id(
+                                session, dbstate.attributes)
+                        dbstate.attributes = None
+                        dbstates.append(dbstate)
+                    except (TypeError, ValueError):
+                        _LOGGER.warning(
+                            "State is not JSON serializable: %s",
+                            event.data.get('new_state'))
+
+                session.bulk_save_objects(dbstates)
+
+            except exc.SQLAlchemyError:
+                # Drop the flushed rows, the events may be written again
+                session.rollback()
+                raise
+
+    def _write_events_one_by_one(self, events):
+        """Write events in a transaction each, skipping failing events."""
+        from sqlalchemy import exc
+
+        for event in events:
+            try:
+                self._write_events([event])
+            except exc.SQLAlchemyError:
+                self._state_attributes_ids.clear()
+                _LOGGER.exception("Error saving event: %s", event)
+
+    def _compile_statistics(self, start):
+        """Compile statistics, logging instead of stopping on errors."""
+        from sqlalchemy.exc import SQLAlchemyError
+
+        try:
+            statistics.compile_statistics(self, start)
+        except SQLAlchemyError as err:
+            _LOGGER.error("Error compiling statistics for %s: %s", start, err)
+
+    def _get_state_attributes_id(self, session, shared_attrs):
+        """Return the id of the state_attributes row for shared_attrs.
+
+        Unchanged attributes are served from an in-memory LRU cache, others
+        are looked up by hash and inserted if they are not stored yet.
+        """
+        from .models import StateAttributes
+
+        cache = self._state_attributes_ids
+        attributes_id = cache.get(shared_attrs)
+        if attributes_id is not None:
+            cache.move_to_end(shared_attrs)
+            return attributes_id
+
+        attributes_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+        row = session.query(StateAttributes.attributes_id).filter(
+            (StateAttributes.hash == attributes_hash) &
+            (StateAttributes.shared_attrs == shared_attrs)).first()
+
+        if row is not None:
+            attributes_id = row[0]
+        else:
+            dbattributes = StateAttributes(
+                hash=attributes_hash, shared_attrs=shared_attrs)
+            session.add(dbattributes)
+            session.flush()
+            attributes_id = dbattributes.attributes_id
+
+        cache[shared_attrs] = attributes_id
+        if len(cache) > STATE_ATTRIBUTES_CACHE_SIZE:
+            cache.popitem(last=False)
+
+        return attributes_id
+
+    @property
+    def backlog(self) -> int:
+        """Return the number of items waiting in the queue."""
+        return self.queue.qsize()
+
     @callback
     def event_listener(self, event):
         """Listen for new events and put them in the process queue."""
@@ -221,6 +221,17 @@ def _apply_update(engine, new_version, old_version):
     elif new_version == 7:
         _create_index(engine, "states", "ix_states_entity_id")
     elif new_version == 8:
+        # The state_attributes table itself is created by create_all
+        _add_columns(engine, "states", [
+            'attributes_id INTEGER',
+        ])
+        _create_index(engine, "states", "ix_states_attributes_id")
+    elif new_version == 9:
+        # The statistics table is created by create_all
+        pass
+    elif new_version == 10:
+        _create_index(engine, "events", "ix_events_event_type_time_fired")
+    elif new_version == 11:
         # Pending migration, want to group a few.
         pass
         # _add_columns(engine, "events", [
@@ -2,11 +2,13 @@
 import json
 from datetime import datetime
 import logging
+import zlib
 
 from sqlalchemy import (
-    Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text,
-    distinct)
+    BigInteger, Boolean, Column, DateTime, Float, ForeignKey, Index, Integer,
+    String, Text, distinct)
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 
 import homeassistant.util.dt as dt_util
 from homeassistant.core import (
@@ -17,7 +19,7 @@ from homeassistant.helpers.json import JSONEncoder
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 7
+SCHEMA_VERSION = 10
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,6 +38,12 @@ class Events(Base):  # type: ignore
     context_user_id = Column(String(36), index=True)
     # context_parent_id = Column(String(36), index=True)
 
+    __table_args__ = (
+        # Used for fetching the events of a type during a period
+        # (the logbook queries)
+        Index('ix_events_event_type_time_fired', 'event_type', 'time_fired'),
+    )
+
     @staticmethod
     def from_event(event):
         """Create an event database object from a native event."""
@@ -69,6 +77,27 @@ class Events(Base):  # type: ignore
             return None
 
 
+class StateAttributes(Base):   # type: ignore
+    """State attributes shared between state rows."""
+
+    __tablename__ = 'state_attributes'
+    attributes_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_attrs = Column(Text)
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs):
+        """Return the hash used to look up serialized attributes."""
+        return zlib.crc32(shared_attrs.encode('utf-8'))
+
+    def to_native(self):
+        """Convert to a dictionary, decoding the JSON only once per row."""
+        attributes = getattr(self, '_native', None)
+        if attributes is None:
+            attributes = self._native = json.loads(self.shared_attrs)
+        return attributes
+
+
 class States(Base):   # type: ignore
     """State change history."""
 
@@ -79,6 +108,9 @@ class States(Base):   # type: ignore
     state = Column(String(255))
     attributes = Column(Text)
     event_id = Column(Integer, ForeignKey('events.event_id'), index=True)
+    attributes_id = Column(Integer,
+                           ForeignKey('state_attributes.attributes_id'),
+                           index=True)
     last_changed = Column(DateTime(timezone=True), default=datetime.utcnow)
     last_updated = Column(DateTime(timezone=True), default=datetime.utcnow,
                           index=True)
@@ -86,6 +118,7 @@ class States(Base):   # type: ignore
     context_id = Column(String(36), index=True)
     context_user_id = Column(String(36), index=True)
     # context_parent_id = Column(String(36), index=True)
+    state_attributes = relationship(StateAttributes, lazy='joined')
 
     __table_args__ = (
         # Used for fetching the state of entities at a specific time
@@ -131,9 +164,14 @@ class States(Base):   # type: ignore
             user_id=self.context_user_id
         )
         try:
+            if self.state_attributes is not None:
+                attributes = self.state_attributes.to_native()
+            else:
+                attributes = json.loads(self.attributes)
+
             return State(
                 self.entity_id, self.state,
-                json.loads(self.attributes),
+                attributes,
                 _process_timestamp(self.last_changed),
                 _process_timestamp(self.last_updated),
                 context=context,
@@ -147,6 +185,36 @@ class States(Base):   # type: ignore
             return None
 
 
+class Statistics(Base):   # type: ignore
+    """Hourly aggregates of numeric sensor states."""
+
+    __tablename__ = 'statistics'
+    id = Column(Integer, primary_key=True)
+    statistic_id = Column(String(255))
+    start = Column(DateTime(timezone=True), index=True)
+    mean = Column(Float)
+    min = Column(Float)
+    max = Column(Float)
+    last = Column(Float)
+    created = Column(DateTime(timezone=True), default=datetime.utcnow)
+
+    __table_args__ = (
+        # Used for fetching the statistics of entities over a period
+        Index('ix_statistics_statistic_id_start', 'statistic_id', 'start'),
+    )
+
+    def to_native(self):
+        """Convert to a dictionary."""
+        return {
+            'statistic_id': self.statistic_id,
+            'start': _process_timestamp(self.start),
+            'mean': self.mean,
+            'min': self.min,
+            'max': self.max,
+            'last': self.last,
+        }
+
+
 class RecorderRuns(Base):   # type: ignore
     """Representation of recorder run."""
 
@@ -11,7 +11,7 @@ _LOGGER = logging.getLogger(__name__)
 
 def purge_old_data(instance, purge_days, repack):
     """Purge events and states older than purge_days ago."""
-    from .models import States, Events
+    from .models import States, StateAttributes, Events
     from sqlalchemy.exc import SQLAlchemyError
 
     purge_before = dt_util.utcnow() - timedelta(days=purge_days)
@@ -24,6 +24,14 @@ def purge_old_data(instance, purge_days, repack):
                 .delete(synchronize_session=False)
             _LOGGER.debug("Deleted %s states", deleted_rows)
 
+            # Remove attributes that are no longer used by any state
+            used_attributes = session.query(States.attributes_id).filter(
+                States.attributes_id.isnot(None))
+            deleted_rows = session.query(StateAttributes) \
+                .filter(~StateAttributes.attributes_id.in_(used_attributes)) \
+                .delete(synchronize_session=False)
+            _LOGGER.debug("Deleted %s state attributes", deleted_rows)
+
             deleted_rows = session.query(Events) \
                 .filter((Events.time_fired < purge_before)) \
                 .delete(synchronize_session=False)
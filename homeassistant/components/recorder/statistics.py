@@ -0,0 +1,162 @@
+"""Long-term statistics of numeric sensors."""
+from collections import defaultdict
+from datetime import timedelta
+import logging
+
+from homeassistant.const import ATTR_UNIT_OF_MEASUREMENT
+import homeassistant.util.dt as dt_util
+
+from .util import session_scope
+
+_LOGGER = logging.getLogger(__name__)
+
+PERIOD_HOUR = 'hour'
+PERIOD_DAY = 'day'
+PERIODS = (PERIOD_HOUR, PERIOD_DAY)
+
+STATISTICS_PERIOD = timedelta(hours=1)
+
+
+def _numeric_value(state):
+    """Return the state as a float if it belongs to a numeric sensor."""
+    if state is None or \
+            state.attributes.get(ATTR_UNIT_OF_MEASUREMENT) is None:
+        return None
+
+    try:
+        return float(state.state)
+    except ValueError:
+        return None
+
+
+def _aggregate(start, end, initial, samples):
+    """Return mean, min, max and last value of a sensor during a period.
+
+    The mean is weighted by the time each value was held. Initial is the
+    value at the start of the period, if known.
+    """
+    values = [value for _, value in samples]
+    if initial is not None:
+        values.append(initial)
+
+    total = 0.0
+    duration = 0.0
+    value, since = initial, start
+    for changed, new_value in samples:
+        if value is not None:
+            seconds = (changed - since).total_seconds()
+            total += value * seconds
+            duration += seconds
+        value, since = new_value, changed
+
+    seconds = (end - since).total_seconds()
+    total += value * seconds
+    duration += seconds
+
+    mean = total / duration if duration else value
+    return mean, min(values), max(values), value
+
+
+def compile_statistics(instance, start):
+    """Compile the statistics of numeric sensors for the hour at start.
+
+    Sensors that did not change during the hour keep the last value of the
+    previous hour, as long as they still exist.
+    """
+    from .models import States, Statistics
+
+    start = dt_util.as_utc(start)
+    end = start + STATISTICS_PERIOD
+
+    with session_scope(session=instance.get_session()) as session:
+        if session.query(Statistics.id).filter(
+                Statistics.start == start).first() is not None:
+            _LOGGER.debug("Statistics for %s already compiled", start)
+            return
+
+        initial = {
+            statistic_id: last for statistic_id, last in session.query(
+                Statistics.statistic_id, Statistics.last).filter(
+                    Statistics.start == start - STATISTICS_PERIOD)}
+
+        samples = defaultdict(list)
+        query = session.query(States).filter(
+            (States.last_updated >= start) &
+            (States.last_updated < end)).order_by(States.last_updated)
+
+        for row in query:
+            state = row.to_native()
+            value = _numeric_value(state)
+            if value is not None:
+                samples[state.entity_id].append((state.last_updated, value))
+
+        for statistic_id in initial:
+            if statistic_id not in samples and _numeric_value(
+                    instance.hass.states.get(statistic_id)) is not None:
+                samples[statistic_id] = []
+
+        for statistic_id, entity_samples in samples.items():
+            mean, min_value, max_value, last = _aggregate(
+                start, end, initial.get(statistic_id), entity_samples)
+            session.add(Statistics(
+                statistic_id=statistic_id, start=start, mean=mean,
+                min=min_value, max=max_value, last=last))
+
+    _LOGGER.debug("Compiled statistics of %d sensors for %s",
+                  len(samples), start)
+
+
+def statistics_during_period(hass, start_time, end_time=None,
+                             statistic_ids=None, period=PERIOD_HOUR):
+    """Return the statistics of sensors during a period.
+
+    Returns a dictionary with a list of aggregates per statistic_id. With
+    the day period the hourly statistics are combined per local day.
+    """
+    from .models import Statistics
+
+    with session_scope(hass=hass) as session:
+        query = session.query(Statistics).filter(
+            Statistics.start >= start_time)
+
+        if end_time is not None:
+            query = query.filter(Statistics.start < end_time)
+
+        if statistic_ids is not None:
+            query = query.filter(Statistics.statistic_id.in_(statistic_ids))
+
+        query = query.order_by(Statistics.statistic_id, Statistics.start)
+
+        result = defaultdict(list)
+        for row in query:
+            result[row.statistic_id].append(row.to_native())
+
+    if period == PERIOD_DAY:
+        for statistic_id, hours in result.items():
+            result[statistic_id] = _reduce_to_days(hours)
+
+    return result
+
+
+def _reduce_to_days(hours):
+    """Combine hourly statistics into daily statistics."""
+    days = []
+    for hour in hours:
+        day_start = dt_util.as_utc(dt_util.start_of_local_day(
+            dt_util.as_local(hour['start'])))
+
+        if not days or days[-1]['start'] != day_start:
+            days.append(dict(hour, start=day_start, hours=0))
+
+        day = days[-1]
+        day['mean'] = (day['mean'] * day['hours'] + hour['mean']) / \
+            (day['hours'] + 1)
+        day['hours'] += 1
+        day['min'] = min(day['min'], hour['min'])
+        day['max'] = max(day['max'], hour['max'])
+        day['last'] = hour['last']
+
+    for day in days:
+        del day['hours']
+
+    return days
@@ -11,11 +11,12 @@ from homeassistant.const import (
     ATTR_FRIENDLY_NAME, ATTR_UNIT_OF_MEASUREMENT, CONF_VALUE_TEMPLATE,
     CONF_ICON_TEMPLATE, CONF_ENTITY_PICTURE_TEMPLATE, ATTR_ENTITY_ID,
     CONF_SENSORS, EVENT_HOMEASSISTANT_START, CONF_FRIENDLY_NAME_TEMPLATE,
-    MATCH_ALL, CONF_DEVICE_CLASS)
+    CONF_DEVICE_CLASS)
 from homeassistant.exceptions import TemplateError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
-from homeassistant.helpers.event import async_track_state_change
+from homeassistant.helpers.event import (
+    async_track_state_change, async_track_template_result)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -50,42 +51,12 @@ async def async_setup_platform(hass, config, async_add_entities,
         unit_of_measurement = device_config.get(ATTR_UNIT_OF_MEASUREMENT)
         device_class = device_config.get(CONF_DEVICE_CLASS)
 
-        entity_ids = set()
-        manual_entity_ids = device_config.get(ATTR_ENTITY_ID)
-        invalid_templates = []
-
-        for tpl_name, template in (
-                (CONF_VALUE_TEMPLATE, state_template),
-                (CONF_ICON_TEMPLATE, icon_template),
-                (CONF_ENTITY_PICTURE_TEMPLATE, entity_picture_template),
-                (CONF_FRIENDLY_NAME_TEMPLATE, friendly_name_template),
-        ):
-            if template is None:
-                continue
-            template.hass = hass
-
-            if manual_entity_ids is not None:
-                continue
-
-            template_entity_ids = template.extract_entities()
-            if template_entity_ids == MATCH_ALL:
-                entity_ids = MATCH_ALL
-                # Cut off _template from name
-                invalid_templates.append(tpl_name[:-9])
-            elif entity_ids != MATCH_ALL:
-                entity_ids |= set(template_entity_ids)
-
-        if invalid_templates:
-            _LOGGER.warning(
-                'Template sensor %s has no entity ids configured to track nor'
-                ' were we able to extract the entities to track from the %s '
-                'template(s). This entity will only be able to be updated '
-                'manually.', device, ', '.join(invalid_templates))
-
-        if manual_entity_ids is not None:
-            entity_ids = manual_entity_ids
-        elif entity_ids != MATCH_ALL:
-            entity_ids = list(entity_ids)
+        entity_ids = device_config.get(ATTR_ENTITY_ID)
+
+        for template in (state_template, icon_template,
+                         entity_picture_template, friendly_name_template):
+            if template is not None:
+                template.hass = hass
 
         sensors.append(
             SensorTemplate(
@@ -129,6 +100,13 @@ class SensorTemplate(Entity):
         self._entity_picture = None
         self._entities = entity_ids
         self._device_class = device_class
+        self._templates = [
+            (property_name, template) for property_name, template in (
+                ('_state', state_template),
+                ('_icon', icon_template),
+                ('_entity_picture', entity_picture_template),
+                ('_name', friendly_name_template))
+            if template is not None]
 
     async def async_added_to_hass(self):
         """Register callbacks."""
@@ -140,12 +118,45 @@ class SensorTemplate(Entity):
         @callback
         def template_sensor_startup(event):
             """Update template on startup."""
-            if self._entities != MATCH_ALL:
-                # Track state change only for valid templates
-                async_track_state_change(
-                    self.hass, self._entities, template_sensor_state_listener)
-
-            self.async_schedule_update_ha_state(True)
+            if self._entities is not None:
+                self.async_on_remove(async_track_state_change(
+                    self.hass, self._entities,
+                    template_sensor_state_listener))
+                self.async_schedule_update_ha_state(True)
+                return
+
+            untracked = []
+
+            @callback
+            def async_track_property(property_name, template):
+                """Follow the states the template read when last rendered."""
+                @callback
+                def template_sensor_template_listener(
+                        entity, old_state, new_state, info):
+                    """Use the result of a render of the template."""
+                    self._async_set_result(property_name, lambda: info.result)
+
+                    if entity is not None:
+                        self.async_schedule_update_ha_state()
+                    elif not info.reads_states:
+                        untracked.append(property_name[1:])
+
+                return async_track_template_result(
+                    self.hass, template, template_sensor_template_listener,
+                    run_immediately=True)
+
+            for property_name, template in self._templates:
+                self.async_on_remove(
+                    async_track_property(property_name, template))
+
+            if untracked:
+                _LOGGER.warning(
+                    'Template sensor %s has no entity ids configured to track'
+                    ' and its %s template(s) read no states. These templates'
+                    ' will only be able to be updated manually.',
+                    self.entity_id, ', '.join(untracked))
+
+            self.async_schedule_update_ha_state()
 
         self.hass.bus.async_listen_once(
             EVENT_HOMEASSISTANT_START, template_sensor_startup)
@@ -187,40 +198,39 @@ class SensorTemplate(Entity):
 
     async def async_update(self):
         """Update the state from the template."""
+        for property_name, template in self._templates:
+            self._async_set_result(property_name, template.async_render)
+
+    @callback
+    def _async_set_result(self, property_name, render):
+        """Set a property to the result of rendering its template."""
         try:
-            self._state = self._template.async_render()
+            setattr(self, property_name, render())
         except TemplateError as ex:
+            if property_name == '_state':
+                if ex.args and ex.args[0].startswith(
+                        "UndefinedError: 'None' has no attribute"):
+                    # Common during HA startup - so just a warning
+                    _LOGGER.warning('Could not render template %s,'
+                                    ' the state is unknown.', self._name)
+                else:
+                    self._state = None
+                    _LOGGER.error('Could not render template %s: %s',
+                                  self._name, ex)
+                return
+
+            friendly_property_name = property_name[1:].replace('_', ' ')
             if ex.args and ex.args[0].startswith(
                     "UndefinedError: 'None' has no attribute"):
                 # Common during HA startup - so just a warning
-                _LOGGER.warning('Could not render template %s,'
-                                ' the state is unknown.', self._name)
-            else:
-                self._state = None
-                _LOGGER.error('Could not render template %s: %s', self._name,
-                              ex)
-        for property_name, template in (
-                ('_icon', self._icon_template),
-                ('_entity_picture', self._entity_picture_template),
-                ('_name', self._friendly_name_template)):
-            if template is None:
-                continue
+                _LOGGER.warning('Could not render %s template %s,'
+                                ' the state is unknown.',
+                                friendly_property_name, self._name)
+                return
 
             try:
-                setattr(self, property_name, template.async_render())
-            except TemplateError as ex:
-                friendly_property_name = property_name[1:].replace('_', ' ')
-                if ex.args and ex.args[0].startswith(
-                        "UndefinedError: 'None' has no attribute"):
-                    # Common during HA startup - so just a warning
-                    _LOGGER.warning('Could not render %s template %s,'
-                                    ' the state is unknown.',
-                                    friendly_property_name, self._name)
-                    continue
-
-                try:
-                    setattr(self, property_name,
-                            getattr(super(), property_name))
-                except AttributeError:
-                    _LOGGER.error('Could not render %s template %s: %s',
-                                  friendly_property_name, self._name, ex)
+                setattr(self, property_name,
+                        getattr(super(), property_name))
+            except AttributeError:
+                _LOGGER.error('Could not render %s template %s: %s',
+                              friendly_property_name, self._name, ex)
@@ -2,15 +2,16 @@
 import voluptuous as vol
 
 from homeassistant.auth.permissions.const import POLICY_READ
-from homeassistant.const import (
-    MATCH_ALL, EVENT_TIME_CHANGED, EVENT_STATE_CHANGED)
-from homeassistant.core import callback, DOMAIN as HASS_DOMAIN
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
+from homeassistant.core import (
+    callback, split_entity_id, DOMAIN as HASS_DOMAIN)
 from homeassistant.exceptions import Unauthorized, ServiceNotFound, \
     HomeAssistantError
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.event import async_track_state_change
 from homeassistant.helpers.service import async_get_all_descriptions
 
-from . import const, decorators, messages
+from . import const, decorators, messages, subscriptions
 
 
 @callback
@@ -18,6 +19,7 @@ def async_register_commands(hass, async_reg):
     """Register commands."""
     async_reg(hass, handle_subscribe_events)
     async_reg(hass, handle_unsubscribe_events)
+    async_reg(hass, handle_subscribe_entities)
     async_reg(hass, handle_call_service)
     async_reg(hass, handle_get_states)
     async_reg(hass, handle_get_services)
@@ -51,31 +53,88 @@ def handle_subscribe_events(hass, connection, msg):
             not connection.user.is_admin):
         raise Unauthorized
 
-    if event_type == EVENT_STATE_CHANGED:
-        @callback
-        def forward_events(event):
-            """Forward state changed events to websocket."""
-            if not connection.user.permissions.check_entity(
-                    event.data['entity_id'], POLICY_READ):
-                return
+    connection.subscriptions[msg['id']] = \
+        subscriptions.async_subscribe_events(
+            hass, connection, msg['id'], event_type)
 
-            connection.send_message(messages.event_message(msg['id'], event))
+    connection.send_message(messages.result_message(msg['id']))
 
-    else:
+
+@callback
+@decorators.websocket_command({
+    vol.Required('type'): 'subscribe_entities',
+    vol.Optional('entity_ids'): cv.entity_ids,
+    vol.Optional('domains'): vol.All(cv.ensure_list, [cv.string]),
+})
+def handle_subscribe_entities(hass, connection, msg):
+    """Handle subscribe entities command.
+
+    Sends the states of the entities first and then only what changed:
+    a (added entities), c (diffs of changed entities) and r (removed
+    entities). Without entity_ids and domains all entities are followed.
+    The unsubscribe_events command ends the subscription.
+
+    Async friendly.
+    """
+    entity_ids = set(msg.get('entity_ids', ()))
+    domains = set(msg.get('domains', ()))
+    entity_perm = connection.user.permissions.check_entity
+
+    def subscribed(entity_id):
+        """Return if the subscription covers an entity."""
+        return (not entity_ids and not domains or entity_id in entity_ids or
+                split_entity_id(entity_id)[0] in domains)
+
+    @callback
+    def forward_entity_changes(entity_id, old_state, new_state):
+        """Forward what changed about an entity to websocket."""
+        if not entity_perm(entity_id, POLICY_READ):
+            return
+
+        if new_state is None:
+            changes = {'r': [entity_id]}
+        elif old_state is None:
+            changes = {'a': {
+                entity_id: messages.compressed_state(new_state)}}
+        else:
+            changes = {'c': {
+                entity_id: messages.state_diff(old_state, new_state)}}
+
+        connection.send_message(messages.event_message(msg['id'], changes))
+
+    if domains or not entity_ids:
         @callback
         def forward_events(event):
-            """Forward events to websocket."""
-            if event.event_type == EVENT_TIME_CHANGED:
+            """Forward state changes of the subscribed domains."""
+            entity_id = event.data['entity_id']
+            if not subscribed(entity_id):
                 return
 
-            connection.send_message(messages.event_message(
-                msg['id'], event.as_dict()
-            ))
+            forward_entity_changes(
+                entity_id, event.data.get('old_state'),
+                event.data.get('new_state'))
+
+        connection.subscriptions[msg['id']] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, forward_events)
+        states = [state for state in hass.states.async_all()
+                  if subscribed(state.entity_id)]
 
-    connection.subscriptions[msg['id']] = hass.bus.async_listen(
-        event_type, forward_events)
+    else:
+        connection.subscriptions[msg['id']] = async_track_state_change(
+            hass, entity_ids, forward_entity_changes)
+        states = [
+            state for state in (
+                hass.states.get(entity_id) for entity_id in entity_ids)
+            if state is not None]
 
     connection.send_message(messages.result_message(msg['id']))
+    connection.send_message(messages.event_message(msg['id'], {
+        'a': {
+            state.entity_id: messages.compressed_state(state)
+            for state in states
+            if entity_perm(state.entity_id, POLICY_READ)
+        }
+    }))
 
 
 @callback
@@ -31,4 +31,7 @@ SIGNAL_WEBSOCKET_DISCONNECTED = 'websocket_disconnected'
 # Data used to store the current connection list
 DATA_CONNECTIONS = DOMAIN + '.connections'
 
+# Data used to store the event subscriptions shared by connections
+DATA_EVENT_HUBS = DOMAIN + '.event_hubs'
+
 JSON_DUMP = partial(json.dumps, cls=JSONEncoder, allow_nan=False)
@@ -49,3 +49,61 @@ def event_message(iden, event):
         'type': 'event',
         'event': event,
     }
+
+
+def compressed_state(state):
+    """Return a compact representation of a state.
+
+    Keys are s (state), a (attributes), lc (last changed timestamp) and lu
+    (last updated timestamp, only if it differs from last changed).
+    """
+    compressed = {
+        'a': dict(state.attributes),
+        's': state.state,
+        'lc': state.last_changed.timestamp(),
+    }
+    if state.last_updated != state.last_changed:
+        compressed['lu'] = state.last_updated.timestamp()
+    return compressed
+
+
+def state_diff(old_state, new_state):
+    """Return what changed between two states of an entity.
+
+    Changed values are under + with the keys of compressed_state, holding
+    only the added and changed attributes. Unlike in compressed_state, lu
+    is included whenever it changed, also when it equals lc. The names of
+    removed attributes are listed under - as a.
+    """
+    additions = {}
+
+    if old_state.state != new_state.state:
+        additions['s'] = new_state.state
+
+    if old_state.last_changed != new_state.last_changed:
+        additions['lc'] = new_state.last_changed.timestamp()
+
+    if old_state.last_updated != new_state.last_updated:
+        additions['lu'] = new_state.last_updated.timestamp()
+
+    old_attributes = old_state.attributes
+    changed_attributes = {
+        key: value for key, value in new_state.attributes.items()
+        if key not in old_attributes or old_attributes[key] != value}
+    if changed_attributes:
+        additions['a'] = changed_attributes
+
+    diff = {'+': additions}
+
+    removed_attributes = [key for key in old_attributes
+                          if key not in new_state.attributes]
+    if removed_attributes:
+        diff['-'] = {'a': removed_attributes}
+
+    return diff
+
+
+def event_message_json(iden, event_json):
+    """Return an event message with an event already serialized to JSON."""
+    return '{{"id": {}, "type": "event", "event": {}}}'.format(
+        iden, event_json)
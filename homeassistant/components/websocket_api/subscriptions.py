@@ -0,0 +1,91 @@
+"""Event subscriptions shared by websocket connections."""
+import logging
+
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_TIME_CHANGED
+from homeassistant.core import callback
+
+from . import const, messages
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_subscribe_events(hass, connection, iden, event_type):
+    """Forward events of a type to a connection.
+
+    Returns a function that can be called to remove the subscription.
+    """
+    hubs = hass.data.get(const.DATA_EVENT_HUBS)
+    if hubs is None:
+        hubs = hass.data[const.DATA_EVENT_HUBS] = {}
+
+    hub = hubs.get(event_type)
+    if hub is None:
+        hub = hubs[event_type] = EventHub(hass, event_type)
+
+    return hub.async_subscribe(connection, iden)
+
+
+class EventHub:
+    """Forward events of one type to all subscribed connections.
+
+    A single bus listener serves all subscriptions and every event is
+    serialized to JSON once, whatever the number of connections. Entity
+    permissions are checked per connection. Messages go through the queue
+    of each connection, so a client that does not keep up is disconnected
+    without holding back the others.
+    """
+
+    def __init__(self, hass, event_type):
+        """Initialize the hub."""
+        self.hass = hass
+        self.event_type = event_type
+        self._subscriptions = {}
+        self._unsub_listener = None
+
+    @callback
+    def async_subscribe(self, connection, iden):
+        """Add a subscription and return a function to remove it."""
+        key = object()
+        self._subscriptions[key] = (connection, iden)
+
+        if self._unsub_listener is None:
+            self._unsub_listener = self.hass.bus.async_listen(
+                self.event_type, self._async_forward)
+
+        @callback
+        def remove_subscription():
+            """Remove the subscription."""
+            self._subscriptions.pop(key, None)
+
+            if not self._subscriptions and self._unsub_listener is not None:
+                self._unsub_listener()
+                self._unsub_listener = None
+
+        return remove_subscription
+
+    @callback
+    def _async_forward(self, event):
+        """Forward an event to the subscribed connections."""
+        if event.event_type == EVENT_TIME_CHANGED:
+            return
+
+        check_entity = self.event_type == EVENT_STATE_CHANGED
+        event_json = None
+
+        for connection, iden in list(self._subscriptions.values()):
+            if check_entity and not connection.user.permissions.check_entity(
+                    event.data['entity_id'], POLICY_READ):
+                continue
+
+            if event_json is None:
+                try:
+                    event_json = const.JSON_DUMP(event)
+                except (ValueError, TypeError) as err:
+                    _LOGGER.error("Unable to serialize to JSON: %s\n%s",
+                                  err, event)
+                    return
+
+            connection.send_message(
+                messages.event_message_json(iden, event_json))
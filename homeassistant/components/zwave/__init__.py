@@ -1,9 +1,11 @@
 """Support for Z-Wave."""
 import asyncio
+from collections import defaultdict
 import copy
 from importlib import import_module
 import logging
 from pprint import pprint
+from time import monotonic
 
 import voluptuous as vol
 
@@ -310,10 +312,22 @@ async def async_setup_entry(hass, config_entry):
 
         dispatcher.connect(log_all, weak=False)
 
+    # (node_id, command_class, instance) -> entity values that can track
+    # values of the command class. None matches any command class.
+    values_index = defaultdict(list)
+    discovered_values = 0
+    discovery_seconds = 0.0
+
     def value_added(node, value):
         """Handle new added value to a node on the network."""
+        nonlocal discovered_values, discovery_seconds
+        start = monotonic()
+
         # Check if this value should be tracked by an existing entity
-        for values in hass.data[DATA_ENTITY_VALUES]:
+        candidates = values_index.get(
+            (node.node_id, value.command_class, value.instance), []) + \
+            values_index.get((node.node_id, None, value.instance), [])
+        for values in candidates:
             values.check_value(value)
 
         for schema in DISCOVERY_SCHEMAS:
@@ -327,10 +341,13 @@ async def async_setup_entry(hass, config_entry):
             values = ZWaveDeviceEntityValues(
                 hass, schema, value, config, device_config, registry)
 
-            # We create a new list and update the reference here so that
-            # the list can be safely iterated over in the main thread
-            new_values = hass.data[DATA_ENTITY_VALUES] + [values]
-            hass.data[DATA_ENTITY_VALUES] = new_values
+            # Appending keeps the list safe to iterate in the main thread
+            hass.data[DATA_ENTITY_VALUES].append(values)
+            for key in values.index_keys():
+                values_index[key].append(values)
+
+        discovered_values += 1
+        discovery_seconds += monotonic() - start
 
     component = EntityComponent(_LOGGER, DOMAIN, hass)
     registry = await async_get_registry(hass)
@@ -400,12 +417,16 @@ async def async_setup_entry(hass, config_entry):
         _LOGGER.info("Z-Wave network is ready for use. All awake nodes "
                      "have been queried. Sleeping nodes will be "
                      "queried when they awake.")
+        _LOGGER.info("Z-Wave discovery of %d values took %.2f seconds",
+                     discovered_values, discovery_seconds)
         hass.bus.fire(const.EVENT_NETWORK_READY)
 
     def network_complete():
         """Handle the querying of all nodes on network."""
         _LOGGER.info("Z-Wave network is complete. All nodes on the network "
                      "have been queried")
+        _LOGGER.info("Z-Wave discovery of %d values took %.2f seconds",
+                     discovered_values, discovery_seconds)
         hass.bus.fire(const.EVENT_NETWORK_COMPLETE)
 
     def network_complete_some_dead():
@@ -848,6 +869,19 @@ class ZWaveDeviceEntityValues():
 
         self._check_entity_ready()
 
+    def index_keys(self):
+        """Return the keys of the values this entity can track.
+
+        A key is a tuple of node id, command class and instance. The command
+        class is None for values that match any command class.
+        """
+        instance = self._values[const.DISC_PRIMARY].instance
+        return {
+            (self._node.node_id, command_class, instance)
+            for schema in self._schema[const.DISC_VALUES].values()
+            for command_class in schema.get(const.DISC_COMMAND_CLASS, [None])
+        }
+
     def __getattr__(self, name):
         """Get the specified value for this entity."""
         return self._values[name]
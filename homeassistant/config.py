@@ -22,7 +22,8 @@ from homeassistant.const import (
     CONF_UNIT_SYSTEM_IMPERIAL, CONF_TEMPERATURE_UNIT, TEMP_CELSIUS,
     __version__, CONF_CUSTOMIZE, CONF_CUSTOMIZE_DOMAIN, CONF_CUSTOMIZE_GLOB,
     CONF_WHITELIST_EXTERNAL_DIRS, CONF_AUTH_PROVIDERS, CONF_AUTH_MFA_MODULES,
-    CONF_TYPE, CONF_ID)
+    CONF_TYPE, CONF_ID, CONF_STATE_WRITE_INTERVAL,
+    CONF_STATE_WRITE_PASSTHROUGH)
 from homeassistant.core import (
     DOMAIN as CONF_CORE, SOURCE_YAML, HomeAssistant,
     callback)
@@ -138,6 +139,9 @@ CUSTOMIZE_DICT_SCHEMA = vol.Schema({
     vol.Optional(ATTR_FRIENDLY_NAME): cv.string,
     vol.Optional(ATTR_HIDDEN): cv.boolean,
     vol.Optional(ATTR_ASSUMED_STATE): cv.boolean,
+    vol.Optional(CONF_STATE_WRITE_INTERVAL):
+        vol.All(cv.time_period, cv.positive_timedelta),
+    vol.Optional(CONF_STATE_WRITE_PASSTHROUGH): cv.boolean,
 }, extra=vol.ALLOW_EXTRA)
 
 CUSTOMIZE_CONFIG_SCHEMA = vol.Schema({
@@ -135,6 +135,8 @@ CONF_SLAVE = 'slave'
 CONF_SOURCE = 'source'
 CONF_SSL = 'ssl'
 CONF_STATE = 'state'
+CONF_STATE_WRITE_INTERVAL = 'state_write_interval'
+CONF_STATE_WRITE_PASSTHROUGH = 'state_write_passthrough'
 CONF_STATE_TEMPLATE = 'state_template'
 CONF_STRUCTURE = 'structure'
 CONF_SWITCHES = 'switches'
@@ -3,7 +3,7 @@ import logging
 import uuid
 from asyncio import Event
 from collections import OrderedDict
-from typing import List, Optional, cast
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
 
 import attr
 
@@ -75,6 +75,52 @@ class DeviceRegistry:
         self.devices = None
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
 
+    @property
+    def devices(self):
+        """Return the devices by id."""
+        return self._devices
+
+    @devices.setter
+    def devices(self, devices):
+        """Replace the devices and rebuild the indexes."""
+        self._devices = devices
+        # identifier or connection -> device id
+        self._identifier_index = {}  # type: Dict[Tuple[Any, ...], str]
+        self._connection_index = {}  # type: Dict[Tuple[Any, ...], str]
+        # area_id -> device ids
+        self._area_index = {}  # type: Dict[str, Set[str]]
+
+        for device in (devices or {}).values():
+            self._async_index(device)
+
+    @callback
+    def _async_index(self, device):
+        """Add a device to the indexes."""
+        for iden in device.identifiers:
+            self._identifier_index[iden] = device.id
+
+        for conn in device.connections:
+            self._connection_index[conn] = device.id
+
+        if device.area_id is not None:
+            self._area_index.setdefault(device.area_id, set()).add(device.id)
+
+    @callback
+    def _async_unindex(self, device):
+        """Remove a device from the indexes."""
+        for index, keys in ((self._identifier_index, device.identifiers),
+                            (self._connection_index, device.connections)):
+            for key in keys:
+                if index.get(key) == device.id:
+                    del index[key]
+
+        if device.area_id is not None:
+            device_ids = self._area_index.get(device.area_id)
+            if device_ids is not None:
+                device_ids.discard(device.id)
+                if not device_ids:
+                    del self._area_index[device.area_id]
+
     @callback
     def async_get(self, device_id: str) -> Optional[DeviceEntry]:
         """Get device."""
@@ -83,12 +129,20 @@ class DeviceRegistry:
     @callback
     def async_get_device(self, identifiers: set, connections: set):
         """Check if device is registered."""
-        for device in self.devices.values():
-            if any(iden in device.identifiers for iden in identifiers) or \
-                    any(conn in device.connections for conn in connections):
-                return device
+        for index, keys in ((self._identifier_index, identifiers),
+                            (self._connection_index, connections)):
+            for key in keys:
+                device_id = index.get(key)
+                if device_id is not None:
+                    return self.devices[device_id]
         return None
 
+    @callback
+    def async_entries_for_area(self, area_id: str) -> List[DeviceEntry]:
+        """Return devices that are in an area."""
+        return [self.devices[device_id] for device_id
+                in self._area_index.get(area_id, ())]
+
     @callback
     def async_get_or_create(self, *, config_entry_id, connections=None,
                             identifiers=None, manufacturer=_UNDEF,
@@ -209,7 +263,9 @@ class DeviceRegistry:
         if not changes:
             return old
 
+        self._async_unindex(old)
         new = self.devices[device_id] = attr.evolve(old, **changes)
+        self._async_index(new)
         self.async_schedule_save()
 
         self.hass.bus.async_fire(EVENT_DEVICE_REGISTRY_UPDATED, {
@@ -220,7 +276,7 @@ class DeviceRegistry:
         return new
 
     def _async_remove_device(self, device_id):
-        del self.devices[device_id]
+        self._async_unindex(self.devices.pop(device_id))
         self.hass.bus.async_fire(EVENT_DEVICE_REGISTRY_UPDATED, {
             'action': 'remove',
             'device_id': device_id,
@@ -299,9 +355,8 @@ class DeviceRegistry:
     @callback
     def async_clear_area_id(self, area_id: str) -> None:
         """Clear area id from registry entries."""
-        for dev_id, device in self.devices.items():
-            if area_id == device.area_id:
-                self._async_update_device(dev_id, area_id=None)
+        for device in self.async_entries_for_area(area_id):
+            self._async_update_device(device.id, area_id=None)
 
 
 @bind_hass
@@ -331,5 +386,4 @@ async def async_get_registry(hass: HomeAssistantType) -> DeviceRegistry:
 def async_entries_for_area(registry: DeviceRegistry, area_id: str) \
         -> List[DeviceEntry]:
     """Return entries that match an area."""
-    return [device for device in registry.devices.values()
-            if device.area_id == area_id]
+    return registry.async_entries_for_area(area_id)
@@ -9,10 +9,12 @@ from homeassistant.const import (
     ATTR_ASSUMED_STATE, ATTR_FRIENDLY_NAME, ATTR_HIDDEN, ATTR_ICON,
     ATTR_UNIT_OF_MEASUREMENT, DEVICE_DEFAULT_NAME, STATE_OFF, STATE_ON,
     STATE_UNAVAILABLE, STATE_UNKNOWN, TEMP_CELSIUS, TEMP_FAHRENHEIT,
-    ATTR_ENTITY_PICTURE, ATTR_SUPPORTED_FEATURES, ATTR_DEVICE_CLASS)
+    ATTR_ENTITY_PICTURE, ATTR_SUPPORTED_FEATURES, ATTR_DEVICE_CLASS,
+    CONF_STATE_WRITE_INTERVAL, CONF_STATE_WRITE_PASSTHROUGH)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.exceptions import NoEntitySpecifiedError
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.util import ensure_unique_string, slugify
 from homeassistant.util.async_ import run_callback_threadsafe
 from homeassistant.util import dt as dt_util
@@ -88,6 +90,12 @@ class Entity:
     _context = None
     _context_set = None
 
+    # State write held back by state_write_interval, time of the last write
+    # and the listener that writes the held back state
+    _write_pending = None
+    _write_last = None
+    _write_unsub = None
+
     @property
     def should_poll(self) -> bool:
         """Return True if entity has to be polled for state.
@@ -189,6 +197,23 @@ class Entity:
         """Time that a context is considered recent."""
         return timedelta(seconds=5)
 
+    @property
+    def state_write_interval(self) -> Optional[timedelta]:
+        """Return the minimum time between two writes of the state.
+
+        Updates within the interval are coalesced into a single write of the
+        latest state once the interval has passed. None writes every update.
+        """
+        return None
+
+    @property
+    def state_write_passthrough(self) -> bool:
+        """Return True if changes of the state are written immediately.
+
+        When False, state changes are coalesced like attribute changes.
+        """
+        return True
+
     # DO NOT OVERWRITE
     # These properties and methods are either managed by Home Assistant or they
     # are used to perform a very specific function. Overwriting these may
@@ -296,9 +321,16 @@ class Entity:
                             "https://goo.gl/Nvioub", self.entity_id,
                             type(self), end - start)
 
+        write_interval = self.state_write_interval
+        write_passthrough = self.state_write_passthrough
+
         # Overwrite properties that have been set in the config file.
         if DATA_CUSTOMIZE in self.hass.data:
             attr.update(self.hass.data[DATA_CUSTOMIZE].get(self.entity_id))
+            write_interval = attr.pop(
+                CONF_STATE_WRITE_INTERVAL, write_interval)
+            write_passthrough = attr.pop(
+                CONF_STATE_WRITE_PASSTHROUGH, write_passthrough)
 
         # Convert temperature if we detect one
         try:
@@ -320,9 +352,63 @@ class Entity:
             self._context = None
             self._context_set = None
 
+        if write_interval is not None:
+            if self._async_coalesce_write(
+                    write_interval, write_passthrough, state, attr):
+                return
+        elif self._write_unsub is not None:
+            self._async_cancel_pending_write()
+
         self.hass.states.async_set(
             self.entity_id, state, attr, self.force_update, self._context)
 
+    @callback
+    def _async_coalesce_write(self, interval, passthrough, state, attr):
+        """Hold back a state write within the write interval.
+
+        Returns True if the write is held back. Only the latest held back
+        state is kept and written when the interval has passed.
+        """
+        now = dt_util.utcnow()
+
+        if passthrough:
+            current = self.hass.states.get(self.entity_id)
+            changed = current is None or current.state != state
+        else:
+            changed = False
+
+        if (not changed and self._write_last is not None and
+                now < self._write_last + interval):
+            self._write_pending = (
+                state, attr, self.force_update, self._context)
+
+            if self._write_unsub is None:
+                self._write_unsub = async_track_point_in_utc_time(
+                    self.hass, self._async_write_pending,
+                    self._write_last + interval)
+            return True
+
+        if self._write_unsub is not None:
+            self._async_cancel_pending_write()
+
+        self._write_last = now
+        return False
+
+    @callback
+    def _async_write_pending(self, now):
+        """Write the state that was held back."""
+        self._write_unsub = None
+        pending, self._write_pending = self._write_pending, None
+        self._write_last = now
+        self.hass.states.async_set(self.entity_id, *pending)
+
+    @callback
+    def _async_cancel_pending_write(self):
+        """Drop the state that was held back."""
+        self._write_unsub()
+        self._write_unsub = None
+        self._write_pending = None
+
     def schedule_update_ha_state(self, force_refresh=False):
         """Schedule an update ha state change task.
 
@@ -397,6 +483,9 @@ class Entity:
             while self._on_remove:
                 self._on_remove.pop()()
 
+        if self._write_unsub is not None:
+            self._async_cancel_pending_write()
+
         self.hass.states.async_remove(self.entity_id)
 
     @callback
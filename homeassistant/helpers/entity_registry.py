@@ -11,7 +11,7 @@ from asyncio import Event
 from collections import OrderedDict
 from itertools import chain
 import logging
-from typing import List, Optional, cast
+from typing import Dict, List, Optional, Set, Tuple, cast
 import weakref
 
 import attr
@@ -85,6 +85,47 @@ class EntityRegistry:
         self.entities = None
         self._store = hass.helpers.storage.Store(STORAGE_VERSION, STORAGE_KEY)
 
+    @property
+    def entities(self):
+        """Return the entries by entity_id."""
+        return self._entities
+
+    @entities.setter
+    def entities(self, entities):
+        """Replace the entries and rebuild the indexes."""
+        self._entities = entities
+        # (domain, platform, unique_id) -> entity_id
+        self._entity_id_index = \
+            {}  # type: Dict[Tuple[str, str, str], str]
+        # device_id -> entity_ids
+        self._device_index = {}  # type: Dict[str, Set[str]]
+
+        for entry in (entities or {}).values():
+            self._async_index(entry)
+
+    @callback
+    def _async_index(self, entry):
+        """Add an entry to the indexes."""
+        self._entity_id_index[
+            entry.domain, entry.platform, entry.unique_id] = entry.entity_id
+
+        if entry.device_id is not None:
+            self._device_index.setdefault(
+                entry.device_id, set()).add(entry.entity_id)
+
+    @callback
+    def _async_unindex(self, entry):
+        """Remove an entry from the indexes."""
+        self._entity_id_index.pop(
+            (entry.domain, entry.platform, entry.unique_id), None)
+
+        if entry.device_id is not None:
+            entity_ids = self._device_index.get(entry.device_id)
+            if entity_ids is not None:
+                entity_ids.discard(entry.entity_id)
+                if not entity_ids:
+                    del self._device_index[entry.device_id]
+
     @callback
     def async_is_registered(self, entity_id):
         """Check if an entity_id is currently registered."""
@@ -98,11 +139,14 @@ class EntityRegistry:
     @callback
     def async_get_entity_id(self, domain: str, platform: str, unique_id: str):
         """Check if an entity_id is currently registered."""
-        for entity in self.entities.values():
-            if entity.domain == domain and entity.platform == platform and \
-               entity.unique_id == unique_id:
-                return entity.entity_id
-        return None
+        return self._entity_id_index.get((domain, platform, unique_id))
+
+    @callback
+    def async_entries_for_device(self, device_id: str) \
+            -> List[RegistryEntry]:
+        """Return entries that belong to a device."""
+        return [self.entities[entity_id] for entity_id
+                in self._device_index.get(device_id, ())]
 
     @callback
     def async_generate_entity_id(self, domain, suggested_object_id,
@@ -148,6 +192,7 @@ class EntityRegistry:
             platform=platform,
         )
         self.entities[entity_id] = entity
+        self._async_index(entity)
         _LOGGER.info('Registered new %s.%s entity: %s',
                      domain, platform, entity_id)
         self.async_schedule_save()
@@ -162,7 +207,7 @@ class EntityRegistry:
     @callback
     def async_remove(self, entity_id):
         """Remove an entity from registry."""
-        self.entities.pop(entity_id)
+        self._async_unindex(self.entities.pop(entity_id))
         self.hass.bus.async_fire(EVENT_ENTITY_REGISTRY_UPDATED, {
             'action': 'remove',
             'entity_id': entity_id
@@ -210,24 +255,27 @@ class EntityRegistry:
                     split_entity_id(entity_id)[0]):
                 raise ValueError('New entity ID should be same domain')
 
-            self.entities.pop(entity_id)
-            entity_id = changes['entity_id'] = new_entity_id
+            changes['entity_id'] = new_entity_id
 
         if new_unique_id is not _UNDEF:
-            conflict = next((entity for entity in self.entities.values()
-                             if entity.unique_id == new_unique_id
-                             and entity.domain == old.domain
-                             and entity.platform == old.platform), None)
+            conflict = self.async_get_entity_id(
+                old.domain, old.platform, new_unique_id)
             if conflict:
                 raise ValueError(
                     "Unique id '{}' is already in use by '{}'".format(
-                        new_unique_id, conflict.entity_id))
+                        new_unique_id, conflict))
             changes['unique_id'] = new_unique_id
 
         if not changes:
             return old
 
+        self._async_unindex(old)
+        if 'entity_id' in changes:
+            self.entities.pop(entity_id)
+            entity_id = new_entity_id
+
         new = self.entities[entity_id] = attr.evolve(old, **changes)
+        self._async_index(new)
 
         to_remove = []
         for listener_ref in new.update_listeners:
@@ -336,8 +384,7 @@ async def async_get_registry(hass: HomeAssistantType) -> EntityRegistry:
 def async_entries_for_device(registry: EntityRegistry, device_id: str) \
         -> List[RegistryEntry]:
     """Return entries that match a device."""
-    return [entry for entry in registry.entities.values()
-            if entry.device_id == device_id]
+    return registry.async_entries_for_device(device_id)
 
 
 async def _async_migrate(entities):
@@ -1,6 +1,9 @@
 """Helpers for listening to events."""
 from datetime import timedelta
 import functools as ft
+import heapq
+import itertools
+import logging
 
 from homeassistant.loader import bind_hass
 from homeassistant.helpers.sun import get_astral_event_next
@@ -8,9 +11,16 @@ from ..core import HomeAssistant, callback
 from ..const import (
     ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL,
     SUN_EVENT_SUNRISE, SUN_EVENT_SUNSET)
+from ..exceptions import TemplateError
 from ..util import dt as dt_util
 from ..util.async_ import run_callback_threadsafe
 
+TRACK_STATE_CHANGE_CALLBACKS = 'track_state_change_callbacks'
+TRACK_STATE_CHANGE_LISTENER = 'track_state_change_listener'
+TRACK_TIME_SCHEDULER = 'track_time_scheduler'
+
+_LOGGER = logging.getLogger(__name__)
+
 # PyLint does not like the use of threaded_listener_factory
 # pylint: disable=invalid-name
 
@@ -64,10 +74,6 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
     @callback
     def state_change_listener(event):
         """Handle specific state changes."""
-        if entity_ids != MATCH_ALL and \
-           event.data.get('entity_id') not in entity_ids:
-            return
-
         old_state = event.data.get('old_state')
         if old_state is not None:
             old_state = old_state.state
@@ -81,26 +87,85 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
                                event.data.get('old_state'),
                                event.data.get('new_state'))
 
-    return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+    if entity_ids == MATCH_ALL:
+        return hass.bus.async_listen(
+            EVENT_STATE_CHANGED, state_change_listener)
+
+    return _async_track_state_change_entities(
+        hass, entity_ids, state_change_listener)
 
 
 track_state_change = threaded_listener_factory(async_track_state_change)
 
 
+@callback
+def _async_track_state_change_entities(hass, entity_ids, listener):
+    """Register a state_changed listener for specific entity ids.
+
+    All listeners share a single bus listener that dispatches each event
+    only to the listeners registered for the entity id of that event.
+    """
+    entity_ids = set(entity_ids)
+    entity_callbacks = hass.data.setdefault(TRACK_STATE_CHANGE_CALLBACKS, {})
+
+    if TRACK_STATE_CHANGE_LISTENER not in hass.data:
+        @callback
+        def _async_state_change_dispatcher(event):
+            """Dispatch state changes by entity_id."""
+            entity_id = event.data.get('entity_id')
+
+            if entity_id not in entity_callbacks:
+                return
+
+            for action in entity_callbacks[entity_id][:]:
+                try:
+                    action(event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Error while processing state changed for %s",
+                        entity_id)
+
+        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, _async_state_change_dispatcher)
+
+    for entity_id in entity_ids:
+        entity_callbacks.setdefault(entity_id, []).append(listener)
+
+    @callback
+    def remove_listener():
+        """Remove state change listener."""
+        for entity_id in entity_ids:
+            listeners = entity_callbacks.get(entity_id)
+            if listeners is None or listener not in listeners:
+                continue
+
+            listeners.remove(listener)
+            if not listeners:
+                del entity_callbacks[entity_id]
+
+        if not entity_callbacks and TRACK_STATE_CHANGE_LISTENER in hass.data:
+            hass.data.pop(TRACK_STATE_CHANGE_LISTENER)()
+
+    return remove_listener
+
+
 @callback
 @bind_hass
 def async_track_template(hass, template, action, variables=None):
     """Add a listener that track state changes with template condition."""
-    from . import condition
-
     # Local variable to keep track of if the action has already been triggered
     already_triggered = False
 
     @callback
-    def template_condition_listener(entity_id, from_s, to_s):
+    def template_condition_listener(entity_id, from_s, to_s, info):
         """Check if condition is correct and run action."""
         nonlocal already_triggered
-        template_result = condition.async_template(hass, template, variables)
+
+        try:
+            template_result = info.result.lower() == 'true'
+        except TemplateError as ex:
+            _LOGGER.error("Error during template condition: %s", ex)
+            template_result = False
 
         # Check to see if template returns true
         if template_result and not already_triggered:
@@ -109,14 +174,109 @@ def async_track_template(hass, template, action, variables=None):
         elif not template_result:
             already_triggered = False
 
-    return async_track_state_change(
-        hass, template.extract_entities(variables),
-        template_condition_listener)
+    # Templates the entities could not be extracted from used to be checked
+    # on every state change, keep doing so while they read no states.
+    return async_track_template_result(
+        hass, template, template_condition_listener, variables,
+        fallback_match_all=template.extract_entities(variables) == MATCH_ALL)
 
 
 track_template = threaded_listener_factory(async_track_template)
 
 
+@callback
+@bind_hass
+def async_track_template_result(hass, template, action, variables=None,
+                                fallback_match_all=False,
+                                run_immediately=False):
+    """Add a listener that renders a template when the states it read change.
+
+    The template is rendered right away to find out which states it reads.
+    It is rendered again when one of the entities it read changes or when
+    an entity is added to or removed from a domain it iterated over, after
+    which the listener follows what that render read. Action is called
+    after every render with the entity_id, old state and new state of the
+    change and the RenderInfo of the render.
+
+    Templates that read no states are not rendered again, unless
+    fallback_match_all is set to render them on every state change. With
+    run_immediately the action is also called after the first render, with
+    None for the entity_id and states.
+
+    Returns a function that can be called to remove the listener.
+    """
+    # pylint: disable=protected-access
+    info = None
+    subscription = None
+    unsub = None
+
+    @callback
+    def state_change_listener(event):
+        """Render the template if the state change affects it."""
+        entity_id = event.data.get('entity_id')
+        old_state = event.data.get('old_state')
+        new_state = event.data.get('new_state')
+
+        if subscription is not MATCH_ALL:
+            if old_state is None or new_state is None:
+                if not info.filter_lifecycle(entity_id):
+                    return
+            elif not info.filter(entity_id):
+                return
+
+        render()
+        hass.async_run_job(action, entity_id, old_state, new_state, info)
+
+    @callback
+    def render():
+        """Render the template and follow the states it read."""
+        nonlocal info, subscription, unsub
+
+        info = template.async_render_to_info(variables)
+
+        if info._all_states or getattr(info, '_domains', None):
+            new_subscription = EVENT_STATE_CHANGED
+        elif info._entities:
+            new_subscription = info._entities
+        elif fallback_match_all:
+            new_subscription = MATCH_ALL
+        else:
+            new_subscription = None
+
+        if new_subscription == subscription:
+            return
+
+        if unsub is not None:
+            unsub()
+            unsub = None
+
+        subscription = new_subscription
+
+        if subscription is None:
+            return
+
+        if isinstance(subscription, frozenset):
+            unsub = _async_track_state_change_entities(
+                hass, subscription, state_change_listener)
+        else:
+            unsub = hass.bus.async_listen(
+                EVENT_STATE_CHANGED, state_change_listener)
+
+    render()
+    if run_immediately:
+        hass.async_run_job(action, None, None, None, info)
+
+    @callback
+    def remove_listener():
+        """Remove the template listener."""
+        nonlocal unsub
+        if unsub is not None:
+            unsub()
+            unsub = None
+
+    return remove_listener
+
+
 @callback
 @bind_hass
 def async_track_same_state(hass, period, action, async_check_same_func,
@@ -193,27 +353,12 @@ def async_track_point_in_utc_time(hass, action, point_in_time):
     point_in_time = dt_util.as_utc(point_in_time)
 
     @callback
-    def point_in_time_listener(event):
-        """Listen for matching time_changed events."""
-        now = event.data[ATTR_NOW]
-
-        if now < point_in_time or hasattr(point_in_time_listener, 'run'):
-            return
-
-        # Set variable so that we will never run twice.
-        # Because the event bus might have to wait till a thread comes
-        # available to execute this listener it might occur that the
-        # listener gets lined up twice to be executed. This will make
-        # sure the second time it does nothing.
-        point_in_time_listener.run = True
-        async_unsub()
-
+    def point_in_time_listener(now):
+        """Run the action once the point in time has passed."""
         hass.async_run_job(action, now)
 
-    async_unsub = hass.bus.async_listen(EVENT_TIME_CHANGED,
-                                        point_in_time_listener)
-
-    return async_unsub
+    return _async_get_time_scheduler(hass).async_schedule(
+        point_in_time_listener, point_in_time)
 
 
 track_point_in_utc_time = threaded_listener_factory(
@@ -341,43 +486,23 @@ def async_track_utc_time_change(hass, action,
     matching_minutes = dt_util.parse_time_expression(minute, 0, 59)
     matching_hours = dt_util.parse_time_expression(hour, 0, 23)
 
-    next_time = None
-
     def calculate_next(now):
-        """Calculate and set the next time the trigger should fire."""
-        nonlocal next_time
-
+        """Calculate the next time the trigger should fire."""
         localized_now = dt_util.as_local(now) if local else now
-        next_time = dt_util.find_next_time_expression_time(
+        return dt_util.find_next_time_expression_time(
             localized_now, matching_seconds, matching_minutes,
             matching_hours)
 
-    # Make sure rolling back the clock doesn't prevent the timer from
-    # triggering.
-    last_now = None
-
     @callback
-    def pattern_time_change_listener(event):
-        """Listen for matching time_changed events."""
-        nonlocal next_time, last_now
-
-        now = event.data[ATTR_NOW]
-
-        if last_now is None or now < last_now:
-            # Time rolled back or next time not yet calculated
-            calculate_next(now)
-
-        last_now = now
-
-        if next_time <= now:
-            hass.async_run_job(action, dt_util.as_local(now) if local else now)
-            calculate_next(now + timedelta(seconds=1))
+    def pattern_time_change_listener(now):
+        """Run the action when the time matches the pattern."""
+        hass.async_run_job(action, dt_util.as_local(now) if local else now)
 
     # We can't use async_track_point_in_utc_time here because it would
     # break in the case that the system time abruptly jumps backwards.
-    # Our custom last_now logic takes care of resolving that scenario.
-    return hass.bus.async_listen(EVENT_TIME_CHANGED,
-                                 pattern_time_change_listener)
+    # The scheduler recalculates the next time when that happens.
+    return _async_get_time_scheduler(hass).async_schedule(
+        pattern_time_change_listener, calculate_next=calculate_next)
 
 
 track_utc_time_change = threaded_listener_factory(async_track_utc_time_change)
@@ -394,6 +519,162 @@ def async_track_time_change(hass, action, hour=None, minute=None, second=None):
 track_time_change = threaded_listener_factory(async_track_time_change)
 
 
+class _ScheduledAction:
+    """An action waiting in the time scheduler."""
+
+    __slots__ = ('action', 'when', 'calculate_next', 'cancelled')
+
+    def __init__(self, action, when, calculate_next):
+        """Initialize the scheduled action."""
+        self.action = action
+        self.when = when
+        self.calculate_next = calculate_next
+        self.cancelled = False
+
+
+class _TimeScheduler:
+    """Run time listeners only when they are due.
+
+    A single time_changed listener keeps the pending actions in a heap
+    ordered by the time they are due, so a time_changed event only costs
+    a peek at the heap unless something has to run.
+
+    Actions with a calculate_next function repeat: their next point in time
+    is calculated from the first time_changed event after they were added,
+    after each run and whenever the time jumps backwards.
+    """
+
+    def __init__(self, hass):
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._heap = []
+        self._unscheduled = []
+        self._scheduled = set()
+        self._counter = itertools.count()
+        self._last_now = None
+        self._unsub = None
+
+    @callback
+    def async_schedule(self, action, point_in_time=None,
+                       calculate_next=None):
+        """Schedule an action and return a function to cancel it."""
+        scheduled = _ScheduledAction(action, point_in_time, calculate_next)
+        self._scheduled.add(scheduled)
+
+        if point_in_time is None:
+            self._unscheduled.append(scheduled)
+        else:
+            self._push(scheduled)
+
+        if self._unsub is None:
+            self._unsub = self._hass.bus.async_listen(
+                EVENT_TIME_CHANGED, self._async_time_changed)
+
+        @callback
+        def cancel():
+            """Cancel the scheduled action."""
+            if scheduled.cancelled:
+                return
+            scheduled.cancelled = True
+            self._scheduled.discard(scheduled)
+
+            # Drop cancelled actions once they make up most of the heap
+            if len(self._heap) > 2 * len(self._scheduled) + 100:
+                self._heap[:] = [
+                    entry for entry in self._heap if not entry[2].cancelled]
+                heapq.heapify(self._heap)
+
+            self._async_check_empty()
+
+        return cancel
+
+    def _push(self, scheduled):
+        """Add an action to the heap."""
+        heapq.heappush(
+            self._heap, (scheduled.when, next(self._counter), scheduled))
+
+    @callback
+    def _async_check_empty(self):
+        """Stop listening for time changes if nothing is scheduled."""
+        if self._scheduled or self._unsub is None:
+            return
+
+        self._unsub()
+        self._unsub = None
+        del self._heap[:]
+        del self._unscheduled[:]
+        self._last_now = None
+
+    @callback
+    def _async_time_changed(self, event):
+        """Run all actions that are due."""
+        now = event.data[ATTR_NOW]
+
+        if self._last_now is not None and now < self._last_now:
+            # Time rolled back, recalculate all repeating actions
+            self._unscheduled = [
+                scheduled for scheduled in self._scheduled
+                if scheduled.calculate_next is not None]
+            self._heap[:] = [
+                entry for entry in self._heap
+                if entry[2].calculate_next is None]
+            heapq.heapify(self._heap)
+
+        self._last_now = now
+
+        if self._unscheduled:
+            for scheduled in self._unscheduled:
+                if scheduled.cancelled:
+                    continue
+                scheduled.when = scheduled.calculate_next(now)
+                self._push(scheduled)
+            self._unscheduled = []
+
+        # Actions scheduled while running this event wait for the next one
+        last_seq = next(self._counter)
+        postponed = []
+
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            when, seq, scheduled = entry
+
+            if scheduled.cancelled or when != scheduled.when:
+                continue
+
+            if seq > last_seq:
+                postponed.append(entry)
+                continue
+
+            if scheduled.calculate_next is None:
+                scheduled.cancelled = True
+                self._scheduled.discard(scheduled)
+            else:
+                scheduled.when = scheduled.calculate_next(
+                    now + timedelta(seconds=1))
+                self._push(scheduled)
+
+            try:
+                scheduled.action(now)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running scheduled action %s",
+                                  scheduled.action)
+
+        for entry in postponed:
+            heapq.heappush(heap, entry)
+
+        self._async_check_empty()
+
+
+@callback
+def _async_get_time_scheduler(hass):
+    """Return the time scheduler, creating it if needed."""
+    scheduler = hass.data.get(TRACK_TIME_SCHEDULER)
+    if scheduler is None:
+        scheduler = hass.data[TRACK_TIME_SCHEDULER] = _TimeScheduler(hass)
+    return scheduler
+
+
 def _process_state_match(parameter):
     """Convert parameter to function that matches input against parameter."""
     if parameter is None or parameter == MATCH_ALL:
@@ -1,10 +1,12 @@
 """Template helper methods for rendering strings with Home Assistant data."""
 import base64
+from collections import OrderedDict
 import json
 import logging
 import math
 import random
 import re
+import threading
 from datetime import datetime
 
 import jinja2
@@ -31,6 +33,9 @@ DATE_STR_FORMAT = "%Y-%m-%d %H:%M:%S"
 
 _RENDER_INFO = 'template.render_info'
 
+# Number of distinct template sources to keep the compiled code of
+COMPILED_CACHE_SIZE = 1024
+
 _RE_NONE_ENTITIES = re.compile(r"distance\(|closest\(", re.I | re.M)
 _RE_GET_ENTITIES = re.compile(
     r"(?:(?:states\.|(?:is_state|is_state_attr|state_attr|states)"
@@ -95,6 +100,65 @@ def _true(arg) -> bool:
     return True
 
 
+class CompiledCodeCache:
+    """LRU cache of compiled template code shared by all templates.
+
+    Identical template strings, like the ones in copied packages, are only
+    compiled once. Templates can be compiled from any thread, for example
+    during config validation.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize the cache."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._code = OrderedDict()  # type: OrderedDict
+        self._lock = threading.Lock()
+
+    def get(self, source: str):
+        """Return the compiled code of a template string.
+
+        Raises jinja2.TemplateSyntaxError if the template is invalid.
+        """
+        with self._lock:
+            code = self._code.get(source)
+            if code is not None:
+                self._code.move_to_end(source)
+                self.hits += 1
+                return code
+            self.misses += 1
+
+        code = ENV.compile(source)
+
+        with self._lock:
+            self._code[source] = code
+            while len(self._code) > self.maxsize:
+                self._code.popitem(last=False)
+
+        return code
+
+    def clear(self) -> None:
+        """Remove all compiled code and reset the counters."""
+        with self._lock:
+            self._code.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        """Return the cache statistics."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._code),
+                'maxsize': self.maxsize,
+            }
+
+
+COMPILED_CODE = CompiledCodeCache(COMPILED_CACHE_SIZE)
+
+
 class RenderInfo:
     """Holds information about a template render."""
 
@@ -126,6 +190,12 @@ class RenderInfo:
             raise self._exception  # pylint: disable=raising-bad-type
         return self._result
 
+    @property
+    def reads_states(self) -> bool:
+        """Return if the template read any states."""
+        return bool(self._all_states or getattr(self, '_domains', None)
+                    or self._entities)
+
     def _freeze(self) -> None:
         self._entities = frozenset(self._entities)
         if self._all_states:
@@ -158,7 +228,7 @@ class Template:
             return
 
         try:
-            self._compiled_code = ENV.compile(self.template)
+            self._compiled_code = COMPILED_CODE.get(self.template)
         except jinja2.exceptions.TemplateSyntaxError as err:
             raise TemplateError(err)
 
@@ -1,48 +1,121 @@
 """Script to run benchmarks."""
 import argparse
 import asyncio
-from contextlib import suppress
-from datetime import datetime
+import json
 import logging
+import platform
+import statistics
+import sys
+import tempfile
+from datetime import datetime
 from timeit import default_timer as timer
 
 from homeassistant import core
 from homeassistant.const import (
-    ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED)
+    ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, STATE_OFF, STATE_ON,
+    __version__)
 from homeassistant.util import dt as dt_util
 
 BENCHMARKS = {}
 
+DEFAULT_ITERATIONS = 5
+PERCENTILES = (50, 90, 99)
+
 
 def run(args):
-    """Handle ensure configuration commandline script."""
+    """Handle benchmark commandline script."""
     # Disable logging
     logging.getLogger('homeassistant.core').setLevel(logging.CRITICAL)
 
     parser = argparse.ArgumentParser(
-        description=("Run a Home Assistant benchmark."))
-    parser.add_argument('name', choices=BENCHMARKS)
+        description=("Run Home Assistant benchmarks and report the results "
+                     "as JSON."))
+    parser.add_argument(
+        'name', nargs='*',
+        help="Benchmarks to run, one of {}. Runs all when omitted.".format(
+            ', '.join(BENCHMARKS)))
+    parser.add_argument(
+        '-n', '--iterations', type=int, default=DEFAULT_ITERATIONS,
+        help="Number of times to run each benchmark")
+    parser.add_argument(
+        '-o', '--output', help="Write the JSON results to this file")
     parser.add_argument('--script', choices=['benchmark'])
 
     args = parser.parse_args()
 
-    bench = BENCHMARKS[args.name]
+    unknown = [name for name in args.name if name not in BENCHMARKS]
+    if unknown:
+        parser.error("Unknown benchmarks: {}".format(', '.join(unknown)))
+    if args.iterations < 1:
+        parser.error("Iterations must be at least 1")
+
+    loop_module = asyncio.get_event_loop_policy().__module__
+    print('Using event loop:', loop_module, file=sys.stderr)
+
+    results = {
+        'version': __version__,
+        'python': platform.python_version(),
+        'event_loop': loop_module,
+        'iterations': args.iterations,
+        'benchmarks': {},
+    }
+
+    for name in args.name or BENCHMARKS:
+        runtimes = [_run_once(BENCHMARKS[name])
+                    for _ in range(args.iterations)]
+        results['benchmarks'][name] = _summarize(runtimes)
+        print('Benchmark {} done in {:.3f}s (median)'.format(
+            name, results['benchmarks'][name]['p50']), file=sys.stderr)
 
-    print('Using event loop:', asyncio.get_event_loop_policy().__module__)
+    output = json.dumps(results, indent=2, sort_keys=True)
 
-    with suppress(KeyboardInterrupt):
-        while True:
-            loop = asyncio.new_event_loop()
-            hass = core.HomeAssistant(loop)
-            hass.async_stop_track_tasks()
-            runtime = loop.run_until_complete(bench(hass))
-            print('Benchmark {} done in {}s'.format(bench.__name__, runtime))
-            loop.run_until_complete(hass.async_stop())
-            loop.close()
+    if args.output:
+        with open(args.output, 'w') as fil:
+            fil.write(output)
+    else:
+        print(output)
 
     return 0
 
 
+def _run_once(bench):
+    """Run a benchmark on a fresh instance and return its runtime."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        loop = asyncio.new_event_loop()
+        hass = core.HomeAssistant(loop)
+        hass.config.config_dir = config_dir
+        hass.async_stop_track_tasks()
+        runtime = loop.run_until_complete(bench(hass))
+        loop.run_until_complete(hass.async_stop())
+        loop.close()
+
+    return runtime
+
+
+def _summarize(runtimes):
+    """Return the statistics of the runtimes of a benchmark."""
+    ordered = sorted(runtimes)
+    summary = {
+        'runtimes': runtimes,
+        'min': ordered[0],
+        'max': ordered[-1],
+        'mean': statistics.mean(ordered),
+    }
+
+    for percent in PERCENTILES:
+        summary['p{}'.format(percent)] = _percentile(ordered, percent)
+
+    return summary
+
+
+def _percentile(ordered, percent):
+    """Return a percentile of sorted values, interpolated between ranks."""
+    rank = (len(ordered) - 1) * percent / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
 def benchmark(func):
     """Decorate to mark a benchmark."""
     BENCHMARKS[func.__name__] = func
@@ -142,22 +215,18 @@ async def async_million_state_changed_helper(hass):
 
 
 @benchmark
-@asyncio.coroutine
-def logbook_filtering_state(hass):
+async def logbook_filtering_state(hass):
     """Filter state changes."""
-    return _logbook_filtering(hass, 1, 1)
+    return await _logbook_filtering(hass, 1, 1)
 
 
 @benchmark
-@asyncio.coroutine
-def logbook_filtering_attributes(hass):
+async def logbook_filtering_attributes(hass):
     """Filter attribute changes."""
-    return _logbook_filtering(hass, 1, 2)
+    return await _logbook_filtering(hass, 1, 2)
 
 
-@benchmark
-@asyncio.coroutine
-def _logbook_filtering(hass, last_changed, last_updated):
+async def _logbook_filtering(hass, last_changed, last_updated):
     from homeassistant.components import logbook
 
     entity_id = 'test.entity'
@@ -192,3 +261,227 @@ def _logbook_filtering(hass, last_changed, last_updated):
     list(logbook.humanify(None, yield_events(event)))
 
     return timer() - start
+
+
+@benchmark
+async def async_state_changed_trackers(hass):
+    """Change the state of 1000 entities with a state tracker each."""
+    count = 0
+    entities = 1000
+    changes = 10**5
+    event = asyncio.Event()
+
+    @core.callback
+    def listener(*args):
+        """Handle state change."""
+        nonlocal count
+        count += 1
+
+        if count == changes:
+            event.set()
+
+    entity_ids = ['light.kitchen_{}'.format(idx) for idx in range(entities)]
+    for entity_id in entity_ids:
+        hass.helpers.event.async_track_state_change(entity_id, listener)
+
+    start = timer()
+
+    for idx in range(changes):
+        hass.states.async_set(
+            entity_ids[idx % entities],
+            STATE_ON if (idx // entities) % 2 else STATE_OFF)
+
+    await event.wait()
+
+    return timer() - start
+
+
+@benchmark
+async def async_template_render(hass):
+    """Render a template over the states of 100 sensors 1000 times."""
+    from homeassistant.helpers.template import Template
+
+    for idx in range(100):
+        hass.states.async_set(
+            'sensor.temperature_{}'.format(idx), str(idx),
+            {'unit_of_measurement': '°C'})
+
+    template = Template(
+        '{{ states.sensor | map(attribute="state") | map("float") | sum }} '
+        '{{ is_state("sensor.temperature_1", "1") }} '
+        '{{ states("sensor.temperature_2") | float * 1.8 + 32 }}', hass)
+    template.ensure_valid()
+
+    start = timer()
+
+    for _ in range(10**3):
+        template.async_render()
+
+    return timer() - start
+
+
+@benchmark
+async def async_recorder_inserts(hass):
+    """Record 2000 state changes in a SQLite database."""
+    from homeassistant.components.recorder import DATA_INSTANCE
+    from homeassistant.setup import async_setup_component
+
+    changes = 2000
+    hass.state = core.CoreState.running
+    await async_setup_component(hass, 'recorder', {
+        'recorder': {
+            'db_url': 'sqlite:///{}'.format(hass.config.path('benchmark.db'))
+        }
+    })
+    instance = hass.data[DATA_INSTANCE]
+
+    start = timer()
+
+    for idx in range(changes):
+        hass.states.async_set(
+            'sensor.power', str(idx), {'unit_of_measurement': 'W'})
+
+    # Let the recorder queue the events, then wait until they are written
+    await asyncio.sleep(0)
+    await hass.async_add_executor_job(instance.block_till_done)
+
+    return timer() - start
+
+
+@benchmark
+async def async_mqtt_dispatch(hass):
+    """Dispatch 10000 MQTT messages to 1000 topic subscriptions."""
+    import ssl
+    from paho.mqtt.client import MQTTMessage
+    from homeassistant.components import mqtt
+
+    class BenchmarkMQTT(mqtt.MQTT):
+        """MQTT client that does not subscribe at a broker."""
+
+        async def _async_perform_subscription(self, topic, qos):
+            """Skip the broker subscription."""
+
+    count = 0
+    rooms = 1000
+    messages = 10**4
+
+    @core.callback
+    def listener(msg):
+        """Handle MQTT message."""
+        nonlocal count
+        count += 1
+
+    client = BenchmarkMQTT(
+        hass, 'localhost', mqtt.DEFAULT_PORT, None, mqtt.DEFAULT_KEEPALIVE,
+        None, None, None, None, None, None, mqtt.DEFAULT_PROTOCOL, None, None,
+        ssl.PROTOCOL_TLS)
+
+    for idx in range(rooms):
+        await client.async_subscribe(
+            'home/room_{}/temperature'.format(idx), listener, 0, 'utf-8')
+    await client.async_subscribe('home/+/temperature', listener, 0, 'utf-8')
+    await client.async_subscribe('home/#', listener, 0, None)
+
+    msgs = []
+    for idx in range(messages):
+        msg = MQTTMessage(topic='home/room_{}/temperature'.format(
+            idx % rooms).encode())
+        msg.payload = str(idx).encode()
+        msgs.append(msg)
+
+    start = timer()
+
+    for msg in msgs:
+        # pylint: disable=protected-access
+        client._mqtt_handle_message(msg)
+
+    assert count == 3 * messages
+
+    return timer() - start
+
+
+@benchmark
+async def async_entity_service_call(hass):
+    """Call a service on 1000 entities 100 times."""
+    from types import SimpleNamespace
+    from homeassistant.const import ATTR_ENTITY_ID
+    from homeassistant.helpers.entity import ToggleEntity
+    from homeassistant.helpers.service import entity_service_call
+
+    class BenchmarkEntity(ToggleEntity):
+        """Entity that is turned on."""
+
+        def __init__(self, entity_id):
+            """Initialize the entity."""
+            self.entity_id = entity_id
+            self._state = False
+
+        @property
+        def should_poll(self):
+            """Return that the state is pushed."""
+            return False
+
+        @property
+        def is_on(self):
+            """Return if the entity is on."""
+            return self._state
+
+        async def async_turn_on(self, **kwargs):
+            """Turn the entity on."""
+            self._state = True
+
+    entities = [BenchmarkEntity('light.bench_{}'.format(idx))
+                for idx in range(1000)]
+    for entity in entities:
+        entity.hass = hass
+    platforms = [
+        SimpleNamespace(entities={
+            entity.entity_id: entity for entity in entities[idx::10]})
+        for idx in range(10)
+    ]
+    call = core.ServiceCall('light', 'turn_on', {
+        ATTR_ENTITY_ID: [entity.entity_id for entity in entities]
+    })
+
+    start = timer()
+
+    for _ in range(100):
+        await entity_service_call(hass, platforms, 'async_turn_on', call)
+
+    return timer() - start
+
+
+@benchmark
+async def async_startup(hass):
+    """Set up a configuration with 100 input booleans and automations."""
+    from homeassistant import bootstrap
+
+    switches = ['switch_{}'.format(idx) for idx in range(100)]
+    config = {
+        'homeassistant': {'time_zone': 'UTC'},
+        'input_boolean': {switch: {} for switch in switches},
+        'automation': [{
+            'alias': 'Turn off {}'.format(switch),
+            'trigger': {
+                'platform': 'state',
+                'entity_id': 'input_boolean.{}'.format(switch),
+                'to': STATE_ON,
+            },
+            'action': {
+                'service': 'input_boolean.turn_off',
+                'entity_id': 'input_boolean.{}'.format(switch),
+            },
+        } for switch in switches],
+        'group': {
+            'switches': ['input_boolean.{}'.format(switch)
+                         for switch in switches],
+        },
+    }
+
+    start = timer()
+
+    await bootstrap.async_from_config_dict(
+        config, hass, hass.config.config_dir, enable_log=False,
+        skip_pip=True)
+
+    return timer() - start
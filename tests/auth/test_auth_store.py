@@ -1,9 +1,11 @@
 """Tests for the auth store."""
 import asyncio
+from unittest.mock import Mock
 
 import asynctest
 
 from homeassistant.auth import auth_store
+from homeassistant.auth.permissions import PolicyPermissions
 
 
 async def test_loading_no_group_data_format(hass, hass_storage):
@@ -192,6 +194,12 @@ async def test_loading_all_access_group_data_format(hass, hass_storage):
     system_token = list(system.refresh_tokens.values())[0]
     assert system_token.id == 'system-token-id'
 
+    assert await store.async_get_refresh_token('user-token-id') is owner_token
+    assert await store.async_get_refresh_token_by_token(
+        system_token.token) is system_token
+    assert await store.async_get_refresh_token(
+        'hidden-because-no-jwt-id') is None
+
 
 async def test_loading_empty_data(hass, hass_storage):
     """Test we correctly load with no existing data."""
@@ -259,3 +267,33 @@ async def test_loading_race_condition(hass):
         mock_dev_registry.assert_called_once_with(hass)
         mock_load.assert_called_once_with()
         assert results[0] == results[1]
+
+
+async def test_permission_cache_follows_registries(hass):
+    """Test cached entity permissions are dropped when registries change."""
+    store = auth_store.AuthStore(hass)
+    await store.async_get_users()
+    permissions = PolicyPermissions({
+        'entities': {
+            'device_ids': {
+                'mock-device-id': True,
+            }
+        }
+    }, store._perm_lookup)
+
+    ent_reg = await hass.helpers.entity_registry.async_get_registry()
+    entry = ent_reg.async_get_or_create('light', 'hue', '1234')
+    await hass.async_block_till_done()
+
+    entity_func = permissions._cached_entity_func = Mock(
+        wraps=permissions._entity_func())
+    assert not permissions.check_entity(entry.entity_id, 'read')
+    assert not permissions.check_entity(entry.entity_id, 'read')
+    assert entity_func.call_count == 1
+
+    ent_reg.async_get_or_create(
+        'light', 'hue', '1234', device_id='mock-device-id')
+    await hass.async_block_till_done()
+
+    assert permissions.check_entity(entry.entity_id, 'read')
+    assert entity_func.call_count == 2
@@ -475,6 +475,53 @@ async def test_remove_refresh_token(mock_hass):
     )
 
 
+async def test_validated_access_token_cache(mock_hass):
+    """Test validated access tokens are cached until revoked."""
+    manager = await auth.auth_manager_from_config(mock_hass, [], [])
+    user = MockUser().add_to_auth_manager(manager)
+    refresh_token = await manager.async_create_refresh_token(user, CLIENT_ID)
+    access_token = manager.async_create_access_token(refresh_token)
+    other_token = await manager.async_create_refresh_token(
+        user, 'http://other.example.com')
+    other_access_token = manager.async_create_access_token(other_token)
+
+    with patch('homeassistant.auth.jwt.decode', wraps=jwt.decode) as decode:
+        for _ in range(3):
+            assert await manager.async_validate_access_token(
+                access_token) is refresh_token
+        assert decode.call_count == 2
+
+    assert await manager.async_get_refresh_token_by_token(
+        refresh_token.token) is refresh_token
+    assert await manager.async_get_refresh_token_by_token('invalid') is None
+
+    assert await manager.async_validate_access_token(
+        other_access_token) is other_token
+    await manager.async_remove_refresh_token(refresh_token)
+    assert await manager.async_validate_access_token(access_token) is None
+    assert await manager.async_get_refresh_token_by_token(
+        refresh_token.token) is None
+    assert await manager.async_validate_access_token(
+        other_access_token) is other_token
+
+    await manager.async_deactivate_user(user)
+    assert await manager.async_validate_access_token(
+        other_access_token) is None
+
+    # Cached tokens are trusted for a short while only
+    user.is_active = True
+    assert await manager.async_validate_access_token(
+        other_access_token) is other_token
+    with patch('homeassistant.util.dt.utcnow',
+               return_value=dt_util.utcnow() +
+               auth_const.ACCESS_TOKEN_CACHE_TTL), \
+            patch('homeassistant.auth.jwt.decode',
+                  wraps=jwt.decode) as decode:
+        assert await manager.async_validate_access_token(
+            other_access_token) is other_token
+        assert decode.call_count == 2
+
+
 async def test_create_access_token(mock_hass):
     """Test normal refresh_token's jwt_key keep same after used."""
     manager = await auth.auth_manager_from_config(mock_hass, [], [])
@@ -1935,3 +1935,36 @@ async def test_auth_get_access_token_not_expired(hass, aioclient_mock):
     assert auth_call_json["code"] == accept_grant_code
     assert auth_call_json["client_id"] == client_id
     assert auth_call_json["client_secret"] == client_secret
+
+
+async def test_discovery_reuses_endpoints(hass):
+    """Test endpoints are only serialized again when the entity changes."""
+    hass.states.async_set('switch.first', 'on', {'friendly_name': 'First'})
+    hass.states.async_set('switch.second', 'on', {'friendly_name': 'Second'})
+
+    async def discover():
+        """Return the discovered endpoints by endpoint id."""
+        msg = await smart_home.async_handle_message(
+            hass, DEFAULT_CONFIG, get_new_request('Alexa.Discovery',
+                                                  'Discover'))
+        return {endpoint['endpointId']: endpoint
+                for endpoint in msg['event']['payload']['endpoints']}
+
+    endpoints = await discover()
+    hass.states.async_set('switch.second', 'on', {'friendly_name': 'Other'})
+    new_endpoints = await discover()
+
+    assert new_endpoints['switch#first'] is endpoints['switch#first']
+    assert new_endpoints['switch#second']['friendlyName'] == 'Other'
+
+
+async def test_discovery_cache_replaced_config(hass):
+    """Test the discovered endpoints are kept with their config."""
+    hass.states.async_set('switch.first', 'on', {'friendly_name': 'First'})
+    config = smart_home.Config(
+        endpoint=None, async_get_access_token=None,
+        should_expose=lambda entity_id: True)
+
+    await smart_home.async_handle_message(
+        hass, config, get_new_request('Alexa.Discovery', 'Discover'))
+    assert list(config.discovery_cache) == ['switch.first']
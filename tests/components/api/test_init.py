@@ -10,6 +10,7 @@ import voluptuous as vol
 
 from homeassistant import const
 from homeassistant.bootstrap import DATA_LOGGING
+from homeassistant.helpers import template
 import homeassistant.core as ha
 from homeassistant.setup import async_setup_component
 
@@ -565,6 +566,19 @@ async def test_rendering_template_admin(hass, mock_api_client,
     assert resp.status == 401
 
 
+async def test_template_cache_info(hass, mock_api_client, hass_admin_user):
+    """Test retrieving the compiled template cache statistics."""
+    with patch.object(template.COMPILED_CODE, 'info',
+                      return_value={'hits': 2, 'misses': 1}):
+        resp = await mock_api_client.get('/api/template/cache')
+    assert resp.status == 200
+    assert await resp.json() == {'hits': 2, 'misses': 1}
+
+    hass_admin_user.groups = []
+    resp = await mock_api_client.get('/api/template/cache')
+    assert resp.status == 401
+
+
 async def test_rendering_template_legacy_user(
         hass, mock_api_client, aiohttp_client, legacy_auth):
     """Test rendering a template with legacy API password."""
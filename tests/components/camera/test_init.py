@@ -10,7 +10,8 @@ from homeassistant.setup import setup_component, async_setup_component
 from homeassistant.const import (
     ATTR_ENTITY_ID, ATTR_ENTITY_PICTURE, EVENT_HOMEASSISTANT_START)
 from homeassistant.components import camera, http
-from homeassistant.components.camera.const import DOMAIN, PREF_PRELOAD_STREAM
+from homeassistant.components.camera.const import (
+    DATA_CAMERA_PREFS, DOMAIN, PREF_PRELOAD_STREAM)
 from homeassistant.components.camera.prefs import CameraEntityPreferences
 from homeassistant.components.websocket_api.const import TYPE_RESULT
 from homeassistant.exceptions import HomeAssistantError
@@ -372,3 +373,234 @@ async def test_record_service(hass, mock_camera, mock_stream):
         # So long as we call stream.record, the rest should be covered
         # by those tests.
         assert mock_record_service.called
+
+
+async def test_frame_hub(hass):
+    """Test viewers of a still stream share one producer."""
+    images = [b'first', b'first', b'second']
+    calls = []
+
+    async def image_cb():
+        """Return the next image, or None when out of images."""
+        calls.append(None)
+        return images.pop(0) if images else None
+
+    hub = camera.hub.async_get_frame_hub(hass, image_cb, 'image/jpeg', 0)
+    assert camera.hub.async_get_frame_hub(
+        hass, image_cb, 'image/jpeg', 0) is hub
+
+    remove_first = hub.async_add_viewer()
+    remove_second = hub.async_add_viewer()
+
+    first_id, first = await hub.async_next_frame(0)
+    second_id, second = await hub.async_next_frame(0)
+    assert first_id == second_id
+    assert first is second
+    assert first.endswith(b'\r\n\r\nfirst\r\n')
+
+    # The unchanged image is skipped
+    frame_id, frame = await hub.async_next_frame(first_id)
+    assert frame_id == first_id + 1
+    assert frame.endswith(b'\r\n\r\nsecond\r\n')
+
+    # Out of images ends the stream
+    assert (await hub.async_next_frame(frame_id))[1] is None
+    assert len(calls) == 4
+
+    remove_first()
+    remove_second()
+    await hass.async_block_till_done()
+    assert camera.hub.async_get_frame_hub(
+        hass, image_cb, 'image/jpeg', 0) is not hub
+
+
+async def test_frame_hub_stops_without_viewers(hass):
+    """Test the producer stops when the last viewer leaves."""
+    async def image_cb():
+        """Return an image."""
+        return b'image'
+
+    hub = camera.hub.async_get_frame_hub(hass, image_cb, 'image/jpeg', 10)
+    remove_viewer = hub.async_add_viewer()
+    await hub.async_next_frame(0)
+    producer = hub._producer
+
+    remove_viewer()
+    await hass.async_block_till_done()
+    assert producer.done()
+    assert camera.hub.async_get_frame_hub(
+        hass, image_cb, 'image/jpeg', 10) is not hub
+
+
+async def test_frame_hub_error(hass):
+    """Test an error of the producer is raised to the viewers."""
+    async def image_cb():
+        """Fail to return an image."""
+        raise ValueError('No image')
+
+    hub = camera.hub.async_get_frame_hub(hass, image_cb, 'image/jpeg', 0)
+    remove_viewer = hub.async_add_viewer()
+
+    with pytest.raises(ValueError):
+        await hub.async_next_frame(0)
+
+    remove_viewer()
+
+
+class MockStreamResponse:
+    """Upstream response of a stream, chunks are fed by the test."""
+
+    def __init__(self, hass):
+        """Initialize the response."""
+        self.headers = {
+            'Content-Type': 'multipart/x-mixed-replace; boundary=frame'}
+        self.content = self
+        self.chunks = asyncio.Queue()
+        self.closed = False
+
+    async def read(self, size):
+        """Return the next chunk."""
+        return await self.chunks.get()
+
+    def close(self):
+        """Close the response."""
+        self.closed = True
+
+
+async def test_stream_hub(hass):
+    """Test viewers of a proxied stream share one upstream stream."""
+    resp = MockStreamResponse(hass)
+    calls = []
+
+    async def open_stream():
+        """Open the upstream stream."""
+        calls.append(None)
+        return resp
+
+    hub = camera.hub.async_get_stream_hub(hass, 'key', open_stream)
+    assert camera.hub.async_get_stream_hub(hass, 'key', open_stream) is hub
+
+    first = hub.async_add_viewer()
+    assert await hub.async_content_type() == resp.headers['Content-Type']
+
+    resp.chunks.put_nowait(b'--frame\r\n\r\nimage 1')
+    assert await first.async_next_chunk() == b'--frame\r\n\r\nimage 1'
+
+    # A late viewer starts at the next part
+    second = hub.async_add_viewer()
+    resp.chunks.put_nowait(b' end\r\n--frame\r\n\r\nimage 2')
+    assert await first.async_next_chunk() == \
+        b' end\r\n--frame\r\n\r\nimage 2'
+    assert await second.async_next_chunk() == b'--frame\r\n\r\nimage 2'
+
+    # The end of the upstream stream ends all viewers
+    resp.chunks.put_nowait(b'')
+    assert await first.async_next_chunk() is None
+    assert await second.async_next_chunk() is None
+    assert resp.closed
+    assert len(calls) == 1
+
+    first.remove()
+    second.remove()
+    await hass.async_block_till_done()
+    assert camera.hub.async_get_stream_hub(
+        hass, 'key', open_stream) is not hub
+
+
+async def test_stream_hub_error(hass):
+    """Test an error opening the upstream stream ends the viewers."""
+    async def open_stream():
+        """Fail to open the upstream stream."""
+        raise ValueError('Broken camera')
+
+    hub = camera.hub.async_get_stream_hub(hass, 'key', open_stream)
+    viewer = hub.async_add_viewer()
+
+    assert await hub.async_content_type() is None
+    assert await viewer.async_next_chunk() is None
+
+    viewer.remove()
+    await hass.async_block_till_done()
+    assert camera.hub.async_get_stream_hub(
+        hass, 'key', open_stream) is not hub
+
+
+async def test_stream_hub_read_error(hass):
+    """Test an error reading the upstream stream ends the viewers."""
+    resp = MockStreamResponse(hass)
+
+    async def open_stream():
+        """Open the upstream stream."""
+        return resp
+
+    async def read(size):
+        """Fail to read."""
+        raise ValueError('Broken stream')
+
+    resp.read = read
+    hub = camera.hub.async_get_stream_hub(hass, 'key', open_stream)
+    viewer = hub.async_add_viewer()
+
+    assert await hub.async_content_type() == resp.headers['Content-Type']
+    assert await viewer.async_next_chunk() is None
+    assert resp.closed
+
+    viewer.remove()
+
+
+async def test_stream_hub_slow_viewer(hass):
+    """Test a viewer falling behind skips to the next part."""
+    resp = MockStreamResponse(hass)
+
+    async def open_stream():
+        """Open the upstream stream."""
+        return resp
+
+    hub = camera.hub.async_get_stream_hub(hass, 'key', open_stream)
+    with patch('homeassistant.components.camera.hub.STREAM_QUEUE_SIZE', 2):
+        viewer = hub.async_add_viewer()
+
+    # The producer reads all chunks before the viewer gets to run
+    for chunk in (b'--frame 1', b' data', b' more', b'--frame 2'):
+        resp.chunks.put_nowait(chunk)
+    await asyncio.sleep(0)
+
+    assert await viewer.async_next_chunk() == b'--frame 2'
+    resp.chunks.put_nowait(b' rest')
+    assert await viewer.async_next_chunk() == b' rest'
+
+    producer = hub._producer
+    viewer.remove()
+    await hass.async_block_till_done()
+    assert producer.done()
+
+
+async def test_snapshot_cache(hass, mock_camera):
+    """Test snapshots are shared between requests and reused for the TTL."""
+    calls = []
+
+    async def camera_image():
+        """Return a new image."""
+        calls.append(None)
+        await asyncio.sleep(0)
+        return 'Image {}'.format(len(calls)).encode()
+
+    with patch('homeassistant.components.demo.camera.DemoCamera.'
+               'async_camera_image', side_effect=camera_image):
+        first, second = await asyncio.gather(
+            camera.async_get_image(hass, 'camera.demo_camera'),
+            camera.async_get_image(hass, 'camera.demo_camera'))
+        assert first.content == second.content == b'Image 1'
+
+        # Without a TTL every request fetches a new image
+        image = await camera.async_get_image(hass, 'camera.demo_camera')
+        assert image.content == b'Image 2'
+
+        await hass.data[DATA_CAMERA_PREFS].async_update(
+            'camera.demo_camera', snapshot_ttl=60)
+        image = await camera.async_get_image(hass, 'camera.demo_camera')
+        assert image.content == b'Image 3'
+        image = await camera.async_get_image(hass, 'camera.demo_camera')
+        assert image.content == b'Image 3'
+
+    assert len(calls) == 3
@@ -2,7 +2,7 @@
 import asyncio
 import json
 from ipaddress import ip_address
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from aiohttp.hdrs import CONTENT_TYPE
 import pytest
@@ -11,7 +11,7 @@ from tests.common import get_test_instance_port
 from homeassistant import const, setup
 from homeassistant.components import (
     fan, http, light, script, emulated_hue, media_player, cover, climate)
-from homeassistant.components.emulated_hue import Config
+from homeassistant.components.emulated_hue import Config, hue_api
 from homeassistant.components.emulated_hue.hue_api import (
     HUE_API_STATE_ON, HUE_API_STATE_BRI, HUE_API_STATE_HUE, HUE_API_STATE_SAT,
     HueUsernameView, HueOneLightStateView,
@@ -761,3 +761,46 @@ async def test_external_ip_blocked(hue_client):
         result = await hue_client.get('/api/username/lights')
 
     assert result.status == 400
+
+
+async def test_discover_lights_reuses_rendered_lights(hass):
+    """Test only the lights that changed are rendered again."""
+    config = Config(None, {emulated_hue.CONF_TYPE: emulated_hue.TYPE_ALEXA})
+    view = HueAllLightsStateView(config)
+    request = MagicMock(app={'hass': hass})
+    request.__getitem__.return_value = ip_address('127.0.0.1')
+
+    hass.states.async_set('light.first', STATE_ON, {'brightness': 100})
+    hass.states.async_set('light.second', STATE_ON, {'brightness': 100})
+
+    def discover():
+        """Return the lights by entity id."""
+        return {light['uniqueid']: light for light in json.loads(
+            view.get(request, 'username').body).values()}
+
+    with patch('homeassistant.components.emulated_hue.hue_api.'
+               'entity_to_json', wraps=hue_api.entity_to_json) as mock_json:
+        lights = discover()
+        assert mock_json.call_count == 2
+
+        # Unchanged lights reuse their JSON
+        assert discover() == lights
+        assert mock_json.call_count == 2
+
+        hass.states.async_set('light.second', STATE_OFF)
+        lights = discover()
+        assert mock_json.call_count == 3
+        assert mock_json.call_args[0][1].entity_id == 'light.second'
+        assert lights['light.second']['state'][HUE_API_STATE_ON] is False
+
+        # So does a change of the cached state of a light
+        config.cached_states['light.first'] = {
+            hue_api.STATE_ON: False,
+            hue_api.STATE_BRIGHTNESS: None,
+            hue_api.STATE_HUE: None,
+            hue_api.STATE_SATURATION: None,
+        }
+        lights = discover()
+        assert mock_json.call_count == 4
+        assert mock_json.call_args[0][1].entity_id == 'light.first'
+        assert lights['light.first']['state'][HUE_API_STATE_ON] is False
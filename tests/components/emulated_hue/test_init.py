@@ -1,115 +1,137 @@
 """Test the Emulated Hue component."""
-from unittest.mock import patch, Mock, MagicMock
+from datetime import timedelta
+from unittest.mock import patch
 
-from homeassistant.components.emulated_hue import Config
+from homeassistant.components.emulated_hue import (
+    Config, SAVE_DELAY, STORAGE_KEY, STORAGE_VERSION)
+import homeassistant.util.dt as dt_util
 
+from tests.common import async_fire_time_changed
 
-def test_config_google_home_entity_id_to_number():
+
+def _stored_numbers(hass_storage, numbers):
+    """Store the numbers of entities."""
+    hass_storage[STORAGE_KEY] = {
+        'version': STORAGE_VERSION,
+        'key': STORAGE_KEY,
+        'data': numbers,
+    }
+
+
+async def _async_save(hass):
+    """Make the delayed save happen."""
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=SAVE_DELAY))
+    await hass.async_block_till_done()
+
+
+async def test_config_google_home_entity_id_to_number(hass, hass_storage):
     """Test config adheres to the type."""
-    mock_hass = Mock()
-    mock_hass.config.path = MagicMock("path", return_value="test_path")
-    conf = Config(mock_hass, {
+    _stored_numbers(hass_storage, {'1': 'light.test2'})
+    conf = Config(hass, {
         'type': 'google_home'
     })
+    await conf.async_setup()
 
-    with patch('homeassistant.components.emulated_hue.load_json',
-               return_value={'1': 'light.test2'}) as json_loader:
-        with patch('homeassistant.components.emulated_hue'
-                   '.save_json') as json_saver:
-            number = conf.entity_id_to_number('light.test')
-            assert number == '2'
-
-            assert json_saver.mock_calls[0][1][1] == {
-                '1': 'light.test2', '2': 'light.test'
-            }
+    number = conf.entity_id_to_number('light.test')
+    assert number == '2'
 
-            assert json_saver.call_count == 1
-            assert json_loader.call_count == 1
+    await _async_save(hass)
+    assert hass_storage[STORAGE_KEY]['data'] == {
+        '1': 'light.test2', '2': 'light.test'
+    }
 
-            number = conf.entity_id_to_number('light.test')
-            assert number == '2'
-            assert json_saver.call_count == 1
+    number = conf.entity_id_to_number('light.test')
+    assert number == '2'
 
-            number = conf.entity_id_to_number('light.test2')
-            assert number == '1'
-            assert json_saver.call_count == 1
+    number = conf.entity_id_to_number('light.test2')
+    assert number == '1'
 
-            entity_id = conf.number_to_entity_id('1')
-            assert entity_id == 'light.test2'
+    entity_id = conf.number_to_entity_id('1')
+    assert entity_id == 'light.test2'
 
 
-def test_config_google_home_entity_id_to_number_altered():
+async def test_config_google_home_entity_id_to_number_altered(
+        hass, hass_storage):
     """Test config adheres to the type."""
-    mock_hass = Mock()
-    mock_hass.config.path = MagicMock("path", return_value="test_path")
-    conf = Config(mock_hass, {
+    _stored_numbers(hass_storage, {'21': 'light.test2'})
+    conf = Config(hass, {
         'type': 'google_home'
     })
+    await conf.async_setup()
 
-    with patch('homeassistant.components.emulated_hue.load_json',
-               return_value={'21': 'light.test2'}) as json_loader:
-        with patch('homeassistant.components.emulated_hue'
-                   '.save_json') as json_saver:
-            number = conf.entity_id_to_number('light.test')
-            assert number == '22'
-            assert json_saver.call_count == 1
-            assert json_loader.call_count == 1
+    number = conf.entity_id_to_number('light.test')
+    assert number == '22'
 
-            assert json_saver.mock_calls[0][1][1] == {
-                '21': 'light.test2',
-                '22': 'light.test',
-            }
+    await _async_save(hass)
+    assert hass_storage[STORAGE_KEY]['data'] == {
+        '21': 'light.test2',
+        '22': 'light.test',
+    }
 
-            number = conf.entity_id_to_number('light.test')
-            assert number == '22'
-            assert json_saver.call_count == 1
+    number = conf.entity_id_to_number('light.test')
+    assert number == '22'
 
-            number = conf.entity_id_to_number('light.test2')
-            assert number == '21'
-            assert json_saver.call_count == 1
+    number = conf.entity_id_to_number('light.test2')
+    assert number == '21'
 
-            entity_id = conf.number_to_entity_id('21')
-            assert entity_id == 'light.test2'
+    entity_id = conf.number_to_entity_id('21')
+    assert entity_id == 'light.test2'
 
 
-def test_config_google_home_entity_id_to_number_empty():
+async def test_config_google_home_entity_id_to_number_empty(
+        hass, hass_storage):
     """Test config adheres to the type."""
-    mock_hass = Mock()
-    mock_hass.config.path = MagicMock("path", return_value="test_path")
-    conf = Config(mock_hass, {
+    conf = Config(hass, {
         'type': 'google_home'
     })
+    await conf.async_setup()
+
+    number = conf.entity_id_to_number('light.test')
+    assert number == '1'
+
+    number = conf.entity_id_to_number('light.test')
+    assert number == '1'
 
-    with patch('homeassistant.components.emulated_hue.load_json',
-               return_value={}) as json_loader:
-        with patch('homeassistant.components.emulated_hue'
-                   '.save_json') as json_saver:
-            number = conf.entity_id_to_number('light.test')
-            assert number == '1'
-            assert json_saver.call_count == 1
-            assert json_loader.call_count == 1
+    number = conf.entity_id_to_number('light.test2')
+    assert number == '2'
+
+    # The numbers are saved once after the delay
+    assert STORAGE_KEY not in hass_storage
+    await _async_save(hass)
+    assert hass_storage[STORAGE_KEY]['data'] == {
+        '1': 'light.test',
+        '2': 'light.test2',
+    }
+
+    entity_id = conf.number_to_entity_id('2')
+    assert entity_id == 'light.test2'
 
-            assert json_saver.mock_calls[0][1][1] == {
-                '1': 'light.test',
-            }
 
-            number = conf.entity_id_to_number('light.test')
-            assert number == '1'
-            assert json_saver.call_count == 1
+async def test_config_google_home_migrate_numbers_file(hass, hass_storage):
+    """Test the numbers file is moved to storage."""
+    conf = Config(hass, {
+        'type': 'google_home'
+    })
 
-            number = conf.entity_id_to_number('light.test2')
-            assert number == '2'
-            assert json_saver.call_count == 2
+    with patch('os.path.isfile', return_value=True), \
+            patch('os.remove') as mock_remove, \
+            patch('homeassistant.components.emulated_hue.load_json',
+                  return_value={'5': 'light.test'}):
+        await conf.async_setup()
 
-            entity_id = conf.number_to_entity_id('2')
-            assert entity_id == 'light.test2'
+    assert mock_remove.call_count == 1
+    assert hass_storage[STORAGE_KEY]['data'] == {'5': 'light.test'}
+    assert conf.entity_id_to_number('light.test') == '5'
+    assert conf.entity_id_to_number('light.test2') == '6'
 
 
-def test_config_alexa_entity_id_to_number():
+async def test_config_alexa_entity_id_to_number(hass):
     """Test config adheres to the type."""
     conf = Config(None, {
         'type': 'alexa'
     })
+    await conf.async_setup()
 
     number = conf.entity_id_to_number('light.test')
     assert number == 'light.test'
@@ -763,3 +763,45 @@ async def test_trait_execute_adding_query_data(hass):
             }]
         }
     }
+
+
+async def test_entity_cache(hass):
+    """Test Google entities are only created again when they change."""
+    hass.states.async_set('light.ceiling', 'on')
+    hass.states.async_set('switch.fan', 'off')
+
+    entities = {entity.entity_id: entity for entity in
+                helpers.async_get_entities(hass, BASIC_CONFIG)}
+    light = entities['light.ceiling']
+    payload = await light.sync_serialize()
+    assert await light.sync_serialize() is payload
+
+    hass.states.async_set('switch.fan', 'on')
+    entities = {entity.entity_id: entity for entity in
+                helpers.async_get_entities(hass, BASIC_CONFIG)}
+    assert entities['light.ceiling'] is light
+    assert entities['switch.fan'].state.state == 'on'
+    assert helpers.async_get_entity(
+        hass, BASIC_CONFIG, hass.states.get('light.ceiling')) is light
+
+    # Room hints come from the registries
+    hass.bus.async_fire(device_registry.EVENT_DEVICE_REGISTRY_UPDATED)
+    await hass.async_block_till_done()
+    entities = {entity.entity_id: entity for entity in
+                helpers.async_get_entities(hass, BASIC_CONFIG)}
+    assert entities['light.ceiling'] is not light
+
+
+async def test_entity_cache_replaced_config(hass):
+    """Test the entities of a config are kept with it."""
+    hass.states.async_set('light.ceiling', 'on')
+    config = helpers.Config(should_expose=lambda state: True)
+    helpers.async_get_entities(hass, config)
+    assert config.entity_cache is not None
+    listeners = sum(hass.bus.async_listeners().values())
+
+    # A new config, as made on every cloud logout, adds no listeners
+    new_config = helpers.Config(should_expose=lambda state: True)
+    helpers.async_get_entities(hass, new_config)
+    assert new_config.entity_cache is not config.entity_cache
+    assert sum(hass.bus.async_listeners().values()) == listeners
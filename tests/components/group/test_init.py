@@ -6,6 +6,7 @@ import unittest
 from unittest.mock import patch
 
 from homeassistant.setup import setup_component, async_setup_component
+from homeassistant.helpers.event import TRACK_STATE_CHANGE_CALLBACKS
 from homeassistant.const import (
     STATE_ON, STATE_OFF, STATE_HOME, STATE_UNKNOWN, ATTR_ICON, ATTR_HIDDEN,
     ATTR_ASSUMED_STATE, STATE_NOT_HOME, ATTR_FRIENDLY_NAME)
@@ -192,6 +193,39 @@ class TestComponentsGroup(unittest.TestCase):
             sorted(group.expand_entity_ids(
                              self.hass, [test_group.entity_id]))
 
+    def test_expand_entity_ids_cycle(self):
+        """Test expand_entity_ids with groups that contain each other."""
+        self.hass.states.set('group.first', STATE_ON, {
+            'entity_id': ['light.bowl', 'group.second']})
+        self.hass.states.set('group.second', STATE_ON, {
+            'entity_id': ['light.ceiling', 'group.first']})
+
+        assert ['light.bowl', 'light.ceiling'] == \
+            group.expand_entity_ids(self.hass, ['group.first'])
+        assert ['light.ceiling', 'light.bowl'] == \
+            group.expand_entity_ids(self.hass, ['group.second'])
+
+    def test_expand_entity_ids_follows_nested_changes(self):
+        """Test cached expansions are updated when a nested group changes."""
+        self.hass.states.set('group.inner', STATE_ON, {
+            'entity_id': ['light.bowl']})
+        self.hass.states.set('group.outer', STATE_ON, {
+            'entity_id': ['group.inner', 'light.ceiling']})
+
+        assert ['light.bowl', 'light.ceiling'] == \
+            group.expand_entity_ids(self.hass, ['group.outer'])
+
+        self.hass.states.set('group.inner', STATE_ON, {
+            'entity_id': ['light.bowl', 'light.table']})
+
+        assert ['light.bowl', 'light.table', 'light.ceiling'] == \
+            group.expand_entity_ids(self.hass, ['group.outer'])
+
+        self.hass.states.remove('group.inner')
+
+        assert ['light.ceiling'] == \
+            group.expand_entity_ids(self.hass, ['group.outer'])
+
     def test_expand_entity_ids_ignores_non_strings(self):
         """Test that non string elements in lists are ignored."""
         assert [] == group.expand_entity_ids(self.hass, [5, True])
@@ -382,7 +416,7 @@ class TestComponentsGroup(unittest.TestCase):
         assert sorted(self.hass.states.entity_ids()) == \
             ['group.all_tests', 'group.empty_group', 'group.second_group',
              'group.test_group']
-        assert self.hass.bus.listeners['state_changed'] == 3
+        assert len(self.hass.data[TRACK_STATE_CHANGE_CALLBACKS]) == 5
 
         with patch('homeassistant.config.load_yaml_config_file', return_value={
             'group': {
@@ -398,7 +432,7 @@ class TestComponentsGroup(unittest.TestCase):
 
         assert sorted(self.hass.states.entity_ids()) == \
             ['group.all_tests', 'group.hello']
-        assert self.hass.bus.listeners['state_changed'] == 2
+        assert len(self.hass.data[TRACK_STATE_CHANGE_CALLBACKS]) == 3
 
     def test_changing_group_visibility(self):
         """Test that a group can be hidden and shown."""
@@ -1,6 +1,7 @@
 """The tests the History component."""
 # pylint: disable=protected-access,invalid-name
 from datetime import timedelta
+import json
 import unittest
 from unittest.mock import patch, sentinel
 
@@ -8,6 +9,8 @@ from homeassistant.setup import setup_component, async_setup_component
 import homeassistant.core as ha
 import homeassistant.util.dt as dt_util
 from homeassistant.components import history, recorder
+from homeassistant.components.recorder.statistics import compile_statistics
+from homeassistant.helpers.json import JSONEncoder
 
 from tests.common import (
     init_recorder_component, mock_state_change_event, get_test_home_assistant)
@@ -218,6 +221,50 @@ class TestComponentHistory(unittest.TestCase):
             include_start_time_state=False)
         assert states == hist
 
+    def test_stream_significant_states(self):
+        """Test streaming returns the significant states per entity."""
+        zero, four, _ = self.record_states()
+        one_and_half = zero + timedelta(seconds=1.5)
+
+        for start in (zero, one_and_half):
+            hist = history.get_significant_states(
+                self.hass, start, four, filters=history.Filters())
+            expected = json.loads(json.dumps(
+                [hist[entity_id] for entity_id in sorted(hist)],
+                cls=JSONEncoder))
+
+            chunks = []
+            with patch('homeassistant.components.history.STREAM_CHUNK_SIZE',
+                       10):
+                history.stream_significant_states(
+                    self.hass, chunks.append, start, four,
+                    filters=history.Filters())
+
+            assert len(chunks) > 1
+            assert json.loads(b''.join(chunks)) == expected
+
+    def test_stream_significant_states_entity_order(self):
+        """Test streaming respects the given entity order."""
+        zero, four, _ = self.record_states()
+        chunks = []
+        history.stream_significant_states(
+            self.hass, chunks.append, zero, four, filters=history.Filters(),
+            entity_order=['thermostat.test2', 'media_player.test'])
+
+        result = json.loads(b''.join(chunks))
+        assert [states[0]['entity_id'] for states in result] == [
+            'thermostat.test2', 'media_player.test', 'media_player.test2',
+            'script.can_cancel_this_one', 'thermostat.test']
+
+    def test_stream_significant_states_empty(self):
+        """Test streaming a period without states."""
+        self.init_recorder()
+        chunks = []
+        history.stream_significant_states(
+            self.hass, chunks.append, dt_util.utcnow(),
+            include_start_time_state=False)
+        assert b''.join(chunks) == b'[]'
+
     def test_get_significant_states_entity_id(self):
         """Test that only significant states are returned for one entity."""
         zero, four, states = self.record_states()
@@ -524,3 +571,51 @@ async def test_fetch_period_api(hass, hass_client):
     response = await client.get(
         '/api/history/period/{}'.format(dt_util.utcnow().isoformat()))
     assert response.status == 200
+
+
+async def test_fetch_period_api_stream(hass, hass_client):
+    """Test the fetch period view streaming the history."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, 'history', {})
+    hass.states.async_set('light.kitchen', 'on')
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+    client = await hass_client()
+    response = await client.get(
+        '/api/history/period/{}'.format(
+            (dt_util.utcnow() - timedelta(hours=1)).isoformat()),
+        params={'stream': ''})
+    assert response.status == 200
+    result = await response.json()
+    assert len(result) == 1
+    assert result[0][0]['entity_id'] == 'light.kitchen'
+
+
+async def test_fetch_statistics_api(hass, hass_client):
+    """Test the statistics view for history."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, 'history', {})
+    start = dt_util.utcnow().replace(
+        minute=0, second=0, microsecond=0) - timedelta(hours=1)
+    hass.states.async_set('sensor.temperature', '21',
+                          {'unit_of_measurement': '°C'})
+    await hass.async_block_till_done()
+    instance = hass.data[recorder.DATA_INSTANCE]
+    await hass.async_add_job(instance.block_till_done)
+
+    with patch('homeassistant.components.recorder.statistics.'
+               'STATISTICS_PERIOD', timedelta(hours=2)):
+        await hass.async_add_job(compile_statistics, instance, start)
+
+    client = await hass_client()
+    response = await client.get(
+        '/api/history/statistics/{}'.format(start.isoformat()),
+        params={'filter_entity_id': 'sensor.temperature'})
+    assert response.status == 200
+    result = await response.json()
+    assert len(result['sensor.temperature']) == 1
+    assert result['sensor.temperature'][0]['last'] == 21
+
+    response = await client.get(
+        '/api/history/statistics', params={'period': 'week'})
+    assert response.status == 400
@@ -142,6 +142,83 @@ class TestHistoryStatsSensor(unittest.TestCase):
         assert sensor3.state == 2
         assert sensor4.state == 50
 
+    def test_measure_incremental(self):
+        """Test the history is only read again when the start moves."""
+        now = dt_util.utcnow()
+        t0 = now - timedelta(minutes=40)
+        t1 = t0 + timedelta(minutes=20)
+        t2 = now - timedelta(minutes=10)
+        t3 = now - timedelta(minutes=5)
+
+        fake_states = {
+            'binary_sensor.test_id': [
+                ha.State('binary_sensor.test_id', 'on', last_changed=t0),
+                ha.State('binary_sensor.test_id', 'off', last_changed=t1),
+                ha.State('binary_sensor.test_id', 'on', last_changed=t2),
+            ]
+        }
+
+        start = Template(
+            '{{{{ {} }}}}'.format(now.timestamp() - 3600), self.hass)
+        end = Template('{{ now() }}', self.hass)
+
+        sensor = HistoryStatsSensor(
+            self.hass, 'binary_sensor.test_id', 'on', start, end, None,
+            'time', 'Test')
+
+        with patch('homeassistant.components.history.'
+                   'state_changes_during_period',
+                   return_value=fake_states) as changes_mock, \
+                patch('homeassistant.components.history.get_state',
+                      return_value=None):
+            sensor.update()
+            assert changes_mock.call_count == 1
+            assert sensor.state == 0.5
+
+            # Changes read from the database are not counted twice
+            sensor._async_add_change(
+                'binary_sensor.test_id', None,
+                fake_states['binary_sensor.test_id'][2])
+            # Attribute changes are ignored
+            sensor._async_add_change(
+                'binary_sensor.test_id',
+                ha.State('binary_sensor.test_id', 'on', last_changed=t2),
+                ha.State('binary_sensor.test_id', 'on', {'attr': 1},
+                         last_changed=t2))
+            sensor._async_add_change(
+                'binary_sensor.test_id',
+                ha.State('binary_sensor.test_id', 'on', last_changed=t2),
+                ha.State('binary_sensor.test_id', 'off', last_changed=t3))
+            sensor.update()
+            assert changes_mock.call_count == 1
+            assert sensor.state == round(25 / 60, 2)
+
+            sensor._start = Template(
+                '{{{{ {} }}}}'.format(now.timestamp() - 1800), self.hass)
+            sensor.update()
+            assert changes_mock.call_count == 2
+
+    def test_changes_dropped_without_history(self):
+        """Test changes are not kept while there is no history."""
+        now = dt_util.utcnow()
+        start = Template(
+            '{{{{ {} }}}}'.format(now.timestamp() - 3600), self.hass)
+        end = Template('{{ now() }}', self.hass)
+
+        sensor = HistoryStatsSensor(
+            self.hass, 'binary_sensor.test_id', 'on', start, end, None,
+            'time', 'Test')
+
+        with patch('homeassistant.components.history.'
+                   'state_changes_during_period', return_value={}):
+            for minutes in (30, 20, 10):
+                sensor._async_add_change(
+                    'binary_sensor.test_id', None,
+                    ha.State('binary_sensor.test_id', 'on',
+                             last_changed=now - timedelta(minutes=minutes)))
+                sensor.update()
+                assert not sensor._changes
+
     def test_wrong_date(self):
         """Test when start or end value is not a timestamp or a date."""
         good = Template('{{ now() }}', self.hass)
@@ -1,5 +1,6 @@
 """The tests for the Home Assistant HTTP component."""
 # pylint: disable=protected-access
+from datetime import timedelta
 from ipaddress import ip_address
 from unittest.mock import patch, mock_open, Mock
 
@@ -12,11 +13,14 @@ from homeassistant.components.http.view import request_handler_factory
 from homeassistant.setup import async_setup_component
 import homeassistant.components.http as http
 from homeassistant.components.http.ban import (
-    IpBan, IP_BANS_FILE, setup_bans, KEY_BANNED_IPS, KEY_FAILED_LOGIN_ATTEMPTS)
+    FailedLoginAttempts, IpBan, IpBans, IP_BANS_FILE, IP_BANS_SAVE_DELAY,
+    setup_bans, async_load_ip_bans_config, KEY_BANNED_IPS,
+    KEY_FAILED_LOGIN_ATTEMPTS)
+import homeassistant.util.dt as dt_util
 
 from . import mock_real_ip
 
-from tests.common import mock_coro
+from tests.common import async_fire_time_changed, mock_coro
 
 
 BANNED_IPS = ['200.201.202.203', '100.64.0.2']
@@ -90,11 +94,93 @@ async def test_ip_bans_file_creation(hass, aiohttp_client):
         resp = await client.get('/')
         assert resp.status == 401
         assert len(app[KEY_BANNED_IPS]) == len(BANNED_IPS) + 1
-        m.assert_called_once_with(hass.config.path(IP_BANS_FILE), 'a')
+        assert m.call_count == 0
 
         resp = await client.get('/')
         assert resp.status == 403
-        assert m.call_count == 1
+
+        # New bans are written in batches
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=IP_BANS_SAVE_DELAY))
+        await hass.async_block_till_done()
+        m.assert_called_once_with(hass.config.path(IP_BANS_FILE), 'a')
+        assert '200.201.202.204' in ''.join(
+            call[1][0] for call in m().write.mock_calls)
+
+
+async def test_banned_networks():
+    """Test looking up banned addresses and networks."""
+    bans = IpBans([IpBan('10.0.0.0/8'), IpBan('2001:db8::/32'),
+                   IpBan('192.168.1.10')])
+
+    assert len(bans) == 3
+    assert ip_address('10.20.30.40') in bans
+    assert ip_address('11.0.0.1') not in bans
+    assert ip_address('192.168.1.10') in bans
+    assert ip_address('192.168.1.11') not in bans
+    assert ip_address('2001:db8::1') in bans
+    assert ip_address('2001:db9::1') not in bans
+    assert [str(ban) for ban in bans] == [
+        '10.0.0.0/8', '2001:db8::/32', '192.168.1.10']
+
+
+async def test_load_ip_bans_config(hass):
+    """Test loading networks with host bits and skipping invalid bans."""
+    with patch('homeassistant.components.http.ban.load_yaml_config_file',
+               return_value={
+                   '10.0.0.1/24': {'banned_at': '2016-11-16T19:20:03'},
+                   'not an address': {'banned_at': '2016-11-16T19:20:03'},
+                   '192.168.1.10': {'banned_at': '2016-11-16T19:20:03'},
+               }):
+        ip_bans = await async_load_ip_bans_config(hass, 'ip_bans.yaml')
+
+    assert [str(ban) for ban in ip_bans] == ['10.0.0.0/24', '192.168.1.10']
+
+
+async def test_failed_login_attempts_window():
+    """Test failed login attempts expire after the window."""
+    attempts = FailedLoginAttempts(timedelta(minutes=1))
+    first = ip_address('200.201.202.204')
+    second = ip_address('200.201.202.205')
+
+    with patch('homeassistant.components.http.ban.monotonic',
+               return_value=100):
+        assert attempts.async_add(first) == 1
+        assert attempts.async_add(first) == 2
+
+    with patch('homeassistant.components.http.ban.monotonic',
+               return_value=130):
+        assert attempts.async_add(second) == 1
+        assert attempts[first] == 2
+
+    with patch('homeassistant.components.http.ban.monotonic',
+               return_value=170):
+        assert attempts[first] == 0
+        assert first not in attempts
+        assert attempts.async_add(second) == 2
+        assert first not in attempts._attempts
+
+    attempts.async_reset(second)
+    assert second not in attempts
+
+
+async def test_failed_login_attempts_expire_in_order():
+    """Test addresses are expired by their latest attempt."""
+    attempts = FailedLoginAttempts(timedelta(minutes=1))
+    first = ip_address('200.201.202.204')
+    second = ip_address('200.201.202.205')
+    third = ip_address('200.201.202.206')
+
+    for now, address in ((100, first), (130, second), (140, first)):
+        with patch('homeassistant.components.http.ban.monotonic',
+                   return_value=now):
+            attempts.async_add(address)
+
+    with patch('homeassistant.components.http.ban.monotonic',
+               return_value=195):
+        assert attempts.async_add(third) == 1
+
+    assert list(attempts._attempts) == [first, third]
 
 
 async def test_failed_login_attempts_counter(hass, aiohttp_client):
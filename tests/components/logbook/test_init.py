@@ -2,6 +2,8 @@
 # pylint: disable=protected-access,invalid-name
 import logging
 from datetime import (timedelta, datetime)
+import json
+from unittest.mock import patch
 import unittest
 
 import pytest
@@ -852,3 +854,92 @@ async def test_humanify_script_started_event(hass):
     assert event2['domain'] == 'script'
     assert event2['message'] == 'started'
     assert event2['entity_id'] == 'script.bye'
+
+
+async def _async_add_entries(hass, start):
+    """Add switch changes to the logbook, one every ten minutes."""
+    await hass.async_add_job(init_recorder_component, hass)
+    await async_setup_component(hass, 'logbook', {})
+
+    for idx in range(6):
+        point = start + timedelta(minutes=10 * idx)
+        with patch('homeassistant.core.dt_util.utcnow', return_value=point):
+            hass.states.async_set(
+                'switch.test', STATE_ON if idx % 2 else STATE_OFF)
+            await hass.async_block_till_done()
+
+    # Removing an entity does not show up in the logbook
+    hass.states.async_remove('switch.test')
+    await hass.async_block_till_done()
+    await hass.async_add_job(hass.data[recorder.DATA_INSTANCE].block_till_done)
+
+
+async def test_get_events_page(hass):
+    """Test the logbook is paged between grouped batches."""
+    start = dt_util.utcnow().replace(
+        minute=0, second=0, microsecond=0) - timedelta(hours=2)
+    end = start + timedelta(hours=1)
+    await _async_add_entries(hass, start)
+
+    entries, cursor = await hass.async_add_job(
+        logbook._get_events_page, hass, {}, start, end, None, None, 1)
+    # The page is extended to the end of the first 15 minute batch
+    assert [entry['when'] for entry in entries] == \
+        [start + timedelta(minutes=10)]
+    assert cursor == start + timedelta(minutes=20)
+
+    entries, cursor = await hass.async_add_job(
+        logbook._get_events_page, hass, {}, start, end, None, cursor, 3)
+    assert [entry['when'] for entry in entries] == [
+        start + timedelta(minutes=20), start + timedelta(minutes=30),
+        start + timedelta(minutes=40)]
+    assert cursor == start + timedelta(minutes=50)
+
+    entries, cursor = await hass.async_add_job(
+        logbook._get_events_page, hass, {}, start, end, None, cursor, 3)
+    assert [entry['when'] for entry in entries] == \
+        [start + timedelta(minutes=50)]
+    assert cursor is None
+
+    entries = await hass.async_add_job(
+        logbook._get_events, hass, {}, start, end)
+    assert len(entries) == 5
+
+
+async def test_get_events_entity_filter(hass):
+    """Test the entity filter of the logbook is applied by the database."""
+    start = dt_util.utcnow().replace(
+        minute=0, second=0, microsecond=0) - timedelta(hours=2)
+    end = start + timedelta(hours=1)
+    await _async_add_entries(hass, start)
+
+    config = logbook.CONFIG_SCHEMA({logbook.DOMAIN: {
+        logbook.CONF_EXCLUDE: {logbook.CONF_DOMAINS: ['switch']}}})
+    entries = await hass.async_add_job(
+        logbook._get_events, hass, config[logbook.DOMAIN], start, end)
+    assert entries == []
+
+    entries = await hass.async_add_job(
+        logbook._get_events, hass, {}, start, end, 'switch.other')
+    assert entries == []
+
+
+async def test_stream_events(hass):
+    """Test streaming the logbook as JSON."""
+    start = dt_util.utcnow().replace(
+        minute=0, second=0, microsecond=0) - timedelta(hours=2)
+    end = start + timedelta(hours=1)
+    await _async_add_entries(hass, start)
+
+    chunks = []
+    await hass.async_add_job(
+        logbook.stream_events, hass, chunks.append, {}, start, end)
+    result = json.loads(b''.join(chunks).decode())
+    assert len(result) == 5
+    assert result[0]['entity_id'] == 'switch.test'
+    assert result[0]['message'] == 'turned on'
+
+    chunks.clear()
+    await hass.async_add_job(
+        logbook.stream_events, hass, chunks.append, {}, end, end)
+    assert json.loads(b''.join(chunks).decode()) == []
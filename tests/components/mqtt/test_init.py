@@ -436,6 +436,34 @@ class TestMQTTCallbacks(unittest.TestCase):
         self.hass.block_till_done()
         assert len(self.calls) == 0
 
+    def test_subscribe_overlapping_wildcard_topics(self):
+        """Test all matching subscriptions receive the message."""
+        mqtt.subscribe(self.hass, 'test-topic/#', self.record_calls)
+        mqtt.subscribe(self.hass, 'test-topic/+/state', self.record_calls)
+        mqtt.subscribe(self.hass, 'test-topic/bier/state', self.record_calls)
+        mqtt.subscribe(self.hass, 'test-topic/bier', self.record_calls)
+
+        fire_mqtt_message(self.hass, 'test-topic/bier/state', 'test-payload')
+
+        self.hass.block_till_done()
+        assert len(self.calls) == 3
+        assert all(call[0].topic == 'test-topic/bier/state'
+                   for call in self.calls)
+
+    def test_unsubscribe_keeps_other_subscriptions_on_topic(self):
+        """Test unsubscribing keeps other subscriptions on the same topic."""
+        unsub = mqtt.subscribe(self.hass, 'test-topic/+', self.record_calls)
+        mqtt.subscribe(self.hass, 'test-topic/+', self.record_calls)
+        unsub_other = mqtt.subscribe(
+            self.hass, 'test-topic/#', self.record_calls)
+
+        unsub()
+        unsub_other()
+        fire_mqtt_message(self.hass, 'test-topic/bier', 'test-payload')
+
+        self.hass.block_till_done()
+        assert len(self.calls) == 1
+
     def test_subscribe_topic_sys_root(self):
         """Test the subscription of $ root topics."""
         mqtt.subscribe(self.hass, '$test-topic/subtree/on', self.record_calls)
@@ -7,10 +7,12 @@ import pytest
 
 from homeassistant.core import callback
 from homeassistant.const import MATCH_ALL
+from homeassistant.setup import async_setup_component
 from homeassistant.components.recorder import Recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.components.recorder.models import States, Events
+from homeassistant.components.recorder.models import (
+    States, StateAttributes, Events)
 
 from tests.common import get_test_home_assistant, init_recorder_component
 
@@ -189,6 +191,87 @@ def test_saving_state_include_domain_exclude_entity(hass_recorder):
     assert hass.states.get('test.ok').state == 'state2'
 
 
+def test_saving_states_in_batches(hass_recorder):
+    """Test states are committed in batches bounded by count."""
+    hass = hass_recorder({'commit_interval': 0, 'commit_max_events': 100})
+    instance = hass.data[DATA_INSTANCE]
+    assert instance.commit_max_events == 100
+
+    instance.commit_interval = 60
+    instance.commit_max_events = 3
+    for idx in range(3):
+        hass.states.set('test.recorder', 'state{}'.format(idx))
+    hass.block_till_done()
+    instance.block_till_done()
+
+    assert instance.last_commit_events == 3
+    assert instance.last_commit_duration is not None
+    assert instance.backlog == 0
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States))
+        assert [state.state for state in db_states] == \
+            ['state0', 'state1', 'state2']
+        assert len({state.event_id for state in db_states}) == 3
+        assert all(state.event_id > 0 for state in db_states)
+
+
+def test_saving_state_shares_attributes(hass_recorder):
+    """Test identical attributes are stored once."""
+    hass = hass_recorder()
+    attributes = {'test_attr': 5, 'test_attr_10': 'nice'}
+
+    hass.states.set('test.recorder', 'on', attributes)
+    hass.states.set('test.recorder', 'off', attributes)
+    hass.states.set('test2.recorder', 'on', attributes)
+    hass.states.set('test2.recorder', 'off', {'test_attr': 6})
+    hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States))
+        assert len(db_states) == 4
+        assert all(db_state.attributes is None for db_state in db_states)
+        assert len({db_state.attributes_id for db_state in db_states}) == 2
+        assert session.query(StateAttributes).count() == 2
+        native = [db_state.to_native() for db_state in db_states]
+
+    assert native[0].attributes == attributes
+    assert native[3].attributes == {'test_attr': 6}
+    assert native[3] == hass.states.get('test2.recorder')
+
+
+def test_saving_batch_falls_back_to_single_events(hass_recorder):
+    """Test a failing batch is saved event by event."""
+    from sqlalchemy.exc import SQLAlchemyError
+
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    instance.commit_interval = 60
+    instance.commit_max_events = 3
+    get_state_attributes_id = instance._get_state_attributes_id
+
+    def failing_attributes_id(session, shared_attrs):
+        """Fail to store the attributes of one state."""
+        if 'broken' in shared_attrs:
+            raise SQLAlchemyError('broken')
+        return get_state_attributes_id(session, shared_attrs)
+
+    with patch.object(instance, '_get_state_attributes_id',
+                      side_effect=failing_attributes_id):
+        hass.states.set('test.recorder', 'state0')
+        hass.states.set('test.recorder', 'state1', {'broken': True})
+        hass.states.set('test.recorder', 'state2')
+        hass.block_till_done()
+        instance.block_till_done()
+
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States))
+        assert [state.state for state in db_states] == ['state0', 'state2']
+        assert session.query(Events).filter_by(
+            event_type='state_changed').count() == 2
+
+
 def test_recorder_setup_failure():
     """Test some exceptions."""
     hass = get_test_home_assistant()
@@ -202,3 +285,35 @@ def test_recorder_setup_failure():
         rec.join()
 
     hass.stop()
+
+
+async def test_websocket_info(hass, hass_ws_client):
+    """Test the queue and commit metrics are reported."""
+    with patch('homeassistant.components.recorder.migration.migrate_schema'):
+        assert await async_setup_component(hass, 'recorder', {
+            'recorder': {
+                'db_url': 'sqlite://',
+                'commit_interval': 0,
+                'commit_max_events': 2,
+            }
+        })
+    instance = hass.data[DATA_INSTANCE]
+
+    hass.states.async_set('test.recorder', 'on')
+    hass.states.async_set('test.recorder', 'off')
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(instance.block_till_done)
+
+    client = await hass_ws_client(hass)
+    await client.send_json({'id': 5, 'type': 'recorder/info'})
+    msg = await client.receive_json()
+
+    assert msg['success']
+    info = msg['result']
+    assert info['backlog'] == 0
+    assert info['commit_interval'] == 0
+    assert info['commit_max_events'] == 2
+    # Without a commit interval every event is committed on its own
+    assert info['last_commit_events'] == 1
+    assert info['last_commit_duration'] >= 0
+    assert info['max_commit_duration'] >= info['last_commit_duration']
@@ -0,0 +1,132 @@
+"""The tests for the recorder statistics."""
+# pylint: disable=protected-access
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder.const import DATA_INSTANCE
+from homeassistant.components.recorder.models import Statistics
+from homeassistant.components.recorder.statistics import (
+    PERIOD_DAY, compile_statistics, statistics_during_period)
+from homeassistant.components.recorder.util import session_scope
+import homeassistant.util.dt as dt_util
+
+from tests.common import get_test_home_assistant, init_recorder_component
+
+ATTRIBUTES = {'unit_of_measurement': '°C'}
+
+
+@pytest.fixture
+def hass_recorder():
+    """HASS fixture with in-memory recorder."""
+    hass = get_test_home_assistant()
+
+    def setup_recorder(config=None):
+        """Set up with params."""
+        init_recorder_component(hass, config)
+        hass.start()
+        hass.block_till_done()
+        hass.data[DATA_INSTANCE].block_till_done()
+        return hass
+
+    yield setup_recorder
+    hass.stop()
+
+
+def _set_state(hass, point, entity_id, state, attributes=ATTRIBUTES):
+    """Set a state as if it changed at point."""
+    with patch('homeassistant.components.recorder.dt_util.utcnow',
+               return_value=point):
+        hass.states.set(entity_id, state, attributes)
+        hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+
+def test_compile_statistics(hass_recorder):
+    """Test compiling the statistics of an hour."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+    start = dt_util.utcnow().replace(
+        minute=0, second=0, microsecond=0) - timedelta(hours=3)
+
+    _set_state(hass, start, 'sensor.temperature', '10')
+    _set_state(hass, start + timedelta(minutes=15), 'sensor.temperature',
+               '20')
+    _set_state(hass, start + timedelta(minutes=30), 'sensor.temperature',
+               'unknown')
+    _set_state(hass, start + timedelta(minutes=45), 'sensor.temperature',
+               '14')
+    _set_state(hass, start, 'sensor.no_unit', '10', {})
+    _set_state(hass, start, 'light.kitchen', 'on')
+
+    compile_statistics(instance, start)
+    # Compiling the same hour again does not duplicate the statistics
+    compile_statistics(instance, start)
+
+    stats = statistics_during_period(hass, start)
+    assert list(stats) == ['sensor.temperature']
+    assert stats['sensor.temperature'] == [{
+        'statistic_id': 'sensor.temperature',
+        'start': start,
+        'mean': pytest.approx((10 * 15 + 20 * 30 + 14 * 15) / 60),
+        'min': 10,
+        'max': 20,
+        'last': 14,
+    }]
+
+    # Unchanged sensors keep the last value of the previous hour
+    compile_statistics(instance, start + timedelta(hours=1))
+    stats = statistics_during_period(
+        hass, start + timedelta(hours=1), statistic_ids=['sensor.temperature'])
+    assert len(stats['sensor.temperature']) == 1
+    stat = stats['sensor.temperature'][0]
+    assert (stat['mean'], stat['min'], stat['max'], stat['last']) == \
+        (14, 14, 14, 14)
+
+    # Removed sensors are not carried over
+    hass.states.remove('sensor.temperature')
+    hass.block_till_done()
+    compile_statistics(instance, start + timedelta(hours=2))
+    assert statistics_during_period(hass, start + timedelta(hours=2)) == {}
+
+
+def test_statistics_during_period_per_day(hass_recorder):
+    """Test hourly statistics are combined per day."""
+    hass = hass_recorder()
+    start = dt_util.as_utc(dt_util.start_of_local_day(
+        dt_util.now() - timedelta(days=2)))
+
+    with session_scope(hass=hass) as session:
+        for hour, value in enumerate([10, 20, 30]):
+            session.add(Statistics(
+                statistic_id='sensor.temperature',
+                start=start + timedelta(hours=hour), mean=value,
+                min=value - 1, max=value + 1, last=value))
+
+    stats = statistics_during_period(hass, start, period=PERIOD_DAY)
+    assert stats['sensor.temperature'] == [{
+        'statistic_id': 'sensor.temperature',
+        'start': start,
+        'mean': 20,
+        'min': 9,
+        'max': 31,
+        'last': 30,
+    }]
+
+
+def test_compile_statistics_task(hass_recorder):
+    """Test the recorder compiles statistics from its queue."""
+    hass = hass_recorder()
+    instance = hass.data[DATA_INSTANCE]
+
+    with patch('homeassistant.components.recorder.statistics.'
+               'compile_statistics') as compile_mock:
+        now = dt_util.utcnow().replace(minute=5, second=0, microsecond=0)
+        hass.bus.fire('time_changed', {'now': now})
+        hass.block_till_done()
+        instance.block_till_done()
+
+    assert compile_mock.call_count == 1
+    assert compile_mock.call_args[0][1] == \
+        now.replace(minute=0) - timedelta(hours=1)
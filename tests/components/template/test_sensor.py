@@ -1,5 +1,8 @@
 """The test for the Template sensor platform."""
+from unittest.mock import patch
+
 from homeassistant.const import EVENT_HOMEASSISTANT_START
+from homeassistant.helpers.template import Template
 from homeassistant.setup import setup_component, async_setup_component
 
 from tests.common import get_test_home_assistant, assert_setup_component
@@ -316,80 +319,97 @@ class TestTemplateSensor:
 
 
 async def test_no_template_match_all(hass, caplog):
-    """Test that we do not allow sensors that match on all."""
+    """Test sensors follow the states their templates read."""
     hass.states.async_set('sensor.test_sensor', 'startup')
 
     await async_setup_component(hass, 'sensor', {
         'sensor': {
             'platform': 'template',
             'sensors': {
-                'invalid_state': {
+                'constant': {
                     'value_template': '{{ 1 + 1 }}',
                 },
-                'invalid_icon': {
+                'constant_icon': {
                     'value_template':
                         '{{ states.sensor.test_sensor.state }}',
                     'icon_template': '{{ 1 + 1 }}',
                 },
-                'invalid_entity_picture': {
-                    'value_template':
-                        '{{ states.sensor.test_sensor.state }}',
-                    'entity_picture_template': '{{ 1 + 1 }}',
+                'sensor_count': {
+                    'value_template': '{{ states.sensor | list | count }}',
                 },
-                'invalid_friendly_name': {
+                'sensor_states': {
                     'value_template':
-                        '{{ states.sensor.test_sensor.state }}',
-                    'friendly_name_template': '{{ 1 + 1 }}',
+                        "{{ states.sensor | selectattr('state', 'eq', 'on')"
+                        " | map(attribute='entity_id') | join(',') }}",
                 },
             }
         }
     })
     await hass.async_block_till_done()
     assert len(hass.states.async_all()) == 5
-    assert ('Template sensor invalid_state has no entity ids '
-            'configured to track nor were we able to extract the entities to '
-            'track from the value template') in caplog.text
-    assert ('Template sensor invalid_icon has no entity ids '
-            'configured to track nor were we able to extract the entities to '
-            'track from the icon template') in caplog.text
-    assert ('Template sensor invalid_entity_picture has no entity ids '
-            'configured to track nor were we able to extract the entities to '
-            'track from the entity_picture template') in caplog.text
-    assert ('Template sensor invalid_friendly_name has no entity ids '
-            'configured to track nor were we able to extract the entities to '
-            'track from the friendly_name template') in caplog.text
-
-    assert hass.states.get('sensor.invalid_state').state == 'unknown'
-    assert hass.states.get('sensor.invalid_icon').state == 'unknown'
-    assert hass.states.get('sensor.invalid_entity_picture').state == 'unknown'
-    assert hass.states.get('sensor.invalid_friendly_name').state == 'unknown'
+    assert 'has no entity ids configured to track' not in caplog.text
 
     hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
     await hass.async_block_till_done()
 
-    assert hass.states.get('sensor.invalid_state').state == '2'
-    assert hass.states.get('sensor.invalid_icon').state == 'startup'
-    assert hass.states.get('sensor.invalid_entity_picture').state == 'startup'
-    assert hass.states.get('sensor.invalid_friendly_name').state == 'startup'
+    assert ('Template sensor sensor.constant has no entity ids configured '
+            'to track and its state template(s) read no states') in caplog.text
+    assert ('Template sensor sensor.constant_icon has no entity ids '
+            'configured to track and its icon template(s) read no states'
+            ) in caplog.text
+    assert 'Template sensor sensor.sensor_count' not in caplog.text
+
+    assert hass.states.get('sensor.constant').state == '2'
+    assert hass.states.get('sensor.constant_icon').state == 'startup'
+    assert hass.states.get('sensor.sensor_count').state == '5'
+    assert hass.states.get('sensor.sensor_states').state == ''
 
     hass.states.async_set('sensor.test_sensor', 'hello')
     await hass.async_block_till_done()
 
-    assert hass.states.get('sensor.invalid_state').state == '2'
-    assert hass.states.get('sensor.invalid_icon').state == 'startup'
-    assert hass.states.get('sensor.invalid_entity_picture').state == 'startup'
-    assert hass.states.get('sensor.invalid_friendly_name').state == 'startup'
-
-    await hass.helpers.entity_component.async_update_entity(
-        'sensor.invalid_state')
-    await hass.helpers.entity_component.async_update_entity(
-        'sensor.invalid_icon')
-    await hass.helpers.entity_component.async_update_entity(
-        'sensor.invalid_entity_picture')
-    await hass.helpers.entity_component.async_update_entity(
-        'sensor.invalid_friendly_name')
-
-    assert hass.states.get('sensor.invalid_state').state == '2'
-    assert hass.states.get('sensor.invalid_icon').state == 'hello'
-    assert hass.states.get('sensor.invalid_entity_picture').state == 'hello'
-    assert hass.states.get('sensor.invalid_friendly_name').state == 'hello'
+    assert hass.states.get('sensor.constant').state == '2'
+    assert hass.states.get('sensor.constant_icon').state == 'hello'
+    assert hass.states.get('sensor.sensor_count').state == '5'
+    assert hass.states.get('sensor.sensor_states').state == ''
+
+    hass.states.async_set('sensor.new_sensor', 'on')
+    await hass.async_block_till_done()
+
+    assert hass.states.get('sensor.sensor_count').state == '6'
+    assert hass.states.get('sensor.sensor_states').state == 'sensor.new_sensor'
+
+
+async def test_template_rendered_once_per_change(hass):
+    """Test a change renders each template that read it once."""
+    await async_setup_component(hass, 'sensor', {
+        'sensor': {
+            'platform': 'template',
+            'sensors': {
+                'test_template_sensor': {
+                    'value_template': '{{ states.sensor.test_state.state }}',
+                    'icon_template':
+                        "{% if is_state('sensor.test_state', 'on') %}"
+                        "mdi:check{% endif %}",
+                }
+            }
+        }
+    })
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_START)
+    await hass.async_block_till_done()
+
+    renders = []
+    async_render = Template.async_render
+
+    def count_render(template, *args, **kwargs):
+        """Count the renders."""
+        renders.append(template.template)
+        return async_render(template, *args, **kwargs)
+
+    with patch.object(Template, 'async_render', count_render):
+        hass.states.async_set('sensor.test_state', 'on')
+        await hass.async_block_till_done()
+
+    assert len(renders) == 2
+    state = hass.states.get('sensor.test_template_sensor')
+    assert state.state == 'on'
+    assert state.attributes['icon'] == 'mdi:check'
@@ -1,14 +1,20 @@
 """Tests for WebSocket API commands."""
+from datetime import timedelta
+import json
+from unittest.mock import Mock, patch
+
 from async_timeout import timeout
 
-from homeassistant.core import callback
+from homeassistant.core import State, callback
 from homeassistant.components.websocket_api.const import URL
 from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH, TYPE_AUTH_OK, TYPE_AUTH_REQUIRED
 )
-from homeassistant.components.websocket_api import const
+from homeassistant.components.websocket_api import const, subscriptions
+from homeassistant.components.websocket_api.messages import state_diff
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
 
 from tests.common import async_mock_service
 
@@ -430,3 +436,141 @@ async def test_subscribe_unsubscribe_events_state_changed(
     assert msg['type'] == 'event'
     assert msg['event']['event_type'] == 'state_changed'
     assert msg['event']['data']['entity_id'] == 'light.permitted'
+
+
+async def test_subscribe_events_shared(hass):
+    """Test subscriptions share a listener and serialize events once."""
+    init_count = sum(hass.bus.async_listeners().values())
+    connections = [Mock(), Mock()]
+    connections[1].user.permissions.check_entity.return_value = False
+    unsubs = [
+        subscriptions.async_subscribe_events(
+            hass, connection, iden, 'state_changed')
+        for iden, connection in enumerate(connections, 5)]
+
+    assert hass.bus.async_listeners()['state_changed'] == 1
+
+    with patch.object(const, 'JSON_DUMP', wraps=const.JSON_DUMP) as dump:
+        hass.states.async_set('light.kitchen', 'on')
+        await hass.async_block_till_done()
+
+    assert dump.call_count == 1
+    assert len(connections[1].send_message.mock_calls) == 0
+    msg = json.loads(connections[0].send_message.mock_calls[0][1][0])
+    assert msg['id'] == 5
+    assert msg['type'] == 'event'
+    assert msg['event']['data']['entity_id'] == 'light.kitchen'
+    assert msg['event']['data']['new_state']['state'] == 'on'
+
+    for unsub in unsubs:
+        unsub()
+
+    assert sum(hass.bus.async_listeners().values()) == init_count
+
+
+async def test_subscribe_entities(hass, websocket_client, hass_admin_user):
+    """Test subscribing to the changes of entities."""
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy({
+        'entities': {
+            'domains': {
+                'light': True,
+            },
+            'entity_ids': {
+                'switch.permitted': True,
+            }
+        }
+    })
+    hass.states.async_set('light.kitchen', 'on', {'brightness': 100})
+    hass.states.async_set('light.hidden', 'on')
+    hass.states.async_set('switch.permitted', 'off')
+    hass.states.async_set('switch.not_permitted', 'off')
+    hass.states.async_set('sensor.other', '12')
+
+    await websocket_client.send_json({
+        'id': 5,
+        'type': 'subscribe_entities',
+        'entity_ids': ['light.kitchen', 'switch.not_permitted'],
+        'domains': ['switch'],
+    })
+
+    msg = await websocket_client.receive_json()
+    assert msg['id'] == 5
+    assert msg['success']
+
+    msg = await websocket_client.receive_json()
+    assert msg['id'] == 5
+    assert msg['type'] == 'event'
+    state = hass.states.get('light.kitchen')
+    assert msg['event'] == {'a': {
+        'light.kitchen': {
+            's': 'on',
+            'a': {'brightness': 100},
+            'lc': state.last_changed.timestamp(),
+        },
+        'switch.permitted': {
+            's': 'off',
+            'a': {},
+            'lc':
+                hass.states.get('switch.permitted').last_changed.timestamp(),
+        },
+    }}
+
+    hass.states.async_set('light.hidden', 'off')
+    hass.states.async_set('sensor.other', '13')
+    hass.states.async_set('switch.not_permitted', 'on')
+    hass.states.async_set('light.kitchen', 'on', {'color_temp': 300})
+
+    with timeout(3):
+        msg = await websocket_client.receive_json()
+    state = hass.states.get('light.kitchen')
+    assert msg['event'] == {'c': {
+        'light.kitchen': {
+            '+': {
+                'a': {'color_temp': 300},
+                'lu': state.last_updated.timestamp(),
+            },
+            '-': {'a': ['brightness']},
+        },
+    }}
+
+    hass.states.async_remove('switch.permitted')
+
+    with timeout(3):
+        msg = await websocket_client.receive_json()
+    assert msg['event'] == {'r': ['switch.permitted']}
+
+    hass.states.async_set('switch.permitted', 'on')
+
+    with timeout(3):
+        msg = await websocket_client.receive_json()
+    assert msg['event']['a']['switch.permitted']['s'] == 'on'
+
+
+def test_state_diff_last_updated():
+    """Test last updated is sent whenever it changes."""
+    now = dt_util.utcnow()
+    first = State('light.kitchen', 'on', {}, now, now)
+    # Only last updated changes
+    second = State('light.kitchen', 'on', {'brightness': 100}, now,
+                   now + timedelta(seconds=1))
+    # Last changed changes and last updated equals it
+    third = State('light.kitchen', 'off', {'brightness': 100},
+                  now + timedelta(seconds=2), now + timedelta(seconds=2))
+    fourth = State('light.kitchen', 'on', {'brightness': 100},
+                   now + timedelta(seconds=3), now + timedelta(seconds=3))
+
+    assert state_diff(first, second) == {'+': {
+        'a': {'brightness': 100},
+        'lu': second.last_updated.timestamp(),
+    }}
+    assert state_diff(second, third) == {'+': {
+        's': 'off',
+        'lc': third.last_changed.timestamp(),
+        'lu': third.last_updated.timestamp(),
+    }}
+    assert state_diff(third, fourth) == {'+': {
+        's': 'on',
+        'lc': fourth.last_changed.timestamp(),
+        'lu': fourth.last_updated.timestamp(),
+    }}
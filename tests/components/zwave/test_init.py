@@ -600,6 +600,32 @@ class TestZWaveDeviceEntityValues(unittest.TestCase):
         """Stop everything that was started."""
         self.hass.stop()
 
+    @patch.object(zwave, 'import_module')
+    @patch.object(zwave, 'discovery')
+    def test_entity_index_keys(self, discovery, import_module):
+        """Test the keys of the values an entity can track."""
+        discovery.async_load_platform.return_value = mock_coro()
+        self.mock_schema[const.DISC_VALUES]['any'] = {
+            const.DISC_OPTIONAL: True,
+        }
+        values = zwave.ZWaveDeviceEntityValues(
+            hass=self.hass,
+            schema=self.mock_schema,
+            primary_value=self.primary,
+            zwave_config=self.zwave_config,
+            device_config=self.device_config,
+            registry=self.registry
+        )
+
+        node_id = self.node.node_id
+        instance = self.primary.instance
+        assert values.index_keys() == {
+            (node_id, 'mock_primary_class', instance),
+            (node_id, 'mock_secondary_class', instance),
+            (node_id, 'mock_optional_class', instance),
+            (node_id, None, instance),
+        }
+
     @patch.object(zwave, 'import_module')
     @patch.object(zwave, 'discovery')
     def test_entity_discovery(self, discovery, import_module):
@@ -433,3 +433,30 @@ async def test_loading_race_condition(hass):
 
         mock_load.assert_called_once_with()
         assert results[0] == results[1]
+
+
+async def test_indexes_follow_updates(registry):
+    """Test the lookups stay consistent when devices change."""
+    entry = registry.async_get_or_create(
+        config_entry_id='1234',
+        connections={
+            (device_registry.CONNECTION_NETWORK_MAC, '12:34:56:AB:CD:EF')
+        },
+        identifiers={('hue', '456')})
+
+    registry.async_update_device(
+        entry.id, area_id='kitchen', new_identifiers={('hue', '654')})
+
+    assert registry.async_get_device({('hue', '456')}, set()) is None
+    assert registry.async_get_device({('hue', '654')}, set()).id == entry.id
+    assert registry.async_get_device(set(), {
+        (device_registry.CONNECTION_NETWORK_MAC, '12:34:56:ab:cd:ef')
+    }).id == entry.id
+    assert [device.id for device in device_registry.async_entries_for_area(
+        registry, 'kitchen')] == [entry.id]
+
+    registry.async_clear_area_id('kitchen')
+    assert device_registry.async_entries_for_area(registry, 'kitchen') == []
+
+    registry.async_clear_config_entry('1234')
+    assert registry.async_get_device({('hue', '654')}, set()) is None
@@ -12,8 +12,9 @@ from homeassistant.core import Context
 from homeassistant.const import ATTR_HIDDEN, ATTR_DEVICE_CLASS
 from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.helpers.entity_values import EntityValues
+import homeassistant.util.dt as dt_util
 
-from tests.common import get_test_home_assistant
+from tests.common import get_test_home_assistant, async_fire_time_changed
 
 
 def test_generate_entity_id_requires_hass_or_ids():
@@ -497,3 +498,115 @@ async def test_set_context_expired(hass):
     assert hass.states.get('hello.world').context != context
     assert ent._context is None
     assert ent._context_set is None
+
+
+class CoalescedEntity(entity.Entity):
+    """Entity with a state and an attribute."""
+
+    def __init__(self, state, value, interval=None, passthrough=True):
+        """Initialize the entity."""
+        self.entity_id = 'sensor.power'
+        self._state = state
+        self.value = value
+        self._interval = interval
+        self._passthrough = passthrough
+
+    @property
+    def state(self):
+        """Return the state."""
+        return self._state
+
+    @property
+    def device_state_attributes(self):
+        """Return the attributes."""
+        return {'value': self.value}
+
+    @property
+    def state_write_interval(self):
+        """Return the write interval."""
+        return self._interval
+
+    @property
+    def state_write_passthrough(self):
+        """Return if state changes pass through."""
+        return self._passthrough
+
+
+async def test_coalesce_state_writes(hass):
+    """Test state writes within the write interval are coalesced."""
+    now = dt_util.utcnow()
+    ent = CoalescedEntity('on', 1, timedelta(seconds=10))
+    ent.hass = hass
+
+    with patch('homeassistant.helpers.entity.dt_util.utcnow',
+               return_value=now):
+        ent.async_write_ha_state()
+        assert hass.states.get('sensor.power').attributes['value'] == 1
+
+        ent.value = 2
+        ent.async_write_ha_state()
+        ent.value = 3
+        ent.async_write_ha_state()
+        assert hass.states.get('sensor.power').attributes['value'] == 1
+
+        # Changes of the state are written immediately
+        ent._state = 'off'
+        ent.async_write_ha_state()
+        state = hass.states.get('sensor.power')
+        assert state.state == 'off'
+        assert state.attributes['value'] == 3
+
+        ent.value = 4
+        ent.async_write_ha_state()
+
+    async_fire_time_changed(hass, now + timedelta(seconds=5))
+    await hass.async_block_till_done()
+    assert hass.states.get('sensor.power').attributes['value'] == 3
+
+    async_fire_time_changed(hass, now + timedelta(seconds=10))
+    await hass.async_block_till_done()
+    assert hass.states.get('sensor.power').attributes['value'] == 4
+
+
+async def test_coalesce_state_writes_without_passthrough(hass):
+    """Test state changes are coalesced when they do not pass through."""
+    now = dt_util.utcnow()
+    ent = CoalescedEntity('on', 1, timedelta(seconds=10), False)
+    ent.hass = hass
+
+    with patch('homeassistant.helpers.entity.dt_util.utcnow',
+               return_value=now):
+        ent.async_write_ha_state()
+        ent._state = 'off'
+        ent.async_write_ha_state()
+
+    assert hass.states.get('sensor.power').state == 'on'
+
+    async_fire_time_changed(hass, now + timedelta(seconds=10))
+    await hass.async_block_till_done()
+    assert hass.states.get('sensor.power').state == 'off'
+
+
+async def test_coalesce_state_writes_customize(hass):
+    """Test the write interval is configured with customize."""
+    now = dt_util.utcnow()
+    hass.data[DATA_CUSTOMIZE] = EntityValues(domain={'sensor': {
+        'state_write_interval': timedelta(seconds=10),
+    }})
+    ent = CoalescedEntity('on', 1)
+    ent.hass = hass
+
+    with patch('homeassistant.helpers.entity.dt_util.utcnow',
+               return_value=now):
+        ent.async_write_ha_state()
+        ent.value = 2
+        ent.async_write_ha_state()
+
+    state = hass.states.get('sensor.power')
+    assert state.attributes == {'value': 1}
+
+    # Removing the entity drops the held back write
+    await ent.async_remove()
+    async_fire_time_changed(hass, now + timedelta(seconds=10))
+    await hass.async_block_till_done()
+    assert hass.states.get('sensor.power') is None
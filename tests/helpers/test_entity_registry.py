@@ -332,3 +332,33 @@ async def test_update_entity_unique_id_conflict(registry):
         registry.async_update_entity(
             entry.entity_id, new_unique_id=entry2.unique_id)
     assert mock_schedule_save.call_count == 0
+
+
+async def test_indexes_follow_updates(registry):
+    """Test the lookups stay consistent when entries change."""
+    entry = registry.async_get_or_create(
+        'light', 'hue', '5678', device_id='device-1')
+    registry.async_get_or_create('light', 'hue', '1234', device_id='device-1')
+
+    assert {entry.entity_id for entry in entity_registry.
+            async_entries_for_device(registry, 'device-1')} == \
+        {'light.hue_5678', 'light.hue_1234'}
+
+    registry.async_update_entity(
+        entry.entity_id, new_entity_id='light.kitchen', new_unique_id='9012')
+
+    assert registry.async_get_entity_id('light', 'hue', '5678') is None
+    assert registry.async_get_entity_id('light', 'hue', '9012') == \
+        'light.kitchen'
+    assert {entry.entity_id for entry in entity_registry.
+            async_entries_for_device(registry, 'device-1')} == \
+        {'light.kitchen', 'light.hue_1234'}
+
+    registry.async_remove('light.kitchen')
+
+    assert registry.async_get_entity_id('light', 'hue', '9012') is None
+    assert [entry.entity_id for entry in entity_registry.
+            async_entries_for_device(registry, 'device-1')] == \
+        ['light.hue_1234']
+    assert entity_registry.async_entries_for_device(
+        registry, 'device-2') == []
@@ -10,8 +10,9 @@ import pytest
 from homeassistant.core import callback
 from homeassistant.setup import async_setup_component
 import homeassistant.core as ha
-from homeassistant.const import MATCH_ALL
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
 from homeassistant.helpers.event import (
+    TRACK_STATE_CHANGE_CALLBACKS,
     async_call_later,
     async_track_point_in_time,
     async_track_point_in_utc_time,
@@ -20,6 +21,7 @@ from homeassistant.helpers.event import (
     async_track_sunrise,
     async_track_sunset,
     async_track_template,
+    async_track_template_result,
     async_track_time_change,
     async_track_time_interval,
     async_track_utc_time_change,
@@ -83,6 +85,33 @@ async def test_track_point_in_time(hass):
     assert len(runs) == 2
 
 
+async def test_track_point_in_time_shared_listener(hass):
+    """Test point in time trackers share one listener and run when due."""
+    birthday_paulus = datetime(1986, 7, 9, 12, 0, 0, tzinfo=dt_util.UTC)
+    runs = []
+
+    for days in (2, 0, 1):
+        async_track_point_in_utc_time(
+            hass, callback(lambda x, days=days: runs.append(days)),
+            birthday_paulus + timedelta(days=days))
+
+    unsub = async_track_point_in_utc_time(
+        hass, callback(lambda x: runs.append('cancelled')), birthday_paulus)
+    unsub()
+    unsub()
+
+    assert hass.bus.async_listeners()[ha.EVENT_TIME_CHANGED] == 1
+
+    _send_time_changed(hass, birthday_paulus + timedelta(days=1))
+    await hass.async_block_till_done()
+    assert runs == [0, 1]
+
+    _send_time_changed(hass, birthday_paulus + timedelta(days=3))
+    await hass.async_block_till_done()
+    assert runs == [0, 1, 2]
+    assert ha.EVENT_TIME_CHANGED not in hass.bus.async_listeners()
+
+
 async def test_track_state_change(hass):
     """Test track_state_change."""
     # 2 lists to track how often our callbacks get called
@@ -163,6 +192,56 @@ async def test_track_state_change(hass):
     assert len(wildercard_runs) == 6
 
 
+async def test_track_state_change_entity_dispatch(hass):
+    """Test state changes are only dispatched to the tracked entities."""
+    bowl_runs = []
+    kitchen_runs = []
+
+    @ha.callback
+    def bowl_callback(entity_id, old_state, new_state):
+        bowl_runs.append(entity_id)
+
+    @ha.callback
+    def kitchen_callback(entity_id, old_state, new_state):
+        kitchen_runs.append(entity_id)
+
+    @ha.callback
+    def failing_callback(entity_id, old_state, new_state):
+        raise ValueError
+
+    unsub_bowl = async_track_state_change(
+        hass, ['light.Bowl', 'light.bowl'], bowl_callback)
+    unsub_kitchen = async_track_state_change(
+        hass, ['switch.kitchen', 'light.bowl'], kitchen_callback)
+    unsub_failing = async_track_state_change(
+        hass, 'light.bowl', failing_callback)
+
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == 1
+    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]['light.bowl']) == 3
+
+    hass.states.async_set('light.bowl', 'on')
+    await hass.async_block_till_done()
+    assert bowl_runs == ['light.bowl']
+    assert kitchen_runs == ['light.bowl']
+
+    hass.states.async_set('switch.kitchen', 'on')
+    hass.states.async_set('switch.other', 'on')
+    await hass.async_block_till_done()
+    assert bowl_runs == ['light.bowl']
+    assert kitchen_runs == ['light.bowl', 'switch.kitchen']
+
+    unsub_bowl()
+    unsub_failing()
+    hass.states.async_set('light.bowl', 'off')
+    await hass.async_block_till_done()
+    assert bowl_runs == ['light.bowl']
+    assert kitchen_runs == ['light.bowl', 'switch.kitchen', 'light.bowl']
+
+    unsub_kitchen()
+    assert hass.data[TRACK_STATE_CHANGE_CALLBACKS] == {}
+    assert EVENT_STATE_CHANGED not in hass.bus.async_listeners()
+
+
 async def test_track_template(hass):
     """Test tracking template."""
     specific_runs = []
@@ -235,6 +314,100 @@ async def test_track_template(hass):
     assert len(wildercard_runs) == 2
 
 
+async def test_track_template_result(hass):
+    """Test tracking follows the states read by the last render."""
+    runs = []
+
+    template = Template(
+        "{{ states.input_boolean.use_b.state == 'on' and "
+        "states.sensor.b.state or states.sensor.a.state }}", hass)
+
+    hass.states.async_set('input_boolean.use_b', 'off')
+    hass.states.async_set('sensor.a', '1')
+    hass.states.async_set('sensor.b', '2')
+
+    @ha.callback
+    def result_callback(entity_id, old_state, new_state, info):
+        runs.append((entity_id, info.result))
+
+    unsub = async_track_template_result(hass, template, result_callback)
+
+    # Not read by the last render
+    hass.states.async_set('sensor.b', '3')
+    await hass.async_block_till_done()
+    assert runs == []
+
+    hass.states.async_set('sensor.a', '4')
+    await hass.async_block_till_done()
+    assert runs == [('sensor.a', '4')]
+
+    hass.states.async_set('input_boolean.use_b', 'on')
+    await hass.async_block_till_done()
+    assert runs[-1] == ('input_boolean.use_b', '3')
+
+    # No longer read
+    hass.states.async_set('sensor.a', '5')
+    await hass.async_block_till_done()
+    assert len(runs) == 2
+
+    hass.states.async_set('sensor.b', '6')
+    await hass.async_block_till_done()
+    assert runs[-1] == ('sensor.b', '6')
+
+    unsub()
+    hass.states.async_set('sensor.b', '7')
+    await hass.async_block_till_done()
+    assert len(runs) == 3
+    assert not hass.data[TRACK_STATE_CHANGE_CALLBACKS]
+
+
+async def test_track_template_result_domain(hass):
+    """Test tracking a template that iterates over a domain."""
+    runs = []
+
+    template = Template(
+        "{{ states.sensor | map(attribute='entity_id') | join(',') }}", hass)
+    hass.states.async_set('sensor.a', '1')
+
+    @ha.callback
+    def result_callback(entity_id, old_state, new_state, info):
+        runs.append(info.result)
+
+    async_track_template_result(hass, template, result_callback)
+
+    # Only the entity ids were read, not their states
+    hass.states.async_set('sensor.a', '2')
+    hass.states.async_set('light.a', 'on')
+    await hass.async_block_till_done()
+    assert runs == []
+
+    hass.states.async_set('sensor.b', '1')
+    await hass.async_block_till_done()
+    assert runs == ['sensor.a,sensor.b']
+
+    hass.states.async_remove('sensor.a')
+    await hass.async_block_till_done()
+    assert runs[-1] == 'sensor.b'
+
+
+async def test_track_template_result_static(hass):
+    """Test templates reading no states are only rendered on fallback."""
+    runs = []
+    fallback_runs = []
+    template = Template("{{ 1 + 1 }}", hass)
+
+    async_track_template_result(
+        hass, template, lambda *args: runs.append(args))
+    async_track_template_result(
+        hass, template, lambda *args: fallback_runs.append(args),
+        fallback_match_all=True)
+
+    hass.states.async_set('sensor.a', '1')
+    await hass.async_block_till_done()
+    assert len(runs) == 0
+    assert len(fallback_runs) == 1
+
+
 async def test_track_same_state_simple_trigger(hass):
     """Test track_same_change with trigger simple."""
     thread_runs = []
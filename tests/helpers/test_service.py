@@ -196,6 +196,26 @@ async def test_extract_entity_ids(hass):
         hass, call, expand_group=False)
 
 
+async def test_extract_entity_ids_nested_group_changes(hass):
+    """Test extract_entity_ids follows changes of nested groups."""
+    hass.states.async_set('group.inner', STATE_ON, {
+        ATTR_ENTITY_ID: ['light.bowl']})
+    hass.states.async_set('group.outer', STATE_ON, {
+        ATTR_ENTITY_ID: ['group.inner', 'light.ceiling']})
+
+    call = ha.ServiceCall('light', 'turn_on',
+                          {ATTR_ENTITY_ID: 'group.outer'})
+
+    assert {'light.bowl', 'light.ceiling'} == \
+        await service.async_extract_entity_ids(hass, call)
+
+    hass.states.async_set('group.inner', STATE_ON, {
+        ATTR_ENTITY_ID: ['light.kitchen']})
+
+    assert {'light.kitchen', 'light.ceiling'} == \
+        await service.async_extract_entity_ids(hass, call)
+
+
 async def test_extract_entity_ids_from_area(hass):
     """Test extract_entity_ids method with areas."""
     hass.states.async_set('light.Bowl', STATE_ON)
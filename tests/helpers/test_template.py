@@ -1324,3 +1324,32 @@ def test_length_of_states(hass):
 
     tpl = template.Template('{{ states.sensor | length }}', hass)
     assert tpl.async_render() == '2'
+
+
+def test_compiled_code_cache(hass):
+    """Test identical templates share their compiled code."""
+    cache = template.CompiledCodeCache(2)
+
+    with patch.object(template, 'COMPILED_CODE', cache):
+        tpl = template.Template('{{ 1 + 1 }}', hass)
+        tpl.ensure_valid()
+        copy = template.Template('{{ 1 + 1 }}', hass)
+        copy.ensure_valid()
+        assert copy._compiled_code is tpl._compiled_code
+        assert copy.async_render() == '2'
+        assert cache.info() == {
+            'hits': 1, 'misses': 1, 'size': 1, 'maxsize': 2}
+
+        with pytest.raises(TemplateError):
+            template.Template('{{ 1 + }}', hass).ensure_valid()
+        assert cache.info()['size'] == 1
+
+        # The least recently used code is evicted
+        template.Template('{{ 2 }}', hass).ensure_valid()
+        template.Template('{{ 1 + 1 }}', hass).ensure_valid()
+        template.Template('{{ 3 }}', hass).ensure_valid()
+        assert list(cache._code) == ['{{ 1 + 1 }}', '{{ 3 }}']
+
+        cache.clear()
+        assert cache.info() == {
+            'hits': 0, 'misses': 0, 'size': 0, 'maxsize': 2}
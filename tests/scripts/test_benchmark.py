@@ -0,0 +1,45 @@
+"""Test the benchmark script."""
+import json
+from unittest.mock import patch
+
+from homeassistant.scripts import benchmark
+
+
+def test_summarize():
+    """Test the percentiles of the runtimes."""
+    summary = benchmark._summarize([4.0, 1.0, 3.0, 2.0, 5.0])
+    assert summary['runtimes'] == [4.0, 1.0, 3.0, 2.0, 5.0]
+    assert summary['min'] == 1.0
+    assert summary['max'] == 5.0
+    assert summary['mean'] == 3.0
+    assert summary['p50'] == 3.0
+    assert summary['p90'] == 4.6
+    assert summary['p99'] == 4.96
+
+
+def test_summarize_single_run():
+    """Test the percentiles of a single runtime."""
+    summary = benchmark._summarize([2.0])
+    assert summary['p50'] == summary['p99'] == 2.0
+
+
+def test_run_benchmark(capsys):
+    """Test running a benchmark a fixed number of times."""
+    calls = []
+
+    async def async_fake_benchmark(hass):
+        """Return a runtime."""
+        calls.append(hass)
+        return len(calls)
+
+    with patch.dict(benchmark.BENCHMARKS,
+                    {'fake': async_fake_benchmark}, clear=True), \
+            patch('sys.argv', ['hass', '--script', 'benchmark', 'fake',
+                               '--iterations', '3']):
+        assert benchmark.run(None) == 0
+
+    assert len(calls) == 3
+    result = json.loads(capsys.readouterr().out)
+    assert result['iterations'] == 3
+    assert result['benchmarks']['fake']['runtimes'] == [1, 2, 3]
+    assert result['benchmarks']['fake']['p50'] == 2